@@ -0,0 +1,21 @@
+"""
+FaithConnect brand asset rendering helpers.
+
+Shared, vectorized building blocks used by the icon and logo generator
+scripts (``generate_icon.py``, ``generate_icon_fixed.py`` and
+``faith_connect/generate_new_logo.py``), which wrap the single CLI::
+
+    python -m brand_render {icons,logo,splash,themes,all} --help
+
+Importing the package does no work: NumPy, Pillow and the designs are only
+loaded by the submodules that need them.
+"""
+
+import os
+
+# Bump whenever a change to the renderer alters output pixels, so cached
+# assets keyed on it are rebuilt
+RENDERER_VERSION = 3
+
+# Default antialiasing factor; 2, 4 or 8 trade render time for clean edges
+SUPERSAMPLE = int(os.environ.get('FAITHCONNECT_SUPERSAMPLE', '1'))
@@ -0,0 +1,5 @@
+import sys
+
+from brand_render.cli import main
+
+sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Benchmark harness for the icon and logo generators.
+
+Renders every generator's scene across a size ladder and records wall
+time (best of ``--repeat``), pixels per second and the ``tracemalloc``
+peak of a separate instrumented run. Results can be saved as a JSON
+baseline and later runs compared against it; the command exits non-zero
+if any case regresses beyond the thresholds, or if a ``--baseline`` given
+explicitly (or any baseline, with ``--require-baseline``) is missing or
+shares no case with the run. Runs fully offline.
+
+The committed baseline, ``bench_baseline.json``, also keeps
+``pre_series``: the same cases timed with the ImageDraw generators as
+they were before ``brand_render`` (the ``baseline`` commit), measured the
+same way. They cannot be re-run from this tree, so saving a new baseline
+carries them over, and every run reports how it compares to them.
+
+Usage (from the repository root)::
+
+    python -m brand_render.bench --save-baseline      # record this machine
+    python -m brand_render.bench                      # compare against it
+    python -m brand_render.bench --require-baseline   # in CI: fail without one
+    python -m brand_render.bench --sizes 48 1024 --generators create_icon
+    python -m brand_render.bench --baseline /tmp/before.json --time-threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+SIZES = (48, 192, 512, 1024, 2048, 4096)
+
+# Generator function -> scene it renders
+GENERATORS = {
+    'generate_icon.create_faith_icon': 'faith_icon',
+    'generate_icon.create_foreground_icon': 'faith_foreground',
+    'generate_icon_fixed.create_icon': 'fixed_icon',
+    'generate_icon_fixed.create_foreground_icon': 'fixed_foreground',
+    'generate_new_logo.create_premium_logo': 'premium_logo',
+    'generate_new_logo.create_app_icon': 'premium_app_icon',
+    'generate_new_logo.create_foreground_icon': 'premium_foreground',
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.10
+
+
+def measure(scene, size, repeat=3, **options):
+    """Time ``render(scene, size)`` and measure its tracemalloc peak."""
+    from brand_render.render import render
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(scene, size, **options)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        render(scene, size, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': best,
+        'pixels_per_second': size * size / best if best else 0.0,
+        'peak_bytes': peak,
+    }
+
+
+def run(generators=None, sizes=SIZES, repeat=3, supersample=1, report=print):
+    """Benchmark each generator at each size; returns ``{case: result}``."""
+    from brand_render.designs import SCENES
+
+    results = {}
+    for name in generators or GENERATORS:
+        scene = SCENES[GENERATORS[name]]
+        for size in sizes:
+            case = f'{name}@{size}'
+            results[case] = measure(scene, size, repeat, supersample=supersample)
+            if report:
+                r = results[case]
+                report(f"  {case:<52} {r['seconds'] * 1000:9.1f} ms "
+                       f"{r['pixels_per_second'] / 1e6:8.1f} Mpx/s {r['peak_bytes'] / 2**20:8.1f} MiB")
+    return results
+
+
+def compare(results, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """Return a list of human-readable regressions against ``baseline``."""
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        slowdown = result['seconds'] / base['seconds'] - 1 if base['seconds'] else 0.0
+        growth = result['peak_bytes'] / base['peak_bytes'] - 1 if base['peak_bytes'] else 0.0
+        if slowdown > time_threshold:
+            regressions.append(f"{case}: {slowdown:+.0%} wall time "
+                               f"({base['seconds'] * 1000:.1f} -> {result['seconds'] * 1000:.1f} ms)")
+        if growth > memory_threshold:
+            regressions.append(f"{case}: {growth:+.0%} peak memory "
+                               f"({base['peak_bytes'] / 2**20:.1f} -> {result['peak_bytes'] / 2**20:.1f} MiB)")
+    return regressions
+
+
+def pre_series_report(results, pre_series):
+    """Lines comparing ``results`` with the pre-series ImageDraw timings."""
+    cases = [case for case in results if case in pre_series]
+    if not cases:
+        return []
+    lines = [f"  {case:<52} {results[case]['seconds'] / pre_series[case]['seconds']:6.2f}x "
+             f"({pre_series[case]['seconds'] * 1000:.1f} -> {results[case]['seconds'] * 1000:.1f} ms)"
+             for case in cases]
+    before = sum(pre_series[case]['seconds'] for case in cases)
+    after = sum(results[case]['seconds'] for case in cases)
+    lines.append(f"  {'total':<52} {after / before:6.2f}x ({before * 1000:.1f} -> {after * 1000:.1f} ms)")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the FaithConnect icon and logo generators.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--generators', nargs='+', default=None,
+                        help='generator names or suffixes, e.g. create_app_icon (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case; the best is kept')
+    parser.add_argument('--supersample', type=int, default=1)
+    parser.add_argument('--baseline', default=None,
+                        help=f'JSON baseline to compare against or save to (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--save-baseline', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='fail if the baseline is missing instead of only timing')
+    parser.add_argument('--time-threshold', type=float, default=TIME_THRESHOLD,
+                        help='allowed fractional slowdown before failing (default 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+                        help='allowed fractional peak-memory growth before failing (default 0.10)')
+    args = parser.parse_args(argv)
+
+    generators = None
+    if args.generators:
+        generators = [name for name in GENERATORS if any(name.endswith(g) for g in args.generators)]
+        if not generators:
+            parser.error(f"no generator matches {args.generators}")
+
+    path = args.baseline or DEFAULT_BASELINE
+    saved = None
+    try:
+        with open(path) as fh:
+            saved = json.load(fh)
+    except FileNotFoundError:
+        if (args.baseline or args.require_baseline) and not args.save_baseline:
+            parser.error(f"no baseline at {path}")
+        if not args.save_baseline:
+            print(f"No baseline at {path}; run with --save-baseline to record one.")
+    if saved is not None and 'cases' not in saved and 'pre_series' not in saved:
+        saved = {'cases': saved}  # older baselines are a flat {case: result}
+    baseline = saved.get('cases') if saved else None
+    pre_series = saved.get('pre_series', {}) if saved else {}
+
+    print("⏱  Benchmarking FaithConnect generators...")
+    results = run(generators, args.sizes, args.repeat, args.supersample)
+
+    report = pre_series_report(results, pre_series)
+    if report:
+        print("\n  Against the pre-series ImageDraw generators (time ratio):")
+        print('\n'.join(report))
+
+    if args.save_baseline:
+        with open(path, 'w') as fh:
+            json.dump({'cases': results, 'pre_series': pre_series}, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print(f"\n✓ Saved baseline: {path}")
+        return 0
+    if baseline is None:
+        if args.require_baseline:
+            print(f"\n✗ {path} records no cases")
+            return 1
+        return 0
+
+    missing = [case for case in results if case not in baseline]
+    if len(missing) == len(results):
+        print(f"\n✗ None of the {len(results)} cases are in {path}")
+        return 1
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    if missing:
+        print(f"\n  {len(missing)} case(s) not in the baseline: {', '.join(missing)}")
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) against {path}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n✓ No regressions in {len(results) - len(missing)} cases against {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
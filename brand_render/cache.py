@@ -0,0 +1,219 @@
+"""
+Content-addressed incremental build cache for generated brand assets.
+
+Every output is keyed by a hash of its scene (geometry and palette),
+target size, encode options, raster backend and ``RENDERER_VERSION``. A
+JSON manifest in the output root records the key and content hash that
+produced each file, so an unchanged output is skipped without rendering
+once the file on disk is confirmed to still hash to its recorded digest,
+and a re-rendered output is only rewritten (atomically) when its bytes
+actually differ. Untouched files keep their mtimes, which keeps
+Gradle and Xcode asset caches warm.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from functools import partial
+
+from brand_render import RENDERER_VERSION, SUPERSAMPLE, profiling
+
+MANIFEST_NAME = '.brand_manifest.json'
+
+
+def asset_key(scene, size, **options):
+    """Hash of everything that determines an asset's pixels and encoding."""
+    from brand_render.raster import get_backend
+
+    # Scene dataclasses have a deterministic repr covering every shape,
+    # coordinate and colour
+    payload = repr((RENDERER_VERSION, get_backend(), scene, size, sorted(options.items())))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def encode_png(img, optimize=False, **save_options):
+    """PNG bytes for ``img``; ``optimize`` runs the lossless size search."""
+    if optimize:
+        from brand_render.optimize import optimize_png
+
+        return optimize_png(img)[0]
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', **save_options)
+    return buf.getvalue()
+
+
+def atomic_write(path, data):
+    """Write ``data`` to ``path`` via a temp file and ``os.replace``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_if_changed(path, data):
+    """Atomically write ``data`` unless ``path`` already holds those bytes.
+
+    Returns True when the file was (re)written.
+    """
+    try:
+        with open(path, 'rb') as fh:
+            if hashlib.sha256(fh.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+class Manifest:
+    """On-disk record of which key produced each asset under ``root``.
+
+    Use as a context manager to save it on exit; it is only rewritten if
+    an entry changed.
+    """
+
+    def __init__(self, root='.'):
+        self.root = root
+        self.path = os.path.join(root, MANIFEST_NAME)
+        self.dirty = False
+        try:
+            with open(self.path) as fh:
+                self.entries = json.load(fh).get('assets', {})
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def is_current(self, rel_path, key):
+        """True if ``rel_path`` was produced by ``key`` and still holds the bytes recorded for it."""
+        entry = self.entries.get(rel_path)
+        if not entry or entry.get('key') != key:
+            return False
+        try:
+            with open(os.path.join(self.root, rel_path), 'rb') as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            return False
+        return len(data) == entry.get('bytes') and hashlib.sha256(data).hexdigest() == entry.get('sha256')
+
+    def record(self, rel_path, entry):
+        if self.entries.get(rel_path) != entry:
+            self.entries[rel_path] = entry
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = json.dumps({'renderer_version': RENDERER_VERSION, 'assets': self.entries},
+                          indent=2, sort_keys=True) + '\n'
+        atomic_write(self.path, data.encode('utf-8'))
+        self.dirty = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+
+
+def store(root, rel_path, key, data, **info):
+    """Write encoded asset bytes if changed; return (written, manifest entry)."""
+    with profiling.span('io', 'save', path=rel_path):
+        written = write_if_changed(os.path.join(root, rel_path), data)
+    entry = dict(info, key=key, sha256=hashlib.sha256(data).hexdigest(), bytes=len(data),
+                 renderer_version=RENDERER_VERSION)
+    return written, entry
+
+
+def write_json(root, rel_path, document):
+    """Write ``document`` unless the file already holds it; returns ``'unchanged'`` or ``'written'``.
+
+    Only the content is compared, so a file with the same document in any
+    layout is left alone. New files are laid out as Xcode writes its
+    ``Contents.json`` (``"key" : value``, two-space indent).
+    """
+    path = os.path.join(root, rel_path)
+    try:
+        with open(path, encoding='utf-8') as fh:
+            if json.load(fh) == document:
+                return 'unchanged'
+    except (FileNotFoundError, ValueError):
+        pass
+    atomic_write(path, (json.dumps(document, indent=2, separators=(',', ' : ')) + '\n').encode('utf-8'))
+    return 'written'
+
+
+def encode_step(rel_path, optimize=False, opaque=False):
+    """``image -> (PNG bytes, plain size)``, the optimize step of ``rel_path``; ``opaque`` drops alpha first.
+
+    With ``optimize`` the plain size is that of the default encoding, to
+    report the saving against; otherwise it is None.
+    """
+    def encode(img):
+        if opaque and img.mode != 'RGB':
+            img = img.convert('RGB')
+        with profiling.span('io', 'encode', path=rel_path):
+            data = encode_png(img, optimize)
+            return data, len(encode_png(img)) if optimize else None
+    return encode
+
+
+def write_step(manifest, rel_path, key, **info):
+    """``(PNG bytes, plain size) -> 'unchanged' | 'written'``, the write step of ``rel_path``.
+
+    The file is recorded in ``manifest``, with the plain size as
+    ``plain_bytes`` when the PNG was optimized.
+    """
+    def write(encoded):
+        data, plain = encoded
+        extra = info if plain is None else dict(info, plain_bytes=plain)
+        written, entry = store(manifest.root, rel_path, key, data, **extra)
+        manifest.record(rel_path, entry)
+        return 'written' if written else 'unchanged'
+    return write
+
+
+def render_step(scene, size, supersample):
+    """``scene`` at ``size`` as a PIL image, the render step of an asset."""
+    from brand_render.render import render
+
+    with profiling.span('asset', scene.name, size=size):
+        return render(scene, size, supersample=supersample)
+
+
+def asset_nodes(graph, manifest, rel_path, scene, size, opaque=False, supersample=None, optimize=False):
+    """Add the render, optimize and write steps of one asset to a ``brand_render.graph.Graph``.
+
+    The render step is shared by every output of the same scene, size and
+    supersample factor. Returns the write step, or None if the manifest
+    says ``rel_path`` is current.
+    """
+    supersample = supersample or SUPERSAMPLE
+    key = asset_key(scene, size, opaque=opaque, supersample=supersample, optimize=optimize)
+    if manifest.is_current(rel_path, key):
+        return None
+    rendered = graph.add(f'render {scene.name} {size}px x{supersample}', 'render',
+                         partial(render_step, scene, size, supersample))
+    encoded = graph.add(f'optimize {rel_path}', 'optimize', encode_step(rel_path, optimize, opaque), rendered)
+    return graph.add(f'write {rel_path}', 'write', write_step(manifest, rel_path, key, design=scene.name, size=size),
+                     encoded)
+
+
+def build_asset(manifest, rel_path, scene, size, opaque=False, supersample=None, optimize=False):
+    """Render ``scene`` to ``rel_path`` under the manifest root if stale.
+
+    ``optimize`` shrinks the PNG with ``brand_render.optimize``. Returns
+    ``'skipped'``, ``'unchanged'`` (rendered, same bytes) or ``'written'``.
+    """
+    from brand_render.graph import Graph
+
+    graph = Graph()
+    step = asset_nodes(graph, manifest, rel_path, scene, size, opaque, supersample, optimize)
+    return graph.run(jobs=1).status({rel_path: step})[rel_path]
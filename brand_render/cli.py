@@ -0,0 +1,241 @@
+"""
+Command-line entry point for generating every brand asset.
+
+Usage (from the repository root)::
+
+    python -m brand_render icons --design faith
+    python -m brand_render icons --design fixed --root faith_connect
+    python -m brand_render logo
+    python -m brand_render splash
+    python -m brand_render themes --design faith  # indigo, brand, night, monochrome...
+    python -m brand_render splash --platforms --root faith_connect
+    python -m brand_render all --platforms --optimize
+    python -m brand_render logo --watch          # re-render as designs.py changes
+
+Every output path is relative to ``--root`` (the Flutter project) and its
+``--assets`` directory, and goes through the ``brand_render.cache``
+manifest, so re-runs only render what changed. A command plans its
+outputs as one ``brand_render.graph`` of render, derive, optimize and
+write steps run ``--jobs`` at a time, so a render shared by several
+outputs happens once, and reports the critical path. Only the standard library
+is imported until a command actually runs, so ``--help`` and argument
+errors return in a few tens of milliseconds.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Launcher icon and adaptive foreground scene for each icon design
+ICON_DESIGNS = {
+    'faith': ('faith_icon', 'faith_foreground'),
+    'fixed': ('fixed_icon', 'fixed_foreground'),
+    'premium': ('premium_app_icon', 'premium_foreground'),
+}
+ICON_SIZE = 1024
+# Android 12 splash icon: 288dp at xxxhdpi
+SPLASH_SIZE = 1152
+SPLASH_DESIGN = 'faithconnect_logo'
+# Colour treatments (brand_render.designs.PALETTES) of the icon and its foreground
+ICON_THEMES = ('indigo', 'brand', 'night')
+FOREGROUND_THEMES = ('on_indigo', 'monochrome')
+
+
+def icon_outputs(design, assets):
+    """``(path, scene name, size)`` for the app icon and its adaptive foreground."""
+    icon, foreground = ICON_DESIGNS[design]
+    return [(os.path.join(assets, 'app_icon.png'), icon, ICON_SIZE),
+            (os.path.join(assets, 'app_icon_foreground.png'), foreground, ICON_SIZE)]
+
+
+def logo_outputs(assets):
+    """``(path, scene name, size)`` for the premium logo set."""
+    return [(os.path.join(assets, 'faithconnect_new_premium_logo.png'), 'premium_app_icon', ICON_SIZE),
+            (os.path.join(assets, 'app_icon_foreground.png'), 'premium_foreground', ICON_SIZE),
+            (os.path.join(assets, 'brand', 'faithconnect_logo_new.png'), 'premium_logo', ICON_SIZE)]
+
+
+def splash_outputs(assets, design=SPLASH_DESIGN, size=SPLASH_SIZE):
+    """``(path, scene name, size)`` for the splash screen image."""
+    return [(os.path.join(assets, 'splash.png'), design, size)]
+
+
+def theme_outputs(design, assets):
+    """``(path, scene name, size, palette)`` for every colour treatment of an icon design."""
+    icon, foreground = ICON_DESIGNS[design]
+    themes = os.path.join(assets, 'themes')
+    return ([(os.path.join(themes, f'app_icon_{palette}.png'), icon, ICON_SIZE, palette)
+             for palette in ICON_THEMES]
+            + [(os.path.join(themes, f'app_icon_foreground_{palette}.png'), foreground, ICON_SIZE, palette)
+               for palette in FOREGROUND_THEMES])
+
+
+def plan(graph, manifest, outputs, supersample=None, optimize=False):
+    """Add ``(path, scene name, size[, palette])`` outputs to a ``brand_render.graph.Graph``.
+
+    Each design's palettes at one size share a render. Returns ``{path:
+    write step or None if current}``.
+    """
+    from brand_render.cache import asset_nodes
+    from brand_render.designs import PALETTES, SCENES
+    from brand_render.themes import variant_nodes
+
+    steps, variants = {}, {}
+    for rel_path, design, size, *palette in outputs:
+        if palette:
+            variants.setdefault((design, size), {})[rel_path] = PALETTES[palette[0]]
+        else:
+            steps[rel_path] = asset_nodes(graph, manifest, rel_path, SCENES[design], size,
+                                          supersample=supersample, optimize=optimize)
+    for (design, size), paths in variants.items():
+        steps.update(variant_nodes(graph, manifest, SCENES[design], size, paths, supersample, optimize))
+    return steps
+
+
+def savings(manifest, paths):
+    """``(plain, optimized)`` total bytes of the ``--optimize``'d outputs among ``paths``."""
+    entries = [manifest.entries.get(path, {}) for path in paths]
+    entries = [entry for entry in entries if 'plain_bytes' in entry]
+    return sum(entry['plain_bytes'] for entry in entries), sum(entry['bytes'] for entry in entries)
+
+
+def describe_saving(plain, optimized):
+    return f"{plain:,} -> {optimized:,} bytes, -{(plain - optimized) / plain:.1%}" if plain else ''
+
+
+def report(outputs, status, manifest):
+    for rel_path, design, size, *palette in outputs:
+        treatment = f'{design} in {palette[0]}' if palette else design
+        saving = describe_saving(*savings(manifest, [rel_path]))
+        print(f"  ✓ {status[rel_path].capitalize()}: {os.path.join(manifest.root, rel_path)} "
+              f"({treatment}, {size}px{', ' + saving if saving else ''})")
+
+
+def _platforms(args, graph, manifest):
+    from brand_render.export import icon_nodes
+
+    icon, foreground = ICON_DESIGNS[args.design]
+    return {'Android/iOS launcher files': icon_nodes(graph, manifest, icon, foreground, args.supersample,
+                                                     args.optimize)}
+
+
+def _splash_platforms(args, graph, manifest):
+    from brand_render.splash import splash_nodes
+
+    return {'Android/iOS splash files': splash_nodes(graph, manifest, args.splash_design, args.supersample,
+                                                     args.optimize)}
+
+
+# Each command returns its ``(path, scene name, size[, palette])`` outputs
+# and ``{label: {path: write step}}`` for the platform files it added to the graph
+
+def cmd_icons(args, graph, manifest):
+    return icon_outputs(args.design, args.assets), _platforms(args, graph, manifest) if args.platforms else {}
+
+
+def cmd_logo(args, graph, manifest):
+    return logo_outputs(args.assets), {}
+
+
+def cmd_splash(args, graph, manifest):
+    outputs = splash_outputs(args.assets, args.splash_design, args.splash_size)
+    return outputs, _splash_platforms(args, graph, manifest) if args.platforms else {}
+
+
+def cmd_themes(args, graph, manifest):
+    return theme_outputs(args.design, args.assets), {}
+
+
+def cmd_all(args, graph, manifest):
+    # The premium logo set shares app_icon_foreground.png with the icons, so
+    # keeping them on one design leaves nothing to re-render
+    outputs = icon_outputs(args.design, args.assets)
+    paths = {path for path, _design, _size in outputs}
+    outputs += [output for output in logo_outputs(args.assets) if output[0] not in paths]
+    outputs += splash_outputs(args.assets, args.splash_design, args.splash_size)
+    outputs += theme_outputs(args.design, args.assets)
+    platforms = {}
+    if args.platforms:
+        platforms.update(_platforms(args, graph, manifest))
+        platforms.update(_splash_platforms(args, graph, manifest))
+    return outputs, platforms
+
+
+def parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--root', default='.', help='Flutter project root to write into (default: .)')
+    common.add_argument('--assets', default='assets', help='asset directory under --root (default: assets)')
+    common.add_argument('--supersample', type=int, default=None, choices=(1, 2, 4, 8),
+                        help='antialiasing factor (default: FAITHCONNECT_SUPERSAMPLE or 1)')
+    common.add_argument('--optimize', action='store_true', help='losslessly minimize each PNG (slower)')
+    common.add_argument('--profile', default=None, metavar='TRACE',
+                        help='write a profiling trace (default: FAITHCONNECT_PROFILE)')
+    common.add_argument('--layer-cache', default=None, metavar='DIR',
+                        help='cache rendered layers, persisted here across runs (default: FAITHCONNECT_LAYER_CACHE, '
+                             'or no caching)')
+    common.add_argument('--jobs', type=int, default=None,
+                        help='build steps to run in parallel (default: all cores)')
+    common.add_argument('--watch', action='store_true',
+                        help='keep running and re-render outputs as the designs are edited')
+    platform_options = argparse.ArgumentParser(add_help=False)
+    platform_options.add_argument('--platforms', action='store_true',
+                                  help='also export every Android and iOS launcher icon or splash file')
+    icon_options = argparse.ArgumentParser(add_help=False)
+    icon_options.add_argument('--design', choices=sorted(ICON_DESIGNS), default='premium',
+                              help='icon design (default: premium)')
+    splash_options = argparse.ArgumentParser(add_help=False)
+    splash_options.add_argument('--splash-design', default=SPLASH_DESIGN,
+                                help=f'scene for the splash image (default: {SPLASH_DESIGN})')
+    splash_options.add_argument('--splash-size', type=int, default=SPLASH_SIZE,
+                                help=f'splash image size in pixels (default: {SPLASH_SIZE})')
+
+    main_parser = argparse.ArgumentParser(prog='python -m brand_render',
+                                          description='Generate FaithConnect brand assets.')
+    commands = main_parser.add_subparsers(dest='command', required=True, metavar='command')
+    for name, handler, parents, help in (
+        ('icons', cmd_icons, [common, icon_options, platform_options], 'app icon and adaptive foreground'),
+        ('logo', cmd_logo, [common], 'premium logo, app icon and foreground'),
+        ('splash', cmd_splash, [common, splash_options, platform_options], 'splash screen image'),
+        ('themes', cmd_themes, [common, icon_options], 'icon and foreground colour treatments'),
+        ('all', cmd_all, [common, icon_options, splash_options, platform_options],
+         'icons, logo, splash and colour treatments'),
+    ):
+        commands.add_parser(name, parents=parents, help=help, description=f'Generate the {help}.') \
+            .set_defaults(handler=handler)
+    return main_parser
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    from brand_render.cache import Manifest
+    from brand_render.graph import Graph
+    from brand_render.layer_cache import caching
+    from brand_render.profiling import profiling
+
+    start = time.perf_counter()
+    print(f"🎨 Generating FaithConnect brand assets ({args.command})...")
+    # With --layer-cache, layers shared between outputs are rendered once; watch mode reuses them too
+    with caching(args.layer_cache) as cache:
+        graph = Graph()
+        with profiling(args.profile), Manifest(args.root) as manifest:
+            outputs, platforms = args.handler(args, graph, manifest)
+            steps = plan(graph, manifest, outputs, args.supersample, args.optimize)
+            run = graph.run(args.jobs)
+        report(outputs, run.status(steps), manifest)
+        for label, group in platforms.items():
+            status = run.status(group)
+            saving = describe_saving(*savings(manifest, group))
+            print(f"  ✓ {len(status)} {label} ({list(status.values()).count('written')} written"
+                  f"{', ' + saving if saving else ''})")
+        print(f"✨ Done in {time.perf_counter() - start:.2f}s" + (f" ({cache.summary()})" if cache else ''))
+        if run.times:
+            print(f"⏱  {run.summary()}")
+        if args.watch:
+            from brand_render.watch import watch
+
+            watch(outputs, args.root, args.supersample, args.optimize)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+FaithConnect designs as resolution-independent scenes.
+
+Each scene is the geometry of one of the original generator functions,
+expressed in normalized units (fractions of the canvas side) so it can be
+rendered directly at any icon, splash or marketing size.
+"""
+
+import math
+import os
+
+from brand_render import svg
+from brand_render.scene import (
+    DESIGN_PX, Arc, DropShadow, Ellipse, Group, Layer, LinearGradient, Polygon, RadialGradient, Rect, Ring, Scene,
+    Stroke,
+)
+from brand_render.themes import Palette
+
+WHITE = (255, 255, 255, 255)
+GOLD = (255, 215, 0, 255)
+
+INDIGO_TO_PURPLE = LinearGradient((99, 102, 241), (139, 92, 246))  # #6366F1 -> #8B5CF6
+SOFT_PURPLE = LinearGradient((245, 243, 255), (237, 233, 254))  # #F5F3FF -> #EDE9FE
+PREMIUM_PURPLE = LinearGradient((157, 139, 245), (123, 111, 232))  # #9D8BF5 -> #7B6FE8
+
+
+def _gold(alpha):
+    return GOLD[:3] + (alpha,)
+
+
+def _circle(cx, cy, radius, paint):
+    return Ellipse(cx, cy, radius, radius, paint)
+
+
+def _ring(cx, cy, radius, width, paint):
+    return Ring(cx, cy, radius, radius, paint, width=width)
+
+
+# -- generate_icon.py: "F" + "C" monogram with faith dots and community arc --
+
+def _faith_letters(f_left, top, f_width, height, thickness, c_radius, c_cx, cover_width, cover_paint):
+    third = top + height / 3
+    return (
+        Layer('letter_f', (
+            Rect(f_left, top, f_left + thickness, top + height, WHITE),
+            Rect(f_left, top, f_left + f_width, top + thickness, WHITE),
+            Rect(f_left, third, f_left + f_width * 0.8, third + thickness, WHITE),
+        )),
+        Layer('letter_c', (_ring(c_cx, 0.5, c_radius, thickness, WHITE),)),
+        # Cover right side to create C opening; 'copy' so a transparent cover clears the ring
+        Layer('c_opening', (Rect(c_cx + c_radius - thickness, 0.5 - cover_width,
+                                 c_cx + c_radius + thickness, 0.5 + cover_width, cover_paint),), blend='copy'),
+    )
+
+
+def _faith_dots(y, spacing, radius):
+    return Layer('dots', tuple(_circle(0.5 + i * spacing, y, radius, WHITE) for i in (-1, 0, 1)))
+
+
+FAITH_ICON = Scene('faith_icon', (
+    Layer('background', (Rect(0, 0, 1, 1, INDIGO_TO_PURPLE),)),
+    *_faith_letters(0.28, 0.25, 0.15, 0.5, 0.06, 0.25, 0.47, 0.1,
+                    (119, 97, 243)),  # gradient colour at mid height
+    Layer('circle', (_ring(0.5, 0.5, 0.42, 0.008, (255, 255, 255, 100)),)),
+    _faith_dots(0.12, 0.1, 0.025),
+    Layer('community_arc', (Arc(0.5, 0.85, 0.25, 0.25, WHITE, width=0.015, start=0, end=180),)),
+), mode='RGB')
+
+FAITH_FOREGROUND = Scene('faith_foreground', (
+    *_faith_letters(0.32, 0.3, 0.12, 0.4, 0.05, 0.2, 0.48, 0.08, (0, 0, 0, 0)),
+    _faith_dots(0.18, 0.08, 0.02),
+))
+
+
+# -- generate_icon_fixed.py: wider, non-overlapping "F" and "C" --
+
+def _fixed_layers():
+    letter_width, letter_height, gap, stroke = 0.35, 0.5, 0.08, 0.08
+    f_x = (1 - (letter_width * 2 + gap)) / 2
+    top = (1 - letter_height) / 2
+    middle = top + letter_height * 0.4
+    c_x = f_x + letter_width + gap
+    return (
+        Layer('letter_f', (
+            Rect(f_x, top, f_x + stroke, top + letter_height, WHITE),
+            Rect(f_x, top, f_x + letter_width, top + stroke, WHITE),
+            Rect(f_x, middle, f_x + letter_width * 0.7, middle + stroke, WHITE),
+        )),
+        Layer('letter_c', (
+            Arc(c_x + letter_width / 2, 0.5, letter_width / 2, letter_height / 2, WHITE,
+                width=stroke, start=45, end=315),
+        )),
+        # Three dots representing different faiths
+        Layer('dots', tuple(_circle(0.5 + i * 0.15, 0.82, 0.06, WHITE) for i in (-1, 0, 1))),
+    )
+
+
+FIXED_ICON = Scene('fixed_icon', (
+    Layer('background', (Rect(0, 0, 1, 1, INDIGO_TO_PURPLE),)),
+    *_fixed_layers(),
+), mode='RGB')
+
+FIXED_FOREGROUND = Scene('fixed_foreground', _fixed_layers())
+
+
+# -- faith_connect/generate_new_logo.py: "Interconnected Faith" premium logo --
+
+def _main_circle(ring_alpha, fill_alpha):
+    radius = 0.35
+    return Layer('main_circle', (
+        _circle(0.5, 0.5, radius, RadialGradient(0.5, 0.5, radius, (123, 111, 232, ring_alpha),
+                                                 (157, 139, 245, ring_alpha), step=2 * DESIGN_PX)),
+        _circle(0.5, 0.5, radius, (157, 139, 245, fill_alpha)),
+    ))
+
+
+def _inner_circle(fill_alpha, outline_alpha):
+    return Layer('inner_circle', (
+        _circle(0.5, 0.5, 0.25, (255, 255, 255, fill_alpha)),
+        _ring(0.5, 0.5, 0.25, 3 * DESIGN_PX, (255, 255, 255, outline_alpha)),
+    ))
+
+
+def _infinity():
+    loop, thickness = 0.15, 0.025
+    return Layer('infinity', (
+        _ring(0.5 - loop / 2, 0.5, loop / 2, thickness, GOLD),
+        _ring(0.5 + loop / 2, 0.5, loop / 2, thickness, GOLD),
+        Rect(0.5 - thickness / 2, 0.5 - thickness / 2, 0.5 + thickness / 2, 0.5 + thickness / 2, GOLD),
+    ))
+
+
+def _star(cx, cy, outer, inner, points=6):
+    vertices = []
+    for i in range(points * 2):
+        angle = math.pi * i / points - math.pi / 2
+        radius = outer if i % 2 == 0 else inner
+        vertices.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle)))
+    return vertices
+
+
+SYMBOL_DISTANCE = 0.28
+SYMBOL_SIZE = 0.08
+
+
+def _faith_symbols():
+    distance, size, line = SYMBOL_DISTANCE, SYMBOL_SIZE, 0.015
+    top_y, right_x, bottom_y, left_x = 0.5 - distance, 0.5 + distance, 0.5 + distance, 0.5 - distance
+    star = _star(left_x, 0.5, size / 2, size / 4)
+    return Layer('symbols', (
+        # Top symbol (Om/Circle)
+        _ring(0.5, top_y, size / 2, line, _gold(200)),
+        _circle(0.5, top_y, size / 4, _gold(150)),
+        # Right symbol (Crescent)
+        Arc(right_x, 0.5, size, size / 2, _gold(200), width=line, start=45, end=225),
+        # Bottom symbol (Cross - simplified)
+        Rect(0.5 - line / 2, bottom_y - size / 2, 0.5 + line / 2, bottom_y + size / 2, _gold(200)),
+        Rect(0.5 - size / 2, bottom_y - line / 2, 0.5 + size / 2, bottom_y + line / 2, _gold(200)),
+        # Left symbol (Star - simplified)
+        Polygon(star, _gold(200)),
+        Stroke(star + star[:1], GOLD, width=DESIGN_PX),
+    ))
+
+
+def _connections():
+    # Straight lines from the top and right symbols towards the centre,
+    # ending where the last dot of the original 50-dot trails sat
+    distance, reach, width = SYMBOL_DISTANCE, 49 / 50, 17 * DESIGN_PX
+    return Layer('connections', (
+        Stroke(((0.5, 0.5 - distance), (0.5, 0.5 - distance * (1 - reach))), _gold(80), width=width),
+        Stroke(((0.5 + distance, 0.5), (0.5 + distance * (1 - reach), 0.5)), _gold(80), width=width),
+    ))
+
+
+PREMIUM_LOGO = Scene('premium_logo', (
+    Layer('background', (Rect(0, 0, 1, 1, SOFT_PURPLE),)),
+    # One faint ring, blurred outwards into a halo
+    Group('glow', (Layer('glow_ring', (_ring(0.5, 0.5, 0.46, 12 * DESIGN_PX, (157, 139, 245, 14)),)),),
+          filter=DropShadow(0, 0, 6 * DESIGN_PX, (157, 139, 245))),
+    _main_circle(200, 180),
+    _inner_circle(40, 100),
+    _infinity(),
+    _faith_symbols(),
+    _connections(),
+    Layer('sparkles', tuple(
+        _circle(0.5 + dx * 0.38, 0.5 + dy * 0.38, 0.015, _gold(180))
+        for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1))
+    )),
+))
+
+# Logo on the app-theme gradient, inset to 85% for padding
+PREMIUM_APP_ICON = Scene('premium_app_icon', (
+    Layer('app_background', (Rect(0, 0, 1, 1, PREMIUM_PURPLE),)),
+    Group('logo', PREMIUM_LOGO.inset(0.85).layers),
+))
+
+PREMIUM_FOREGROUND = Scene('premium_foreground', (
+    _main_circle(220, 200),
+    _inner_circle(50, 120),
+    _infinity(),
+))
+
+
+# -- assets/brand/faithconnect_logo.svg: the locked vector logo --
+
+BRAND_SVG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'assets', 'brand', 'faithconnect_logo.svg')
+BRAND_LOGO = svg.load(BRAND_SVG)
+
+SCENES = {
+    scene.name: scene
+    for scene in (FAITH_ICON, FAITH_FOREGROUND, FIXED_ICON, FIXED_FOREGROUND,
+                  PREMIUM_LOGO, PREMIUM_APP_ICON, PREMIUM_FOREGROUND, BRAND_LOGO)
+}
+
+
+# -- Colour treatments (brand_render.themes), keyed by the colours above --
+
+INDIGO, PURPLE, INDIGO_MID = (99, 102, 241), (139, 92, 246), (119, 97, 243)  # gradient ends, c_opening cover
+PREMIUM_LIGHT, PREMIUM_DARK = (157, 139, 245), (123, 111, 232)
+SOFT_LIGHT, SOFT_DARK = (245, 243, 255), (237, 233, 254)
+# Locked palette from assets/brand/README.md
+PRIMARY, PRIMARY_DARK, SOFT_BACKGROUND, CHARCOAL = (108, 99, 255), (90, 82, 224), (239, 239, 255), (31, 41, 55)
+
+PALETTES = {
+    palette.name: palette
+    for palette in (
+        # The launcher indigo (#6366F1 -> #8B5CF6) in place of the premium purple
+        Palette('indigo', {PREMIUM_LIGHT: INDIGO, PREMIUM_DARK: PURPLE}),
+        # Adaptive foreground as the launcher shows it, on adaptive_icon_background
+        Palette('on_indigo', background=INDIGO),
+        Palette('brand', {INDIGO: PRIMARY, PURPLE: PRIMARY_DARK, INDIGO_MID: (99, 91, 240),
+                          PREMIUM_LIGHT: PRIMARY, PREMIUM_DARK: PRIMARY_DARK,
+                          SOFT_LIGHT: SOFT_BACKGROUND, SOFT_DARK: SOFT_BACKGROUND}),
+        # Dark theme (drawable-night-*): charcoal backgrounds, brand purple marks,
+        # and the vector logo's strokes lightened to read on a dark window
+        Palette('night', {INDIGO: CHARCOAL, PURPLE: (17, 24, 39), INDIGO_MID: (24, 33, 47),
+                          SOFT_LIGHT: CHARCOAL, SOFT_DARK: CHARCOAL,
+                          PREMIUM_LIGHT: PRIMARY, PREMIUM_DARK: PRIMARY_DARK,
+                          PRIMARY: (165, 180, 252), PRIMARY_DARK: (129, 140, 248)}),  # #A5B4FC, #818CF8
+        # Android 13 themed icon: the system tints by alpha, so everything is
+        # white and the purple fills fade back behind the marks
+        Palette('monochrome', {PREMIUM_LIGHT: (255, 255, 255, 64), PREMIUM_DARK: (255, 255, 255, 64)},
+                default=(255, 255, 255)),
+    )
+}
@@ -0,0 +1,165 @@
+"""
+One-shot multi-platform icon export.
+
+Renders every Android launcher density, the adaptive-icon foreground, every
+iOS AppIcon size and the matching ``Contents.json`` in a single run, as
+steps of a ``brand_render.graph`` build whose renders are spread across a
+process pool. Each target renders its scene directly at its own pixel size.
+
+Outputs go through the ``brand_render.cache`` manifest, so a re-run only
+renders targets whose design, size or renderer version changed.
+
+Usage (from the repository root)::
+
+    python -m brand_render.export --root . --jobs 8
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from functools import partial
+
+from brand_render import SUPERSAMPLE
+from brand_render.cache import Manifest, asset_nodes, write_json
+
+ANDROID_RES = os.path.join('android', 'app', 'src', 'main', 'res')
+IOS_APPICON = os.path.join('ios', 'Runner', 'Assets.xcassets', 'AppIcon.appiconset')
+
+# Android density buckets and their scale relative to mdpi
+ANDROID_DENSITIES = {'mdpi': 1.0, 'hdpi': 1.5, 'xhdpi': 2.0, 'xxhdpi': 3.0, 'xxxhdpi': 4.0}
+LAUNCHER_DP = 48
+ADAPTIVE_FOREGROUND_DP = 108
+
+# (size in points, idiom, scale) for every AppIcon slot, including the
+# legacy 50/57/72pt icons flutter_launcher_icons also writes
+IOS_ICONS = (
+    ('20', 'iphone', 2), ('20', 'iphone', 3),
+    ('29', 'iphone', 1), ('29', 'iphone', 2), ('29', 'iphone', 3),
+    ('40', 'iphone', 2), ('40', 'iphone', 3),
+    ('57', 'iphone', 1), ('57', 'iphone', 2),
+    ('60', 'iphone', 2), ('60', 'iphone', 3),
+    ('20', 'ipad', 1), ('20', 'ipad', 2),
+    ('29', 'ipad', 1), ('29', 'ipad', 2),
+    ('40', 'ipad', 1), ('40', 'ipad', 2),
+    ('50', 'ipad', 1), ('50', 'ipad', 2),
+    ('72', 'ipad', 1), ('72', 'ipad', 2),
+    ('76', 'ipad', 1), ('76', 'ipad', 2),
+    ('83.5', 'ipad', 2),
+    ('1024', 'ios-marketing', 1),
+)
+
+DEFAULT_ICON = 'premium_app_icon'
+DEFAULT_FOREGROUND = 'premium_foreground'
+
+
+@dataclass(frozen=True)
+class Target:
+    """One output file: which design to render, at what size, and where."""
+
+    path: str
+    design: str
+    size: int
+    # iOS rejects icons with an alpha channel
+    opaque: bool = False
+    supersample: int = 1
+    optimize: bool = False
+
+
+def ios_filename(points, scale):
+    return f'Icon-App-{points}x{points}@{scale}x.png'
+
+
+def ios_contents():
+    """The ``Contents.json`` document describing ``IOS_ICONS``."""
+    return {
+        'images': [
+            {
+                'size': f'{points}x{points}',
+                'idiom': idiom,
+                'filename': ios_filename(points, scale),
+                'scale': f'{scale}x',
+            }
+            for points, idiom, scale in IOS_ICONS
+        ],
+        'info': {'version': 1, 'author': 'xcode'},
+    }
+
+
+def icon_targets(icon=DEFAULT_ICON, foreground=DEFAULT_FOREGROUND, supersample=1, optimize=False):
+    """All Android and iOS icon targets, largest first for pool balance."""
+    targets = []
+    for density, scale in ANDROID_DENSITIES.items():
+        targets.append(Target(os.path.join(ANDROID_RES, f'mipmap-{density}', 'ic_launcher.png'),
+                              icon, round(LAUNCHER_DP * scale), supersample=supersample, optimize=optimize))
+        targets.append(Target(os.path.join(ANDROID_RES, f'drawable-{density}', 'ic_launcher_foreground.png'),
+                              foreground, round(ADAPTIVE_FOREGROUND_DP * scale), supersample=supersample,
+                              optimize=optimize))
+    seen = set()
+    for points, _idiom, scale in IOS_ICONS:
+        filename = ios_filename(points, scale)
+        if filename in seen:
+            continue
+        seen.add(filename)
+        targets.append(Target(os.path.join(IOS_APPICON, filename), icon,
+                              round(float(points) * scale), opaque=True, supersample=supersample,
+                              optimize=optimize))
+    return sorted(targets, key=lambda t: t.size, reverse=True)
+
+
+def icon_nodes(graph, manifest, icon=DEFAULT_ICON, foreground=DEFAULT_FOREGROUND, supersample=None,
+               optimize=False):
+    """Add every stale icon target plus ``Contents.json`` to a ``brand_render.graph.Graph``.
+
+    Targets of the same scene and size (the 1024px App Store icon and
+    ``assets/app_icon.png``) share one render. Returns ``{path: write step
+    or None if current}``.
+    """
+    from brand_render.designs import SCENES
+
+    steps = {}
+    for target in icon_targets(icon, foreground, supersample or SUPERSAMPLE, optimize):
+        steps[target.path] = asset_nodes(graph, manifest, target.path, SCENES[target.design], target.size,
+                                         target.opaque, target.supersample, target.optimize)
+    contents = os.path.join(IOS_APPICON, 'Contents.json')
+    steps[contents] = graph.add(f'write {contents}', 'write',
+                                partial(write_json, manifest.root, contents, ios_contents()))
+    return steps
+
+
+def export_icons(root='.', icon=DEFAULT_ICON, foreground=DEFAULT_FOREGROUND, jobs=None, supersample=None,
+                 optimize=False):
+    """Write every icon target plus ``Contents.json`` under ``root``.
+
+    Targets whose cache key matches the manifest are skipped without
+    rendering; ``jobs`` is passed to ``Graph.run``. Returns ``{path:
+    'skipped' | 'unchanged' | 'written'}``.
+    """
+    from brand_render.graph import Graph
+
+    with Manifest(root) as manifest:
+        graph = Graph()
+        steps = icon_nodes(graph, manifest, icon, foreground, supersample, optimize)
+        return graph.run(jobs).status(steps)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export every Android and iOS launcher icon in one run.')
+    parser.add_argument('--root', default='.', help='Flutter project root to write into')
+    parser.add_argument('--icon', default=DEFAULT_ICON, help='design for the launcher/App Store icon')
+    parser.add_argument('--foreground', default=DEFAULT_FOREGROUND, help='design for the adaptive foreground')
+    parser.add_argument('--jobs', type=int, default=None, help='build steps to run in parallel (default: all cores)')
+    parser.add_argument('--supersample', type=int, default=None, choices=(1, 2, 4, 8),
+                        help='antialiasing factor (default: FAITHCONNECT_SUPERSAMPLE or 1)')
+    parser.add_argument('--optimize', action='store_true', help='losslessly minimize each PNG (slower)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    status = export_icons(args.root, args.icon, args.foreground, args.jobs, args.supersample, args.optimize)
+    counts = {state: list(status.values()).count(state) for state in ('written', 'unchanged', 'skipped')}
+    print(f"✓ {len(status)} files in {time.perf_counter() - start:.3f}s "
+          f"({counts['written']} written, {counts['unchanged']} unchanged, {counts['skipped']} up to date)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Golden-image regression check for the generator scenes.
+
+Renders every scene at each size of the matrix and compares it with the
+reference PNG checked in under ``brand_render/golden/``. Images are cut
+into square tiles; identical tiles pass immediately, and any tile that
+differs must still reach an SSIM of ``--ssim`` against the reference.
+Tiles are evaluated a row at a time, so a broken image stops at the
+first failing tile row. Failing images get a heatmap of the per-pixel
+difference written to ``--diff-dir``.
+
+Usage (from the repository root)::
+
+    python -m brand_render.golden            # check, exit 1 on any failure
+    python -m brand_render.golden --update   # re-record the references
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+SIZES = (48, 192, 1024)
+TILE = 16
+SSIM_THRESHOLD = 0.995
+
+# SSIM stabilizers for 8-bit data
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def reference_path(name, size, directory=GOLDEN_DIR):
+    return os.path.join(directory, f'{name}@{size}.png')
+
+
+def _tiles(pixels, tile):
+    """View an (H, W, C) band as (tiles, tile*tile, C), zero-padding the width."""
+    height, width, channels = pixels.shape
+    pad = -width % tile
+    if pad:
+        pixels = np.pad(pixels, ((0, 0), (0, pad), (0, 0)))
+    count = pixels.shape[1] // tile
+    return pixels.reshape(height, count, tile, channels).swapaxes(0, 1).reshape(count, -1, channels)
+
+
+def tile_ssim(a, b):
+    """SSIM of each tile in two (tiles, pixels, channels) stacks, averaged over channels."""
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    mean_a, mean_b = a.mean(axis=1), b.mean(axis=1)
+    var_a, var_b = a.var(axis=1), b.var(axis=1)
+    cov = (a * b).mean(axis=1) - mean_a * mean_b
+    ssim = ((2 * mean_a * mean_b + _C1) * (2 * cov + _C2)
+            / ((mean_a ** 2 + mean_b ** 2 + _C1) * (var_a + var_b + _C2)))
+    return ssim.mean(axis=-1)
+
+
+def compare(actual, expected, tile=TILE, threshold=SSIM_THRESHOLD):
+    """Compare two uint8 images tile by tile.
+
+    Returns None if they match, else ``(tile_x, tile_y, ssim)`` of the first
+    failing tile in raster order.
+    """
+    if actual.shape != expected.shape:
+        return 0, 0, 0.0
+    for top in range(0, actual.shape[0], tile):
+        a = _tiles(actual[top:top + tile], tile)
+        b = _tiles(expected[top:top + tile], tile)
+        changed = np.flatnonzero((a != b).any(axis=(1, 2)))
+        if not changed.size:
+            continue
+        ssim = tile_ssim(a[changed], b[changed])
+        failing = np.flatnonzero(ssim < threshold)
+        if failing.size:
+            return int(changed[failing[0]]), top // tile, float(ssim[failing[0]])
+    return None
+
+
+def heatmap(actual, expected):
+    """Reference in grey with the per-pixel difference painted over in red."""
+    if actual.shape != expected.shape:
+        return Image.fromarray(np.full((64, 64, 3), (255, 0, 0), dtype=np.uint8))
+    diff = np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max(axis=-1)
+    grey = expected[..., :3].mean(axis=-1) * 0.4
+    # Scale so even a one-level difference is visible
+    heat = np.clip(diff * 32, 0, 255).astype(np.float32)
+    rgb = np.stack([np.maximum(grey, heat), grey * (1 - heat / 255), grey * (1 - heat / 255)], axis=-1)
+    return Image.fromarray(rgb.astype(np.uint8))
+
+
+def _pixels(img):
+    return np.asarray(img.convert('RGBA'))
+
+
+def run(names=None, sizes=SIZES, threshold=SSIM_THRESHOLD, update=False, diff_dir='golden_diff', directory=GOLDEN_DIR):
+    """Check (or with ``update`` re-record) every scene/size pair.
+
+    Returns ``(failures, compare_seconds)``; comparison time excludes
+    rendering and PNG decoding.
+    """
+    from brand_render.designs import SCENES
+    from brand_render.render import render
+
+    failures = []
+    compare_seconds = 0.0
+    for name in names or SCENES:
+        for size in sizes:
+            img = render(SCENES[name], size, supersample=1)
+            path = reference_path(name, size, directory)
+            if update:
+                os.makedirs(directory, exist_ok=True)
+                img.save(path, optimize=True)
+                print(f"  ✓ Recorded {os.path.relpath(path)}")
+                continue
+            if not os.path.exists(path):
+                failures.append(f"{name}@{size}: no reference at {os.path.relpath(path)}")
+                continue
+            actual = _pixels(img)
+            with Image.open(path) as ref:
+                expected = _pixels(ref)
+
+            start = time.perf_counter()
+            result = compare(actual, expected, threshold=threshold)
+            compare_seconds += time.perf_counter() - start
+            if result is None:
+                continue
+            tile_x, tile_y, ssim = result
+            os.makedirs(diff_dir, exist_ok=True)
+            diff_path = os.path.join(diff_dir, f'{name}@{size}.png')
+            heatmap(actual, expected).save(diff_path)
+            failures.append(f"{name}@{size}: tile ({tile_x}, {tile_y}) at px "
+                            f"({tile_x * TILE}, {tile_y * TILE}) has SSIM {ssim:.4f}; heatmap {diff_path}")
+    return failures, compare_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare generator renders with the golden reference images.')
+    parser.add_argument('--scenes', nargs='+', default=None, help='scene names (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--ssim', type=float, default=SSIM_THRESHOLD,
+                        help='minimum SSIM for a tile that is not bit-identical (default 0.995)')
+    parser.add_argument('--diff-dir', default='golden_diff', help='where failure heatmaps are written')
+    parser.add_argument('--update', action='store_true', help='re-record the reference images')
+    args = parser.parse_args(argv)
+
+    failures, seconds = run(args.scenes, args.sizes, args.ssim, args.update, args.diff_dir)
+    if args.update:
+        return 0
+    if failures:
+        print(f"✗ {len(failures)} golden image(s) differ:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print(f"✓ All golden images match (compared in {seconds * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
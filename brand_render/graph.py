@@ -0,0 +1,220 @@
+"""
+Dependency graph of asset build steps, run in parallel.
+
+A build is a DAG of named steps of four kinds: ``render`` (rasterize a
+scene), ``derive`` (resize, recolour or quantize another step's pixels),
+``optimize`` (encode the PNG, with the lossless search if asked) and
+``write`` (store the bytes and record them in the manifest). Each step is
+a function of its dependencies' results. Steps are named by what they
+compute, so two outputs asking for the same render share one node and its
+result is computed once and handed to both in memory.
+
+``Graph.run`` executes every step whose dependencies are done. Render
+steps spend most of their time in Python-level shape and layer loops that
+hold the GIL, so they go to a process pool; their function, arguments and
+result must pickle, so they are module-level functions bound with
+``functools.partial``. The other steps are NumPy, zlib and PIL work that
+releases the GIL, and run on threads that share results without copying.
+Intermediate results are dropped as soon as their last consumer has
+finished, and every step is timed. The
+returned ``Run`` reports the critical path: the longest chain of
+dependent work, which bounds how fast the build can go with enough cores.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from brand_render import layer_cache, profiling
+
+KINDS = ('render', 'derive', 'optimize', 'write')
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    kind: str
+    func: object
+    deps: tuple = ()
+
+
+class Graph:
+    """Build steps in the order they were added (which is a topological order)."""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, kind, func, *deps):
+        """Add step ``name`` computing ``func(*results of deps)``; returns ``name``.
+
+        A step already in the graph under ``name`` is reused as it is.
+        """
+        if name in self.nodes:
+            return name
+        if kind not in KINDS:
+            raise ValueError(f"Unknown step kind {kind!r}, expected one of {KINDS}")
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise KeyError(f"{name!r} depends on unknown steps {missing}")
+        self.nodes[name] = Node(name, kind, func, deps)
+        return name
+
+    def run(self, jobs=None):
+        """Execute every step, ``jobs`` at a time (default: all cores); returns a ``Run``.
+
+        With more than one job, render steps go to a pool of ``jobs`` worker
+        processes and the rest to as many threads.
+        """
+        jobs = jobs or os.cpu_count() or 1
+        run = Run(self, jobs)
+        if jobs == 1:
+            for node in self.nodes.values():
+                run.finish(node, *_execute(node.func, [run.results[dep] for dep in node.deps]))
+            return run
+
+        consumers = {name: [] for name in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.deps:
+                consumers[dep].append(node.name)
+        waiting = {name: len(node.deps) for name, node in self.nodes.items()}
+        profiler, cache = profiling.active(), layer_cache.active()
+        origin = profiler.origin if profiler else None
+        processes = None
+        if any(node.kind == 'render' for node in self.nodes.values()):
+            processes = ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker,
+                                            initargs=((cache.directory, cache.budget) if cache else None,))
+        threads = ThreadPoolExecutor(max_workers=jobs)
+        futures = {}
+
+        def remote(node):
+            return node.kind == 'render' and processes is not None
+
+        def submit(name):
+            node = self.nodes[name]
+            args = [run.results[dep] for dep in node.deps]
+            if remote(node):
+                futures[processes.submit(_execute_remote, node.func, args, origin)] = node
+            else:
+                futures[threads.submit(_execute, node.func, args)] = node
+
+        try:
+            # Render steps first, so a forking pool starts its workers before any thread does
+            for name in sorted((name for name, count in waiting.items() if not count),
+                               key=lambda name: self.nodes[name].kind != 'render'):
+                submit(name)
+            while futures:
+                done, _pending = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    if remote(node):
+                        result, start, end, events, counts = future.result()
+                        if profiler is not None:
+                            profiler.events.extend(events)
+                        if cache is not None:
+                            cache.add_counts(*counts)
+                    else:
+                        result, start, end = future.result()
+                    run.finish(node, result, start, end)
+                    for name in consumers[node.name]:
+                        waiting[name] -= 1
+                        if not waiting[name]:
+                            submit(name)
+        finally:
+            threads.shutdown(cancel_futures=True)
+            if processes is not None:
+                processes.shutdown(cancel_futures=True)
+        return run
+
+
+def _execute(func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, start, time.perf_counter()
+
+
+def _start_worker(cache):
+    if cache is not None:
+        layer_cache.install(*cache)
+
+
+def _execute_remote(func, args, origin):
+    """``_execute`` in a worker process, plus its trace events, layer cache lookups and peak cache memory."""
+    cache = layer_cache.active()
+    before = cache.counts if cache else (0, 0, 0)
+    if origin is None:
+        (result, start, end), events = _execute(func, args), []
+    else:
+        (result, start, end), events = profiling.traced(origin, _execute, func, args)
+    after = cache.counts if cache else (0, 0, 0)
+    usage = [now - then for now, then in zip(after, before)] + [cache.peak if cache else 0]
+    return result, start, end, events, usage
+
+
+class Run:
+    """Results and timings of one ``Graph.run``.
+
+    ``results`` keeps the result of every step nothing else depends on
+    (the writes); intermediate results are released once consumed.
+    """
+
+    def __init__(self, graph, jobs=1):
+        self.graph, self.jobs = graph, jobs
+        self.results = {}
+        self.times = {}
+        self.origin = time.perf_counter()
+        self._unconsumed = {name: 0 for name in graph.nodes}
+        for node in graph.nodes.values():
+            for dep in node.deps:
+                self._unconsumed[dep] += 1
+
+    def finish(self, node, result, start, end):
+        self.results[node.name] = result
+        self.times[node.name] = (start - self.origin, end - self.origin)
+        for dep in node.deps:
+            self._unconsumed[dep] -= 1
+            if not self._unconsumed[dep]:
+                del self.results[dep]
+
+    def status(self, steps):
+        """``{path: status}`` for ``{path: write step}``, where a None step means skipped as current."""
+        return {path: 'skipped' if step is None else self.results[step] for path, step in steps.items()}
+
+    def duration(self, name):
+        start, end = self.times[name]
+        return end - start
+
+    @property
+    def wall(self):
+        return max((end for _start, end in self.times.values()), default=0.0)
+
+    @property
+    def work(self):
+        return sum(self.duration(name) for name in self.times)
+
+    def critical_path(self):
+        """``(seconds, [step names])`` of the longest chain of dependent steps."""
+        finish, previous = {}, {}
+        for name, node in self.graph.nodes.items():
+            before = max(node.deps, key=finish.get, default=None)
+            previous[name] = before
+            finish[name] = self.duration(name) + (finish[before] if before else 0.0)
+        if not finish:
+            return 0.0, []
+        name = max(finish, key=finish.get)
+        chain = []
+        while name:
+            chain.append(name)
+            name = previous[name]
+        return finish[chain[0]], chain[::-1]
+
+    def summary(self):
+        seconds, chain = self.critical_path()
+        kinds = {kind: sum(1 for node in self.graph.nodes.values() if node.kind == kind) for kind in KINDS}
+        counts = ', '.join(f"{count} {kind}" for kind, count in kinds.items() if count)
+        jobs = f"{self.jobs} jobs" if self.jobs > 1 else '1 job'
+        lines = [f"{len(self.times)} steps ({counts}): {self.work:.2f}s of work in {self.wall:.2f}s on {jobs}, "
+                 f"critical path {seconds:.2f}s:"]
+        lines += [f"  {'→' if i else ' '} {name} ({self.duration(name) * 1000:.0f} ms)"
+                  for i, name in enumerate(chain)]
+        return '\n'.join(lines)
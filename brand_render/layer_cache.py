@@ -0,0 +1,200 @@
+"""
+Two-tier memoization of rendered layers.
+
+Groups and blended layers are rendered onto their own premultiplied
+buffer over their bounding box before being blended onto the canvas, and
+while a cache is active so is every layer it accepts. Those buffers are
+memoized by the layer's full
+specification (shapes, paints, blend, filter) and the raster size, which
+already folds in the supersample factor. So a layer shared by several
+scenes, such as the infinity symbol in the premium logo and foreground, is
+rendered once per run.
+
+The first tier is an in-process LRU bounded by a byte budget, a quarter of
+``brand_render.render.STRIP_BYTES`` by default so caching never costs more
+memory than strip streaming saves. A layer only enters it when it is asked
+for a second time: most layers belong to one scene at one size, and
+keeping those would fill the budget with pixels nothing reads again. The
+second tier is a directory of ``.npy`` files, opened memory-mapped, so
+concurrent export workers and later runs share one copy through the page
+cache; every layer rendered is written there. Keys include
+``RENDERER_VERSION``, so renderer changes never read stale pixels. The
+build graph's threads share one cache; its render processes each keep
+their own, and share layers through the directory.
+
+Caching is off unless asked for. Enable it for a block with ``with
+caching('.brand_cache'): ...``, set ``FAITHCONNECT_LAYER_CACHE`` to a
+directory for every generator, or pass ``--layer-cache`` to ``python -m
+brand_render``, which then reports the hit rate.
+"""
+
+import os
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+BUDGET_BYTES = int(os.environ.get('FAITHCONNECT_LAYER_CACHE_MB', '4')) * 1024 * 1024
+# Layers bigger than this share of the budget are rendered per window, as
+# caching them whole would defeat strip streaming of huge renders
+MAX_ENTRY_SHARE = 4
+
+_active = None
+
+
+class LayerCache:
+    """In-memory LRU of rendered layer buffers in front of an optional mmap'd directory."""
+
+    def __init__(self, directory=None, budget=BUDGET_BYTES):
+        self.directory, self.budget = directory, budget
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.disk_hits = self.misses = 0
+        self.peak = 0
+        # Lookups per key; a layer is kept in memory from its second on
+        self.requests = Counter()
+        self.lock = threading.Lock()
+        # Keys being rendered by some thread, which others wait on rather than render again
+        self.pending = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def accepts(self, window):
+        """Whether a layer covering pixel ``window`` is small enough to cache whole."""
+        return (window[2] - window[0]) * (window[3] - window[1]) * 16 <= self.budget // MAX_ENTRY_SHARE
+
+    def get(self, layer, size, render):
+        """The buffer for ``layer`` at ``size``, calling ``render()`` on a miss.
+
+        Safe across threads: a layer requested while another thread renders
+        it waits for that render instead of repeating it, and the wait
+        counts as a reuse.
+        """
+        from brand_render.cache import asset_key
+
+        key = asset_key(layer, size)
+        with self.lock:
+            self.requests[key] += 1
+            pixels = self.entries.get(key)
+            if pixels is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return pixels
+            waiting = self.pending.get(key)
+            if waiting is None:
+                self.pending[key] = threading.Event()
+        if waiting is not None:
+            waiting.wait()
+            with self.lock:
+                # get() counts this lookup again
+                self.requests[key] -= 1
+            return self.get(layer, size, render)
+        try:
+            pixels = self._load(key)
+            loaded = pixels is not None
+            if not loaded:
+                pixels = render()
+                self._save(key, pixels)
+            with self.lock:
+                if loaded:
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                if self.requests[key] > 1:
+                    self._remember(key, pixels)
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+        return pixels
+
+    def _remember(self, key, pixels):
+        self.entries[key] = pixels
+        self.bytes += pixels.nbytes
+        while self.bytes > self.budget:
+            _key, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+        self.peak = max(self.peak, self.bytes)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npy')
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        import numpy as np
+
+        try:
+            return np.load(self._path(key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, pixels):
+        if not self.directory:
+            return
+        import numpy as np
+
+        # Write then rename, so concurrent workers never map a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                np.save(fh, pixels)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @property
+    def counts(self):
+        return self.hits, self.disk_hits, self.misses
+
+    def add_counts(self, hits, disk_hits, misses, peak=0):
+        """Fold in the lookups a pool worker made against its own cache, and its peak memory."""
+        with self.lock:
+            self.hits += hits
+            self.disk_hits += disk_hits
+            self.misses += misses
+            self.peak = max(self.peak, peak)
+
+    @property
+    def lookups(self):
+        return self.hits + self.disk_hits + self.misses
+
+    def summary(self):
+        rate = (self.hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+        return (f"layer cache: {self.lookups} lookups, {self.hits} memory hits, {self.disk_hits} disk hits, "
+                f"{self.misses} rendered ({rate:.0%} hit rate, peak {self.peak / 2 ** 20:.1f} "
+                f"of {self.budget / 2 ** 20:.0f} MiB in memory)")
+
+
+def active():
+    """The current ``LayerCache``, or None when caching is off."""
+    return _active
+
+
+def install(directory=None, budget=BUDGET_BYTES):
+    """Keep a cache active for the rest of this process, as pool workers do."""
+    global _active
+    _active = LayerCache(directory, budget)
+
+
+@contextmanager
+def caching(directory=None, budget=BUDGET_BYTES):
+    """Memoize rendered layers within the enclosed block, stored under ``directory``.
+
+    ``directory`` defaults to ``FAITHCONNECT_LAYER_CACHE``; with neither
+    set this does nothing and yields None. Nested blocks reuse the cache
+    already active.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    directory = directory or os.environ.get('FAITHCONNECT_LAYER_CACHE')
+    if not directory:
+        yield None
+        return
+    _active = LayerCache(directory, budget)
+    try:
+        yield _active
+    finally:
+        _active = None
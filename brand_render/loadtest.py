@@ -0,0 +1,136 @@
+"""
+Load test for the ``brand_render.serve`` render service.
+
+Opens ``--concurrency`` keep-alive connections and sends ``--requests``
+renders between them. The requests are drawn at random from the designs,
+sizes and variants given, so the same render is often asked for more than
+once, both while it is in flight and after it is cached. A share of
+repeats revalidate with ``If-None-Match``. The script prints throughput,
+latency percentiles, status codes and where each response came from
+(``rendered``, ``coalesced``, ``cache`` or ``not_modified``), then the
+server's own ``/stats``. Standard library only.
+
+Usage (from the repository root, with the service running)::
+
+    python -m brand_render.loadtest --url http://127.0.0.1:8765 --requests 500 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlencode, urlsplit
+
+from brand_render.serve import percentile
+
+DESIGNS = ('premium_app_icon', 'premium_foreground', 'fixed_icon', 'faith_icon')
+SIZES = (48, 96, 192, 512)
+VARIANTS = ('', 'night')
+
+
+async def fetch(reader, writer, host, target, headers=None):
+    """``(status, headers, body)`` of one GET on an open keep-alive connection."""
+    lines = [f"GET {target} HTTP/1.1", f"Host: {host}"] + [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    head = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        head[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(head.get('content-length', '0')))
+    return status, head, body
+
+
+async def client(host, port, queue, etags, revalidate, results, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                target = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            headers = {}
+            if target in etags and rng.random() < revalidate:
+                headers['If-None-Match'] = etags[target]
+            start = time.perf_counter()
+            status, head, body = await fetch(reader, writer, host, target, headers)
+            elapsed = time.perf_counter() - start
+            if 'etag' in head:
+                etags[target] = head['etag']
+            source = 'not_modified' if status == 304 else head.get('x-render-source', '')
+            results.append((elapsed, status, source, len(body)))
+    finally:
+        writer.close()
+
+
+async def run(url, requests, concurrency, designs, sizes, variants, revalidate=0.25, seed=0):
+    """Send the load and return the client-side report plus the server's ``/stats``."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    rng = random.Random(seed)
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        query = {'design': rng.choice(designs), 'size': rng.choice(sizes)}
+        variant = rng.choice(variants)
+        if variant:
+            query['variant'] = variant
+        queue.put_nowait('/render?' + urlencode(query))
+    etags, results = {}, []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, queue, etags, revalidate, results, rng) for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _status, _head, body = await fetch(reader, writer, host, '/stats', {'Connection': 'close'})
+    finally:
+        writer.close()
+    latencies = sorted(elapsed for elapsed, _status, _source, _size in results)
+    report = {
+        'requests': len(results),
+        'seconds': round(wall, 3),
+        'requests_per_second': round(len(results) / wall, 2) if wall else 0.0,
+        'latency_ms': {name: round(percentile(latencies, fraction) * 1000, 2)
+                       for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'statuses': dict(Counter(status for _elapsed, status, _source, _size in results)),
+        'sources': dict(Counter(source for _elapsed, _status, source, _size in results)),
+        'bytes': sum(size for _elapsed, _status, _source, size in results),
+    }
+    return report, json.loads(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test a running brand_render.serve instance.')
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help='service address')
+    parser.add_argument('--requests', type=int, default=500, help='renders to request (default: 500)')
+    parser.add_argument('--concurrency', type=int, default=16, help='parallel connections (default: 16)')
+    parser.add_argument('--designs', nargs='+', default=list(DESIGNS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS),
+                        help="palettes to mix in; '' is the design as drawn")
+    parser.add_argument('--revalidate', type=float, default=0.25,
+                        help='share of repeat requests sent with If-None-Match (default: 0.25)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report, server = asyncio.run(run(args.url, args.requests, args.concurrency, args.designs, args.sizes,
+                                     args.variants, args.revalidate, args.seed))
+    latency = report['latency_ms']
+    print(f"✓ {report['requests']} requests in {report['seconds']:.2f}s "
+          f"({report['requests_per_second']:.1f} req/s, {report['bytes'] / 2 ** 20:.1f} MiB)")
+    print(f"  latency p50 {latency['p50']} ms, p90 {latency['p90']} ms, p99 {latency['p99']} ms, "
+          f"max {latency['max']} ms")
+    print(f"  statuses {report['statuses']}, sources {report['sources']}")
+    print(f"  server: {server['renders']} renders (mean {server['render_ms_mean']} ms), "
+          f"cache {server['cache']['hits']} hits / {server['cache']['misses']} misses, "
+          f"{server['requests_per_second']} req/s since start")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Lossless (or tolerance-bounded) PNG size optimization.
+
+Each image is tried in every representation that reproduces its pixels:
+as-is, RGB when fully opaque, greyscale when colourless, and palette
+when it has at most 256 colours. With a non-zero ``tolerance`` a
+quantized 256-colour palette is tried too, if no channel moves by more
+than ``tolerance`` levels. Every representation is encoded with every
+PNG filter, and the front-runners again with every zlib level and
+strategy. Trials run in a thread pool, since zlib and NumPy release the
+GIL. The smallest encoding that decodes back to the expected pixels wins.
+
+Images with more than 8 bits per channel are left alone: every
+representation here is 8-bit, so rewriting them would lose precision.
+
+Rewriting a file keeps its colour-management chunks (``iCCP``, ``sRGB``,
+``gAMA``, ``cHRM``, ``cICP``, ``sBIT``), so it displays as before;
+``--strip-colour`` drops them too.
+
+Usage (from the repository root)::
+
+    python -m brand_render.optimize android ios assets          # rewrite in place
+    python -m brand_render.optimize assets --dry-run --tolerance 2
+    python -m brand_render.optimize assets --strip-colour              # drop ICC profiles and gamma too
+"""
+
+import argparse
+import io
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from brand_render.png import FILTERS, PNG_SIGNATURE, PNGWriter
+
+LEVELS = (6, 9)
+STRATEGIES = {'default': zlib.Z_DEFAULT_STRATEGY, 'filtered': zlib.Z_FILTERED, 'rle': zlib.Z_RLE}
+TRUECOLOUR_FILTERS = tuple(FILTERS) + ('adaptive',)
+# Palette indices don't predict each other, so filtering rarely pays off
+PALETTE_FILTERS = ('none', 'adaptive')
+# Ancillary chunks that change how the pixels are displayed; all precede PLTE and IDAT
+COLOUR_CHUNKS = (b'iCCP', b'sRGB', b'gAMA', b'cHRM', b'cICP', b'sBIT')
+
+
+def _exact_palette(pixels):
+    """``(indices, palette)`` if ``pixels`` (H, W, 4) has at most 256 colours."""
+    packed = pixels.view(np.uint32).reshape(pixels.shape[:2])
+    colours, indices = np.unique(packed, return_inverse=True)
+    if len(colours) > 256:
+        return None
+    palette = [tuple(c) for c in colours.view(np.uint8).reshape(-1, 4)]
+    return indices.reshape(pixels.shape[:2]).astype(np.uint8), palette
+
+
+def _quantized_palette(pixels, tolerance):
+    img = Image.fromarray(pixels).quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    indices = np.asarray(img)
+    palette = np.asarray(img.getpalette('RGBA')[:4 * 256], dtype=np.uint8).reshape(-1, 4)
+    error = np.abs(palette[indices].astype(np.int16) - pixels).max()
+    if error > tolerance:
+        return None
+    return indices, [tuple(c) for c in palette]
+
+
+def representations(pixels, tolerance=0):
+    """``{name: (rows, channels, palette)}`` reproducing RGBA ``pixels``."""
+    reps = {'rgba': (pixels, 4, None)}
+    opaque = bool((pixels[..., 3] == 255).all())
+    grey = bool(((pixels[..., 0] == pixels[..., 1]) & (pixels[..., 1] == pixels[..., 2])).all())
+    if opaque:
+        reps['rgb'] = (pixels[..., :3], 3, None)
+    if grey:
+        reps['grey' if opaque else 'grey+alpha'] = (pixels[..., 0] if opaque else pixels[..., [0, 3]],
+                                                    1 if opaque else 2, None)
+    exact = _exact_palette(pixels)
+    if exact:
+        reps['palette'] = (exact[0], 1, exact[1])
+    elif tolerance:
+        quantized = _quantized_palette(pixels, tolerance)
+        if quantized:
+            reps['quantized'] = (quantized[0], 1, quantized[1])
+    return reps
+
+
+def encode(rows, channels, palette, filter, level, strategy):
+    buf = io.BytesIO()
+    height, width = rows.shape[:2]
+    with PNGWriter(buf, width, height, channels, level, filter, strategy, palette) as writer:
+        writer.write(rows)
+    return buf.getvalue()
+
+
+def decodes_to(data, pixels, tolerance=0):
+    with Image.open(io.BytesIO(data)) as img:
+        decoded = np.asarray(img.convert('RGBA'))
+    return decoded.shape == pixels.shape and np.abs(decoded.astype(np.int16) - pixels).max() <= tolerance
+
+
+def _search(pool, trials):
+    """Encode every ``(label, args)`` trial; returns ``[(size, label, data)]``."""
+    return list(pool.map(lambda trial: (len(data := encode(*trial[1])), trial[0], data), trials))
+
+
+def optimize_png(img, tolerance=0, jobs=None, finalists=2):
+    """Smallest PNG encoding of ``img`` within ``tolerance``.
+
+    Every representation and filter is first encoded at the highest level
+    with the default strategy; the best ``finalists`` are then tried with
+    every level and strategy. Returns ``(data, description)``, naming the
+    winning representation, filter, level and strategy.
+    """
+    pixels = np.ascontiguousarray(np.asarray(img.convert('RGBA')))
+    candidates = []
+    for name, (rows, channels, palette) in representations(pixels, tolerance).items():
+        for filter in PALETTE_FILTERS if palette is not None else TRUECOLOUR_FILTERS:
+            candidates.append((name, filter, rows, channels, palette))
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        results = _search(pool, [((name, filter, max(LEVELS), 'default'),
+                                  (rows, channels, palette, filter, max(LEVELS), zlib.Z_DEFAULT_STRATEGY))
+                                 for name, filter, rows, channels, palette in candidates])
+        ranked = sorted(range(len(candidates)), key=lambda i: results[i][0])[:finalists]
+        results += _search(pool, [((name, filter, level, strategy_name),
+                                   (rows, channels, palette, filter, level, strategy))
+                                  for name, filter, rows, channels, palette in (candidates[i] for i in ranked)
+                                  for level in LEVELS for strategy_name, strategy in STRATEGIES.items()
+                                  if (level, strategy_name) != (max(LEVELS), 'default')])
+    for _size, (name, filter, level, strategy), data in sorted(results, key=lambda r: r[0]):
+        if decodes_to(data, pixels, tolerance):
+            return data, f"{name}, {filter} filter, level {level}, {strategy} strategy"
+    raise RuntimeError("No PNG encoding reproduced the image")
+
+
+def chunks(data):
+    """``(type, raw chunk bytes)`` for each chunk of PNG ``data``."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        end = offset + 12 + length
+        yield kind, data[offset:end]
+        offset = end
+
+
+def colour_chunks(data):
+    """The raw colour-management chunks of PNG ``data``, in file order."""
+    return [raw for kind, raw in chunks(data) if kind in COLOUR_CHUNKS]
+
+
+def with_chunks(data, extra):
+    """PNG ``data`` with the raw chunks ``extra`` inserted after ``IHDR``."""
+    ihdr = len(PNG_SIGNATURE) + 25
+    return data[:ihdr] + b''.join(extra) + data[ihdr:]
+
+
+def bit_depth(data):
+    """Bits per channel (or palette index) of PNG ``data``, from its ``IHDR``."""
+    kind, raw = next(chunks(data), (None, b''))
+    if kind != b'IHDR' or len(raw) < 25:
+        raise ValueError("PNG file does not start with IHDR")
+    return raw[16]
+
+
+def optimize_file(path, tolerance=0, jobs=None, dry_run=False, strip_colour=False):
+    """Optimize the PNG at ``path`` in place; returns ``(before, after, description)``.
+
+    Colour-management chunks are carried over unless ``strip_colour``.
+    Files with more than 8 bits per channel are left as they are.
+    """
+    from brand_render.cache import atomic_write
+
+    with open(path, 'rb') as fh:
+        original = fh.read()
+    before = len(original)
+    depth = bit_depth(original)
+    if depth > 8:
+        return before, before, f'{depth}-bit channels, left as is'
+    with Image.open(io.BytesIO(original)) as img:
+        data, description = optimize_png(img, tolerance, jobs)
+    kept = [] if strip_colour else colour_chunks(original)
+    if kept:
+        data = with_chunks(data, kept)
+        description += f", kept {b'/'.join(raw[4:8] for raw in kept).decode('ascii')}"
+    if len(data) >= before:
+        return before, before, 'already optimal'
+    if not dry_run:
+        atomic_write(path, data)
+    return before, len(data), description
+
+
+def png_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _dirs, files in os.walk(path):
+                yield from (os.path.join(directory, f) for f in sorted(files) if f.lower().endswith('.png'))
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Losslessly shrink PNG assets in place.')
+    parser.add_argument('paths', nargs='+', help='PNG files or directories to search')
+    parser.add_argument('--tolerance', type=int, default=0,
+                        help='max per-channel error allowed for palette quantization (default 0: exact)')
+    parser.add_argument('--jobs', type=int, default=None, help='encoder threads (default: all cores)')
+    parser.add_argument('--dry-run', action='store_true', help='report savings without rewriting files')
+    parser.add_argument('--strip-colour', action='store_true',
+                        help='also drop colour-management chunks (ICC profile, sRGB, gamma, chromaticities)')
+    args = parser.parse_args(argv)
+
+    total_before = total_after = 0
+    for path in png_paths(args.paths):
+        try:
+            before, after, description = optimize_file(path, args.tolerance, args.jobs, args.dry_run, args.strip_colour)
+        except (OSError, ValueError) as exc:
+            print(f"  {path}: skipped ({exc})")
+            continue
+        total_before += before
+        total_after += after
+        saved = before - after
+        print(f"  {path}: {before:,} -> {after:,} bytes (-{saved:,}, {saved / before:.1%}) [{description}]")
+    saved = total_before - total_after
+    verb = 'Would save' if args.dry_run else 'Saved'
+    print(f"\n✓ {verb} {saved:,} of {total_before:,} bytes ({saved / max(1, total_before):.1%})")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
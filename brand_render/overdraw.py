@@ -0,0 +1,229 @@
+"""
+Overdraw analysis and culling of hidden primitives.
+
+``analyze`` rasterizes every primitive of a scene the way
+``brand_render.render`` does, without painting, and counts how many times
+each pixel is written and by which primitive. ``Overdraw.heatmap`` shows
+the counts from black (never written) through blue to red (written eight
+or more times). ``Overdraw.writers`` lists the primitives behind one pixel.
+
+A back-to-front pass then tracks the pixels that no earlier drawing can
+show through: those under a full-coverage opaque paint, or under any
+``'copy'`` shape, which replaces whatever is beneath it. A primitive whose
+footprint lies entirely in that set contributes nothing to the final
+image. ``cull`` drops those primitives, and any layers left empty, from the
+scene for that raster size, and ``Overdraw.summary`` reports the pixel
+writes saved. The pass is conservative where a group sits in between.
+Shapes under a drop shadow still cast it, so they are only tested against
+their own group. A group that clears with ``'copy'`` hides nothing outside
+itself.
+
+Usage (from the repository root)::
+
+    python -m brand_render.overdraw premium_app_icon --size 512 --heatmap overdraw.png
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+from PIL import Image
+
+from brand_render.render import coverage, paint_pixels, shape_window
+from brand_render.scene import Group
+
+# Heatmap colour for 0, 1, 2... writes; the last one covers everything above
+HEAT = ((0, 0, 0), (49, 54, 149), (69, 117, 180), (116, 173, 209), (171, 217, 233),
+        (254, 224, 144), (253, 174, 97), (244, 109, 67), (215, 48, 39))
+
+
+@dataclass(frozen=True)
+class Primitive:
+    """One shape as drawn: where it sits in the scene and what it wrote."""
+
+    path: tuple
+    layer: str
+    shape: object
+    window: tuple
+    footprint: object
+    visible: int
+
+    @property
+    def kind(self):
+        return type(self.shape).__name__
+
+    @property
+    def evaluated(self):
+        """Pixels the rasterizer computes coverage for."""
+        return (self.window[2] - self.window[0]) * (self.window[3] - self.window[1])
+
+    @property
+    def written(self):
+        return int(self.footprint.sum()) if self.footprint is not None else 0
+
+    @property
+    def hidden(self):
+        return self.visible == 0
+
+
+@dataclass(frozen=True)
+class Overdraw:
+    """Per-pixel write counts of a scene at one raster size, and the primitives behind them."""
+
+    scene: object
+    size: int
+    counts: object
+    primitives: tuple
+
+    @property
+    def writes(self):
+        return int(self.counts.sum())
+
+    def writers(self, x, y):
+        """Primitives that write pixel ``(x, y)``, in drawing order."""
+        found = []
+        for primitive in self.primitives:
+            x0, y0, x1, y1 = primitive.window
+            if primitive.footprint is not None and x0 <= x < x1 and y0 <= y < y1 \
+                    and primitive.footprint[y - y0, x - x0]:
+                found.append(primitive)
+        return found
+
+    def heatmap(self):
+        """RGB image of the write counts."""
+        heat = np.asarray(HEAT, dtype=np.uint8)
+        return Image.fromarray(heat[np.minimum(self.counts, len(HEAT) - 1)])
+
+    def summary(self, top=10):
+        hidden = [p for p in self.primitives if p.hidden]
+        saved, skipped = sum(p.written for p in hidden), sum(p.evaluated for p in hidden)
+        evaluated = sum(p.evaluated for p in self.primitives)
+        covered = int((self.counts > 0).sum())
+        lines = [f"Overdraw of {self.scene.name} at {self.size}px: {self.writes:,} pixel writes over "
+                 f"{covered:,} pixels ({self.writes / max(covered, 1):.2f}x)",
+                 f"  {len(hidden)} of {len(self.primitives)} primitives hidden, "
+                 f"culling saves {skipped:,} of {evaluated:,} coverage evaluations ({skipped / max(evaluated, 1):.0%}) "
+                 f"and {saved:,} writes ({saved / max(self.writes, 1):.0%})"]
+        for p in sorted(self.primitives, key=lambda p: p.written, reverse=True)[:top]:
+            lines.append(f"  {p.layer}[{p.path[-1]}] {p.kind}: {p.written:,} written, {p.visible:,} visible"
+                         + (' (culled)' if p.hidden else ''))
+        return '\n'.join(lines)
+
+
+def _opaque(shape, window, size, blend):
+    """Pixels of ``window`` where ``shape`` at full coverage hides what is beneath."""
+    if blend == 'copy':
+        return True
+    return paint_pixels(shape.paint, window, size)[..., 3] >= 255
+
+
+def _translucent(paint):
+    return any(getattr(paint, name)[3] < 255 for name in ('colour', 'start', 'end', 'inner', 'outer')
+               if hasattr(paint, name))
+
+
+def _clears(layers):
+    """Whether any shape in ``layers`` is copied with a paint that can leave transparency."""
+    for layer in layers:
+        if isinstance(layer, Group):
+            if _clears(layer.layers):
+                return True
+        elif layer.blend == 'copy' and any(_translucent(shape.paint) for shape in layer.shapes):
+            return True
+    return False
+
+
+def _visit(layers, size, hidden, found, counts, prefix=()):
+    """Visit ``layers`` back to front, recording each primitive and growing ``hidden``
+    with the pixels its drawing leaves nothing beneath showing through."""
+    for position in reversed(range(len(layers))):
+        layer, path = layers[position], prefix + (position,)
+        if isinstance(layer, Group):
+            if layer.filter is not None:
+                # Hidden shapes still cast the shadow, so only the group's own drawing hides them
+                _visit(layer.layers, size, np.zeros_like(hidden), found, counts, path)
+                continue
+            inner = hidden.copy()
+            _visit(layer.layers, size, inner, found, counts, path)
+            if layer.blend == 'over' and not _clears(layer.layers):
+                hidden |= inner
+            continue
+        # Non-linear blends mix with what is beneath, so their shapes hide only within the layer
+        target = hidden if layer.blend in ('over', 'copy') else hidden.copy()
+        blend = 'copy' if layer.blend == 'copy' else 'over'
+        for index in reversed(range(len(layer.shapes))):
+            shape = layer.shapes[index]
+            window = shape_window(shape, size)
+            footprint, visible = None, 0
+            if window[2] > window[0] and window[3] > window[1]:
+                region = target[window[1]:window[3], window[0]:window[2]]
+                footprint = coverage(shape, window, size) > 0
+                if blend == 'over' and not np.any(paint_pixels(shape.paint, window, size)[..., 3]):
+                    footprint[...] = False  # fully transparent paint is never composited
+                visible = int((footprint & ~region).sum())
+                counts[window[1]:window[3], window[0]:window[2]] += footprint
+                region |= footprint & _opaque(shape, window, size, blend)
+            found.append(Primitive(path + (index,), layer.name, shape, window, footprint, visible))
+
+
+def analyze(scene, size, supersample=1):
+    """Write counts and visibility of every primitive of ``scene`` rasterized at ``size * supersample``."""
+    raster = size * supersample
+    counts = np.zeros((raster, raster), dtype=np.int32)
+    found = []
+    _visit(scene.layers, raster, np.zeros((raster, raster), dtype=bool), found, counts)
+    return Overdraw(scene, raster, counts, tuple(reversed(found)))
+
+
+def _without(layers, hidden, prefix=()):
+    kept = []
+    for position, layer in enumerate(layers):
+        path = prefix + (position,)
+        if isinstance(layer, Group):
+            children = _without(layer.layers, hidden, path)
+            if children:
+                kept.append(replace(layer, layers=children))
+            continue
+        shapes = tuple(shape for index, shape in enumerate(layer.shapes) if path + (index,) not in hidden)
+        if shapes:
+            kept.append(replace(layer, shapes=shapes))
+    return tuple(kept)
+
+
+def cull(scene, size, supersample=1):
+    """``(scene without its hidden primitives at this size, Overdraw)``."""
+    analysis = analyze(scene, size, supersample)
+    hidden = {primitive.path for primitive in analysis.primitives if primitive.hidden}
+    return replace(scene, layers=_without(scene.layers, hidden)), analysis
+
+
+def main(argv=None):
+    from brand_render.designs import SCENES
+    from brand_render.render import render_pixels
+
+    parser = argparse.ArgumentParser(description='Count per-pixel overdraw of a scene and cull hidden primitives.')
+    parser.add_argument('design', choices=sorted(SCENES), help='scene to analyze')
+    parser.add_argument('--size', type=int, default=1024, help='output size in pixels (default: 1024)')
+    parser.add_argument('--supersample', type=int, default=1, help='antialiasing factor (default: 1)')
+    parser.add_argument('--heatmap', default=None, help='write the write-count heatmap PNG here')
+    args = parser.parse_args(argv)
+
+    scene = SCENES[args.design]
+    culled, analysis = cull(scene, args.size, args.supersample)
+    print(analysis.summary())
+    if args.heatmap:
+        analysis.heatmap().save(args.heatmap)
+        print(f"✓ Heatmap: {args.heatmap}")
+    timings = []
+    for candidate in (scene, culled):
+        start = time.perf_counter()
+        pixels = render_pixels(candidate, args.size, supersample=args.supersample)
+        timings.append((time.perf_counter() - start, pixels))
+    (before, full), (after, reduced) = timings
+    same = 'identical' if np.array_equal(full, reduced) else 'DIFFERENT'
+    print(f"  render {before * 1000:.0f} ms -> {after * 1000:.0f} ms culled, output {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+Incremental PNG writer and strip-streamed rendering.
+
+``PNGWriter`` accepts image rows in any number of batches, compresses
+them through one zlib stream and emits IDAT chunks as compressed data
+accumulates, so the full image never has to exist in memory.
+``render_png`` renders a scene a horizontal strip at a time straight into
+the writer: peak memory depends on the strip height, not the image
+height, so an 8K-16K print render peaks no higher than a 4K one.
+``StripPNG`` keeps an image as separately compressed strips so that a
+small edit only recompresses the rows it touched (used by watch mode).
+
+Usage (from the repository root)::
+
+    python -m brand_render.png premium_logo 16384 billboard_logo.png
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+IDAT_BYTES = 256 * 1024
+# PNG colour types by channel count (grey, grey+alpha, RGB, RGBA)
+COLOUR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+PALETTE = 3
+FILTERS = {'none': 0, 'sub': 1, 'up': 2, 'average': 3, 'paeth': 4}
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _paeth(left, up, upleft):
+    a, b, c = (v.astype(np.int16) for v in (left, up, upleft))
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    return np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+
+
+def filter_rows(rows, previous, bpp, kind):
+    """Apply PNG filter ``kind`` to a batch of rows, prefixing each with its type.
+
+    ``rows`` is ``(n, stride)`` uint8 and ``previous`` the row above the
+    batch. ``'adaptive'`` picks, per row, the filter with the smallest sum
+    of absolute (signed) residuals, the usual libpng heuristic.
+    """
+    up = np.concatenate([previous, rows[:-1]])
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+
+    def predict(name):
+        # Only the predictors actually used are computed; Paeth is costly
+        if name == 'none':
+            return 0
+        if name == 'sub':
+            return left
+        if name == 'up':
+            return up
+        if name == 'average':
+            return ((left.astype(np.uint16) + up) >> 1).astype(np.uint8)
+        upleft = np.zeros_like(up)
+        upleft[:, bpp:] = up[:, :-bpp]
+        return _paeth(left, up, upleft)
+
+    if kind == 'adaptive':
+        residuals = np.stack([rows - predict(name) for name in FILTERS])
+        cost = np.abs(residuals.view(np.int8).astype(np.int32)).sum(axis=2)
+        best = cost.argmin(axis=0)
+        out = residuals[best, np.arange(len(rows))]
+        types = best.astype(np.uint8)
+    else:
+        out = rows - predict(kind)
+        types = np.full(len(rows), FILTERS[kind], dtype=np.uint8)
+    return np.concatenate([types[:, None], out], axis=1)
+
+
+def _header(width, height, channels, palette=None):
+    """Signature, ``IHDR`` and (for palette images) ``PLTE``/``tRNS`` chunks."""
+    colour_type = COLOUR_TYPES[channels] if palette is None else PALETTE
+    header = PNG_SIGNATURE + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, colour_type, 0, 0, 0))
+    if palette is not None:
+        header += _chunk(b'PLTE', bytes(c for colour in palette for c in colour[:3]))
+        alphas = bytes(colour[3] for colour in palette).rstrip(b'\xff')
+        if alphas:
+            header += _chunk(b'tRNS', alphas)
+    return header
+
+
+class PNGWriter:
+    """Write an 8-bit PNG to ``fh`` row batch by row batch.
+
+    ``channels`` is 1-4 (grey, grey+alpha, RGB, RGBA); with a ``palette``
+    of RGBA tuples, single-channel rows are palette indices. Rows use the
+    PNG "Up" filter by default, which suits the vertical gradients in the
+    brand designs; every filter vectorizes across a whole batch.
+    """
+
+    def __init__(self, fh, width, height, channels=4, level=6, filter='up',
+                 strategy=zlib.Z_DEFAULT_STRATEGY, palette=None):
+        if channels not in COLOUR_TYPES or (palette is not None and channels != 1):
+            raise ValueError(f"Unsupported PNG layout: {channels} channels, palette={palette is not None}")
+        self.fh = fh
+        self.width, self.height, self.channels = width, height, channels
+        self.filter = filter
+        self.rows = 0
+        self.previous = np.zeros((1, width * channels), dtype=np.uint8)
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+        self.pending = []
+        self.pending_bytes = 0
+        fh.write(_header(width, height, channels, palette))
+
+    def write(self, pixels):
+        """Append an ``(rows, width[, channels])`` uint8 batch of rows."""
+        rows = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(len(pixels), -1)
+        if rows.shape[1] != self.width * self.channels:
+            raise ValueError(f"Expected rows of {self.width}x{self.channels} bytes, got {rows.shape[1]}")
+        if self.rows + len(rows) > self.height:
+            raise ValueError(f"Too many rows for a {self.height}px tall image")
+        filtered = filter_rows(rows, self.previous, self.channels, self.filter)
+        self._emit(self.compressor.compress(filtered.tobytes()))
+        self.previous = rows[-1:].copy()
+        self.rows += len(rows)
+
+    def _emit(self, data, flush=False):
+        if data:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        if self.pending_bytes >= IDAT_BYTES or (flush and self.pending_bytes):
+            self.fh.write(_chunk(b'IDAT', b''.join(self.pending)))
+            self.pending, self.pending_bytes = [], 0
+
+    def close(self):
+        if self.rows != self.height:
+            raise ValueError(f"Wrote {self.rows} of {self.height} rows")
+        self._emit(self.compressor.flush(), flush=True)
+        self.fh.write(_chunk(b'IEND', b''))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+
+class StripPNG:
+    """An RGB(A) PNG held as independently compressed strips of rows.
+
+    Each strip is deflated on its own and byte-aligned, so the strips
+    concatenate into one valid zlib stream; when ``update`` is given the
+    row spans that changed, only the strips containing them (and the strip
+    below each, whose first row is predicted from the row above) are
+    filtered and compressed again.
+    """
+
+    def __init__(self, width, height, channels=4, level=6, rows=32, filter='up'):
+        self.width, self.height, self.channels = width, height, channels
+        self.level, self.rows, self.filter = level, rows, filter
+        count = -(-height // rows)
+        self.filtered = [b''] * count
+        self.compressed = [b''] * count
+
+    def update(self, pixels, spans=None):
+        """Re-encode the rows in ``spans`` (``[(top, bottom), ...]``, default all) of full-image ``pixels``."""
+        image = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(self.height, -1)
+        strips = set()
+        for top, bottom in spans or [(0, self.height)]:
+            strips.update(range(top // self.rows, min(len(self.filtered), (bottom - 1) // self.rows + 2)))
+        for strip in sorted(strips):
+            start = strip * self.rows
+            previous = image[start - 1:start] if start else np.zeros((1, image.shape[1]), dtype=np.uint8)
+            filtered = filter_rows(image[start:start + self.rows], previous, self.channels, self.filter).tobytes()
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+            self.filtered[strip] = filtered
+            self.compressed[strip] = compressor.compress(filtered) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def tobytes(self):
+        checksum = 1
+        for filtered in self.filtered:
+            checksum = zlib.adler32(filtered, checksum)
+        # zlib header, the strips, an empty final block and the Adler-32 of all rows
+        stream = b'\x78\x9c' + b''.join(self.compressed) + b'\x03\x00' + struct.pack('>I', checksum)
+        return (_header(self.width, self.height, self.channels) + _chunk(b'IDAT', stream)
+                + _chunk(b'IEND', b''))
+
+
+def strip_rows(size):
+    """Rows per streamed strip, keeping the float32 working set near ``STRIP_BYTES``.
+
+    Supersampled strips are split further inside ``render_pixels``.
+    """
+    from brand_render.render import STRIP_BYTES
+
+    return max(1, STRIP_BYTES // (size * 16))
+
+
+def render_png(scene, size, fh, supersample=None, rows=None, level=6):
+    """Render ``scene`` at ``size`` into a PNG on ``fh`` a strip at a time."""
+    from brand_render import SUPERSAMPLE
+    from brand_render.render import check_supersample, render_pixels
+
+    factor = check_supersample(supersample or SUPERSAMPLE)
+    rows = rows or strip_rows(size)
+    channels = 3 if scene.mode == 'RGB' else 4
+    with PNGWriter(fh, size, size, channels, level) as writer:
+        for top in range(0, size, rows):
+            pixels = render_pixels(scene, size, (0, top, size, min(size, top + rows)), supersample=factor)
+            writer.write(pixels[..., :channels])
+
+
+def main(argv=None):
+    from brand_render.designs import SCENES
+
+    parser = argparse.ArgumentParser(description='Stream a large scene render straight to PNG.')
+    parser.add_argument('scene', choices=sorted(SCENES))
+    parser.add_argument('size', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--supersample', type=int, default=None, choices=(1, 2, 4, 8))
+    parser.add_argument('--rows', type=int, default=None, help='strip height (default: from STRIP_BYTES)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tmp = args.output + '.part'
+    with open(tmp, 'wb') as fh:
+        render_png(SCENES[args.scene], args.size, fh, args.supersample, args.rows)
+    os.replace(tmp, args.output)
+    print(f"✓ Saved {args.output} ({args.size}x{args.size}) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
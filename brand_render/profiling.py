@@ -0,0 +1,135 @@
+"""
+Opt-in profiling of scene rendering and asset output.
+
+While a profiler is active, every layer and every primitive drawn by
+``brand_render.render`` is timed, as are PNG encoding and writing. The
+results are saved as a Chrome trace-event file (open it in
+``chrome://tracing`` or https://ui.perfetto.dev) plus a plain-text summary
+of the hotspots by primitive type and by layer.
+
+Enable it for any generator script with an environment variable::
+
+    FAITHCONNECT_PROFILE=logo_trace.json python faith_connect/generate_new_logo.py
+
+or in code with ``with profiling('trace.json'): ...``. When no profiler is
+active, the hooks are a single ``None`` check per layer.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+_active = None
+_NULL_SPAN = nullcontext()
+
+
+class Profiler:
+    """Collects timed spans as Chrome ``"X"`` (complete) trace events."""
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.events = []
+
+    @contextmanager
+    def span(self, category, name, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_native_id(),
+                'ts': (start - self.origin) * 1e6, 'dur': (end - start) * 1e6, 'args': args,
+            })
+
+    def totals(self, category, key=None):
+        """``{name: [count, seconds]}`` for one category, largest first."""
+        key = key or (lambda event: event['name'])
+        totals = defaultdict(lambda: [0, 0.0])
+        for event in self.events:
+            if event['cat'] == category:
+                entry = totals[key(event)]
+                entry[0] += 1
+                entry[1] += event['dur'] / 1e6
+        return dict(sorted(totals.items(), key=lambda item: item[1][1], reverse=True))
+
+    def summary(self, top=10):
+        wall = max((e['ts'] + e['dur'] for e in self.events), default=0.0) / 1e6
+        lines = [f"Profile: {len(self.events)} spans over {wall * 1000:.1f} ms"]
+        sections = (
+            ('Assets', self.totals('asset', lambda e: f"{e['name']}@{e['args'].get('size')}")),
+            ('Derived', self.totals('derive')),
+            ('Output', self.totals('io')),
+            ('By layer', self.totals('layer')),
+            ('By primitive', self.totals('primitive')),
+            (f'Top {top} hotspots (layer / primitive)',
+             dict(list(self.totals('primitive', lambda e: f"{e['args'].get('layer')} / {e['name']}").items())[:top])),
+        )
+        for title, totals in sections:
+            if not totals:
+                continue
+            lines.append(f"\n{title}:")
+            for name, (count, seconds) in totals.items():
+                share = seconds / wall * 100 if wall else 0.0
+                lines.append(f"  {name:<40} {count:6d}x {seconds * 1000:10.2f} ms {share:6.1f}%")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write the trace to ``path`` and the summary next to it as ``.txt``."""
+        with open(path, 'w') as fh:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, fh)
+        summary_path = os.path.splitext(path)[0] + '.txt'
+        with open(summary_path, 'w') as fh:
+            fh.write(self.summary())
+        return summary_path
+
+
+def active():
+    """The running profiler, or None when profiling is off."""
+    return _active
+
+
+def span(category, name, **args):
+    """Time a block under the active profiler; a no-op context otherwise."""
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(category, name, **args)
+
+
+def traced(origin, func, *args):
+    """``(func(*args), trace events)``, profiled against ``origin`` in a worker process.
+
+    ``perf_counter`` is one system-wide clock, so when ``origin`` is the
+    parent profiler's the events join its trace as they are.
+    """
+    global _active
+    previous, _active = _active, Profiler(origin)
+    try:
+        return func(*args), _active.events
+    finally:
+        _active = previous
+
+
+@contextmanager
+def profiling(path=None):
+    """Profile the enclosed block and write the trace to ``path``.
+
+    ``path`` defaults to ``FAITHCONNECT_PROFILE``; with neither set this
+    does nothing and yields None.
+    """
+    global _active
+    path = path or os.environ.get('FAITHCONNECT_PROFILE')
+    if not path:
+        yield None
+        return
+    previous, _active = _active, Profiler()
+    profiler = _active
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        summary_path = profiler.write(path)
+        print(f"⏱  Profile written: {path} (summary: {summary_path})")
@@ -0,0 +1,599 @@
+"""
+Render declarative scenes directly at any requested pixel size.
+
+The NumPy path evaluates every shape as a coverage mask over the pixels of
+its bounding box and composites its paint into a premultiplied float32
+RGBA buffer, touching only the pixels the shape actually covers. Plain
+layers are painted straight onto the canvas; groups, other blend modes
+and layers the layer cache keeps are drawn on their own buffer the size
+of their bounding box and then blended in. It can render just a window
+``box = (x0, y0, x1, y1)`` of the full canvas. The PIL
+path issues the equivalent ``ImageDraw`` calls and is kept as a reference.
+Both are selected with the ``brand_render.raster`` backend switch.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from brand_render import SUPERSAMPLE, layer_cache, profiling, raster
+from brand_render.blur import drop_shadow, shadow_reach
+from brand_render.gradient import axial_gradient, linear_gradient, radial_colours
+from brand_render.scene import (
+    Arc, BezierStroke, Ellipse, Group, LinearGradient, Polygon, RadialGradient, Rect, Ring, Solid, Stroke,
+)
+from brand_render.stroke import flatten_cubics, flatten_level, stroke_mask
+
+# Upper bound on the float32 working buffer of one supersampled strip
+STRIP_BYTES = 16 * 1024 * 1024
+BLEND_MODES = ('over', 'copy', 'multiply', 'screen', 'add')
+
+
+def _rect(shape, box, size):
+    return raster.rect_mask(box, shape.x0 * size, shape.y0 * size, shape.x1 * size, shape.y1 * size)
+
+
+def _ellipse(shape, box, size):
+    return raster.ellipse_mask(box, shape.cx * size, shape.cy * size, shape.rx * size, shape.ry * size)
+
+
+def _ring(shape, box, size):
+    return raster.annulus_mask(box, shape.cx * size, shape.cy * size, shape.rx * size, shape.ry * size,
+                               shape.width * size)
+
+
+def _arc(shape, box, size):
+    return raster.sector_mask(box, shape.cx * size, shape.cy * size, shape.rx * size, shape.ry * size,
+                              shape.width * size, shape.start, shape.end)
+
+
+def _polygon(shape, box, size):
+    return raster.polygon_mask(box, [(x * size, y * size) for x, y in shape.points])
+
+
+def _stroke(shape, box, size):
+    return stroke_mask(box, [(x * size, y * size) for x, y in shape.points], shape.width * size)
+
+
+def _bezier(shape, box, size):
+    outline = flatten_cubics(shape.points, flatten_level(size)) * size
+    return stroke_mask(box, outline, shape.width * size)
+
+
+COVERAGE = {
+    Rect: _rect,
+    Ellipse: _ellipse,
+    Ring: _ring,
+    Arc: _arc,
+    Polygon: _polygon,
+    Stroke: _stroke,
+    BezierStroke: _bezier,
+}
+
+
+def coverage(shape, box, size):
+    """Coverage mask of ``shape`` over pixel window ``box`` at ``size``."""
+    return COVERAGE[type(shape)](shape, box, size)
+
+
+def shape_window(shape, size, box=None):
+    """Integer pixel window a shape touches, clipped to ``box``."""
+    x0, y0, x1, y1 = shape.bounds()
+    window = raster.bounds((x0 * size, y0 * size, x1 * size, y1 * size), (size, size))
+    if box is None:
+        return window
+    left, top = max(window[0], box[0]), max(window[1], box[1])
+    return left, top, max(left, min(window[2], box[2])), max(top, min(window[3], box[3]))
+
+
+def paint_pixels(paint, box, size):
+    """Float32 RGBA colours of ``paint`` over ``box`` (broadcastable)."""
+    if isinstance(paint, Solid):
+        return np.asarray(paint.colour, dtype=np.float32)
+    width, height = box[2] - box[0], box[3] - box[1]
+    if isinstance(paint, LinearGradient) and paint.x0 != paint.x1:
+        return axial_gradient(box, (paint.x0 * size, paint.y0 * size), (paint.x1 * size, paint.y1 * size),
+                              paint.start, paint.end).astype(np.float32)
+    if isinstance(paint, LinearGradient):
+        span = (paint.y1 - paint.y0) * size
+        return linear_gradient(width, height, paint.start, paint.end,
+                               offset=box[1] - paint.y0 * size, span=span).astype(np.float32)
+    if isinstance(paint, RadialGradient):
+        xs = np.arange(box[0], box[2], dtype=np.float32)[None, :] - np.float32(paint.cx * size)
+        ys = np.arange(box[1], box[3], dtype=np.float32)[:, None] - np.float32(paint.cy * size)
+        return radial_colours(np.sqrt(xs * xs + ys * ys), paint.radius * size, paint.inner, paint.outer,
+                              paint.step * size, dtype=np.float32)
+    raise TypeError(f"Unsupported paint {paint!r}")
+
+
+def premultiply(colours):
+    """Premultiply straight float RGBA colours (any broadcastable shape)."""
+    colours = np.array(colours, dtype=np.float32)
+    colours[..., :3] *= colours[..., 3:] / 255.0
+    return colours
+
+
+def unpremultiply(buf, out=None):
+    """Straight-alpha copy of a premultiplied float RGBA buffer, or into ``out`` (which may be ``buf``).
+
+    Only translucent pixels need dividing, and in the brand art those are
+    mostly antialiased edges, so they are gathered first.
+    """
+    if out is None:
+        out = buf.copy()
+    alpha = buf[..., 3]
+    rows, cols = np.nonzero((alpha > 0) & (alpha < 255))
+    out[rows, cols, :3] *= 255.0 / alpha[rows, cols, None]
+    return out
+
+
+def composite(dst, src, blend='over'):
+    """Blend premultiplied float RGBA ``src`` onto ``dst`` in place.
+
+    ``'copy'`` replaces ``dst``; ``'over'`` is Porter-Duff over;
+    ``'multiply'``, ``'screen'`` and ``'add'`` follow the W3C compositing
+    spec (``'add'`` is ``plus-lighter``). ``'copy'`` and ``'over'`` take
+    any number of channels, alpha last.
+    """
+    if blend == 'copy':
+        dst[...] = src
+    elif blend == 'over':
+        dst *= spread(1 - src[..., -1] / 255.0, dst.shape[-1])
+        dst += src
+    elif blend == 'add':
+        dst += src
+        np.minimum(dst, 255.0, out=dst)
+    elif blend in ('multiply', 'screen'):
+        product = src * dst / 255.0
+        alpha = src[..., 3:] + dst[..., 3:] - product[..., 3:]
+        if blend == 'multiply':
+            colour = (src[..., :3] * (1 - dst[..., 3:] / 255.0) + dst[..., :3] * (1 - src[..., 3:] / 255.0)
+                      + product[..., :3])
+        else:
+            colour = src[..., :3] + dst[..., :3] - product[..., :3]
+        dst[..., :3] = colour
+        dst[..., 3:] = alpha
+    else:
+        raise ValueError(f"Unknown blend mode {blend!r}, expected one of {BLEND_MODES}")
+
+
+def _nonzero_window(window, weights):
+    """Shrink ``window`` to the rows and columns where ``weights`` is non-zero.
+
+    Returns ``(window, weights)`` cropped, or ``(None, None)`` if all zero.
+    """
+    rows, cols = np.flatnonzero(weights.any(axis=1)), np.flatnonzero(weights.any(axis=0))
+    if not rows.size:
+        return None, None
+    top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    window = (window[0] + left, window[1] + top, window[0] + right, window[1] + bottom)
+    return window, weights[top:bottom, left:right]
+
+
+def _region(buf, box, window):
+    return buf[window[1] - box[1]:window[3] - box[1], window[0] - box[0]:window[2] - box[0]]
+
+
+def shape_mask(shape, size, window):
+    """Coverage of ``shape`` over ``window``, cropped to where it is non-zero.
+
+    Returns ``(window, mask)``, or ``(None, None)`` if it covers nothing.
+    """
+    return _nonzero_window(window, coverage(shape, window, size))
+
+
+def draw_shape(buf, shape, size, box, blend='over'):
+    """Paint one shape into premultiplied ``buf``, which holds pixel window ``box``.
+
+    ``'over'`` composites the paint weighted by coverage; ``'copy'``
+    replaces what is underneath within the coverage, so a transparent
+    paint clears. Over an opaque paint the two agree, and the paint is
+    just written.
+    """
+    window = shape_window(shape, size, box)
+    if window[2] <= window[0] or window[3] <= window[1]:
+        return
+    window, mask = shape_mask(shape, size, window)
+    if window is None:
+        return
+    # The NumPy rasterizer's coverage is all or nothing
+    paint_mask(_region(buf, box, window), paint_pixels(shape.paint, window, size), mask > 0, blend)
+
+
+def paint_mask(region, colour, mask, blend='over'):
+    """Paint straight float RGBA ``colour`` into premultiplied ``region`` weighted by coverage ``mask``.
+
+    ``mask`` is boolean (all-or-nothing coverage) or float. Float coverage
+    is all or nothing too away from shape edges, so only its partly
+    covered pixels are gathered and blended one by one; the rest are
+    painted as a boolean mask, which only touches the pixels it covers.
+    """
+    alpha = colour[..., 3]
+    opaque = alpha.min() >= 255
+    if not (opaque or blend == 'copy' or alpha.any()):
+        return
+    paint = _rows(colour if opaque else premultiply(colour), region.shape)
+    if mask.dtype != bool:
+        rows, cols = np.nonzero((mask > 0) & (mask < 1))
+        if len(rows):
+            weight = mask[rows, cols, None]
+            pixels = region[rows, cols]
+            colours = np.broadcast_to(paint, region.shape)[rows, cols]
+            if opaque or blend == 'copy':
+                pixels += (colours - pixels) * weight
+            else:
+                pixels *= 1 - weight * np.broadcast_to(alpha, region.shape[:2])[rows, cols, None] / 255.0
+                pixels += colours * weight
+            region[rows, cols] = pixels
+        mask = mask >= 1
+    if (opaque or blend == 'copy') and mask.all():
+        region[...] = paint
+    elif opaque or blend == 'copy':
+        np.copyto(region, paint, where=spread(mask, 4))
+    elif alpha.min() == alpha.max():
+        # One translucent alpha: every covered pixel keeps the same share of what is beneath
+        covered = spread(mask, 4)
+        np.multiply(region, 1 - alpha.min() / 255.0, out=region, where=covered)
+        np.add(region, paint, out=region, where=covered)
+    else:
+        covered = spread(mask, 4)
+        np.multiply(region, spread(1 - np.broadcast_to(alpha, region.shape[:2]) / 255.0, 4), out=region,
+                    where=covered)
+        np.add(region, paint, out=region, where=covered)
+
+
+def spread(values, channels):
+    """Per-pixel ``values`` repeated into a new last axis of ``channels``.
+
+    Broadcasting an (H, W, 1) factor over (H, W, 4) pixels runs NumPy's
+    inner loop over the 4 channels of one pixel at a time, several times
+    slower than over whole rows, so factors are spread out first. A
+    boolean mask is spread 4 wide through its bytes, as one multiply.
+    """
+    if values.dtype == bool and channels == 4:
+        packed = values.view(np.uint8).astype(np.uint32) * np.uint32(0x01010101)
+        return packed.view(bool).reshape(values.shape + (4,))
+    return np.repeat(values[..., None], channels, axis=-1)
+
+
+def _rows(colour, shape):
+    """Broadcastable ``colour`` with whole rows of ``shape`` laid out, for the same reason as ``spread``."""
+    if colour.shape[-2:] == shape[-2:]:
+        return colour
+    rows = colour.shape[0] if colour.ndim == 3 else 1
+    return np.ascontiguousarray(np.broadcast_to(colour, (rows,) + tuple(shape[-2:])))
+
+
+def render_array(scene, size, box=None):
+    """Render ``scene`` at ``size`` into a premultiplied float32 RGBA array for ``box``."""
+    box = box or (0, 0, size, size)
+    buf = np.zeros((box[3] - box[1], box[2] - box[0], 4), dtype=np.float32)
+    profiler = profiling.active()
+    for layer in scene.layers:
+        if profiler is None:
+            draw_layer(buf, layer, size, box)
+            continue
+        with profiler.span('layer', layer.name):
+            draw_layer(buf, layer, size, box, profiler)
+    return buf
+
+
+def draw_layer(buf, layer, size, box, profiler=None):
+    """Paint a layer (or a group) into ``buf``.
+
+    A plain ``'over'`` or ``'copy'`` layer is painted shape by shape
+    straight onto the canvas. Groups and the other blend modes must be
+    rendered on their own buffer over their bounding box and then blended,
+    and so are layers the layer cache keeps, as their pixels must not
+    depend on what is beneath them.
+    """
+    if not isinstance(layer, Group) and (layer.blend == 'copy' or layer.blend == 'over' and not _cached(layer, size)):
+        for shape in layer.shapes:
+            if profiler is None:
+                draw_shape(buf, shape, size, box, layer.blend)
+                continue
+            with profiler.span('primitive', type(shape).__name__, layer=layer.name):
+                draw_shape(buf, shape, size, box, layer.blend)
+        return
+    window = shape_window(layer, size, box)
+    if window[2] <= window[0] or window[3] <= window[1]:
+        return
+    pixels = layer_pixels(layer, size, window, profiler)
+    if layer.blend == 'copy':
+        copy_within(_region(buf, box, window), pixels, group_coverage(layer, size, window))
+        return
+    blend_into(buf, box, pixels, window, layer.blend)
+
+
+def _cached(layer, size):
+    """Whether the active layer cache, if any, memoizes ``layer`` at ``size``."""
+    cache = layer_cache.active()
+    return cache is not None and cache.accepts(shape_window(layer, size))
+
+
+def layer_pixels(layer, size, window, profiler=None):
+    """Premultiplied buffer of ``layer`` alone over pixel ``window``.
+
+    With a layer cache active, the layer is rendered (or fetched) over its
+    whole bounding box and ``window`` is cut from that.
+    """
+    cache = layer_cache.active()
+    if cache is not None:
+        full = shape_window(layer, size)
+        if cache.accepts(full):
+            pixels = cache.get(layer, size, lambda: _render_layer(layer, size, full, profiler))
+            return _region(pixels, full, window)
+    return _render_layer(layer, size, window, profiler)
+
+
+def _render_layer(layer, size, window, profiler=None):
+    if isinstance(layer, Group):
+        return render_array(layer, size, window) if layer.filter is None else render_filtered(layer, size, window)
+    buf = np.zeros((window[3] - window[1], window[2] - window[0], 4), dtype=np.float32)
+    for shape in layer.shapes:
+        if profiler is None:
+            draw_shape(buf, shape, size, window)
+            continue
+        with profiler.span('primitive', type(shape).__name__, layer=layer.name):
+            draw_shape(buf, shape, size, window)
+    return buf
+
+
+def group_coverage(group, size, window, cover=coverage):
+    """Union of the coverage of every shape in ``group`` (and its groups) over pixel ``window``.
+
+    ``cover(shape, window, size)`` gives one shape's coverage.
+    """
+    union = np.zeros((window[3] - window[1], window[2] - window[0]), dtype=np.float32)
+    for layer in group.layers:
+        if isinstance(layer, Group):
+            np.maximum(union, group_coverage(layer, size, window, cover), out=union)
+            continue
+        for shape in layer.shapes:
+            part = shape_window(shape, size, window)
+            if part[2] > part[0] and part[3] > part[1]:
+                region = _region(union, window, part)
+                np.maximum(region, cover(shape, part, size), out=region)
+    return union
+
+
+def copy_within(region, group, cover):
+    """Replace ``region`` with premultiplied ``group`` pixels where the group covers it.
+
+    ``cover`` is the group's shape coverage; anywhere the group drew
+    (a drop shadow, say) counts as well. Elsewhere ``region`` is kept, and
+    partial coverage mixes the two, as a ``'copy'`` shape does.
+    """
+    cover = np.maximum(cover, group[..., -1] / 255.0)[..., None]
+    region *= 1 - cover
+    region += group
+
+
+def blend_into(buf, box, layer, window, blend):
+    """Blend a premultiplied ``layer`` buffer covering ``window`` onto ``buf``.
+
+    Only the part of ``layer`` with non-zero alpha is touched, so the cost
+    follows what the layer actually drew; an opaque layer is just copied.
+    """
+    if blend != 'copy':
+        tight, _ = _nonzero_window(window, layer[..., 3])
+        if tight is None:
+            return
+        layer = _region(layer, window, tight)
+        window = tight
+        if blend == 'over' and layer[..., 3].min() >= 255:
+            blend = 'copy'
+    composite(_region(buf, box, window), layer, blend)
+
+
+def render_filtered(group, size, window):
+    """Render a group with its drop shadow beneath it over ``window``.
+
+    The group is rendered over ``window`` grown by the shadow's reach, so
+    shapes outside the window still cast into it.
+    """
+    margin = shadow_reach(group.filter, size)
+    source = raster.bounds((window[0] - margin, window[1] - margin, window[2] + margin, window[3] + margin),
+                           (size, size))
+    sub = render_array(group, size, source)
+    shadow = drop_shadow(sub, group.filter, size, source[:2])
+    composite(shadow, sub, 'over')
+    return _region(shadow, source, window)
+
+
+def downsample(buf, factor):
+    """Integer box-filter reduction of a premultiplied float RGBA buffer.
+
+    Averaging premultiplied colours keeps transparent samples from
+    bleeding black into antialiased edges.
+    """
+    if factor == 1:
+        return buf
+    height, width = buf.shape[0] // factor, buf.shape[1] // factor
+    return buf.reshape(height, factor, width, factor, buf.shape[-1]).mean(axis=(1, 3))
+
+
+def render_pixels(scene, size, box=None, supersample=1, strip_bytes=STRIP_BYTES):
+    """Render ``box`` of ``scene`` at ``size`` to uint8 RGBA pixels.
+
+    With ``supersample`` > 1 the scene is rasterized at that multiple of
+    ``size`` and box-filtered back down. Work is done in horizontal strips
+    so peak memory stays near ``strip_bytes`` whatever the factor.
+    """
+    return _render_strips(scene, size, box, supersample, strip_bytes, np.uint8, _finish)
+
+
+def render_premultiplied(scene, size, box=None, supersample=1, strip_bytes=STRIP_BYTES):
+    """Render ``box`` of ``scene`` at ``size`` to premultiplied float32 RGBA.
+
+    As ``render_pixels`` without the final quantization, for callers that
+    go on resampling the result.
+    """
+    return _render_strips(scene, size, box, supersample, strip_bytes, np.float32, lambda buf: buf)
+
+
+def _render_strips(scene, size, box, supersample, strip_bytes, dtype, finish):
+    box = box or (0, 0, size, size)
+    x0, y0, x1, y1 = box
+    if supersample == 1:
+        return finish(render_array(scene, size, box))
+    factor = supersample
+    out = np.empty((y1 - y0, x1 - x0, 4), dtype=dtype)
+    # float32 RGBA samples needed per output row
+    row_bytes = (x1 - x0) * factor * factor * 16
+    rows = max(1, strip_bytes // row_bytes)
+    for top in range(y0, y1, rows):
+        bottom = min(y1, top + rows)
+        hi = render_array(scene, size * factor, (x0 * factor, top * factor, x1 * factor, bottom * factor))
+        out[top - y0:bottom - y0] = finish(downsample(hi, factor))
+    return out
+
+
+def to_pixels(buf):
+    """Quantize a float RGBA buffer to uint8."""
+    rounded = np.rint(buf)
+    np.clip(rounded, 0, 255, out=rounded)
+    return rounded.astype(np.uint8)
+
+
+def _finish(buf):
+    """``to_pixels(unpremultiply(buf))`` of a buffer nothing else holds, reusing its memory."""
+    unpremultiply(buf, out=buf)
+    np.rint(buf, out=buf)
+    np.clip(buf, 0, 255, out=buf)
+    return buf.astype(np.uint8)
+
+
+def to_image(pixels, mode='RGBA'):
+    """PIL image from uint8 (or float) RGBA pixels, dropping alpha for RGB."""
+    if pixels.dtype != np.uint8:
+        pixels = to_pixels(pixels)
+    if mode == 'RGB':
+        return Image.fromarray(np.ascontiguousarray(pixels[..., :3]))
+    return Image.fromarray(pixels)
+
+
+def render(scene, size, padding=0.0, backend=None, supersample=None):
+    """Render ``scene`` as a ``size`` x ``size`` PIL image.
+
+    ``padding`` insets the whole design by that fraction on every side.
+    ``supersample`` (default ``FAITHCONNECT_SUPERSAMPLE`` or 1) antialiases
+    by rendering at that multiple and box-filtering down.
+    """
+    scene = scene.padded(padding)
+    backend = backend or raster.get_backend()
+    factor = check_supersample(supersample or SUPERSAMPLE)
+    if backend == 'pil':
+        img = _render_pil(scene, size * factor)
+        if factor == 1:
+            return img
+        pixels = downsample(premultiply(np.asarray(img.convert('RGBA'))), factor)
+        return to_image(to_pixels(unpremultiply(pixels)), scene.mode)
+    if backend != 'numpy':
+        raise ValueError(f"Unknown raster backend {backend!r}, expected one of {raster.BACKENDS}")
+    return to_image(render_pixels(scene, size, supersample=factor), scene.mode)
+
+
+def check_supersample(factor):
+    factor = int(factor)
+    if factor < 1:
+        raise ValueError(f"Supersample factor must be a positive integer, got {factor}")
+    return factor
+
+
+def _pil_box(x0, y0, x1, y1, size):
+    left, top = x0 * size, y0 * size
+    return [left, top, max(left, x1 * size - 1), max(top, y1 * size - 1)]
+
+
+def _pil_shape(draw, shape, size, fill):
+    kind = type(shape)
+    if kind is Rect:
+        draw.rectangle(_pil_box(*shape.bounds(), size), fill=fill)
+    elif kind is Ellipse:
+        draw.ellipse(_pil_box(*shape.bounds(), size), fill=fill)
+    elif kind is Ring:
+        draw.ellipse(_pil_box(*shape.bounds(), size), outline=fill, width=max(1, round(shape.width * size)))
+    elif kind is Arc:
+        draw.arc(_pil_box(*shape.bounds(), size), shape.start, shape.end, fill=fill,
+                 width=max(1, round(shape.width * size)))
+    elif kind is Polygon:
+        draw.polygon([(x * size - 0.5, y * size - 0.5) for x, y in shape.points], fill=fill)
+    elif kind in (Stroke, BezierStroke):
+        width = max(1, round(shape.width * size))
+        outline = flatten_cubics(shape.points, flatten_level(size)) if kind is BezierStroke else shape.points
+        points = [(x * size - 0.5, y * size - 0.5) for x, y in outline]
+        draw.line(points, fill=fill, width=width, joint='curve')
+        for x, y in (points[0], points[-1]):
+            draw.ellipse([x - width / 2, y - width / 2, x + width / 2, y + width / 2], fill=fill)
+    else:
+        raise TypeError(f"Unsupported shape {shape!r}")
+
+
+def _pil_blend(img, layer, blend):
+    """Blend RGBA ``layer`` onto ``img`` ('over' or 'copy' only)."""
+    if blend == 'copy':
+        img.paste(layer.convert(img.mode), (0, 0), layer.getchannel('A').point(lambda a: 255 if a else 0))
+    elif img.mode == 'RGBA':
+        img.alpha_composite(layer)
+    else:
+        img.paste(layer.convert(img.mode), (0, 0), layer)
+
+
+def _pil_coverage(group, size, pixels):
+    """Mask of where ``group``'s shapes, or its rendered ``pixels``, cover the canvas."""
+    mask = pixels.getchannel('A').point(lambda a: 255 if a else 0)
+    draw = ImageDraw.Draw(mask)
+    layers = list(group.layers)
+    while layers:
+        layer = layers.pop()
+        if isinstance(layer, Group):
+            layers.extend(layer.layers)
+            continue
+        for shape in layer.shapes:
+            _pil_shape(draw, shape, size, 255)
+    return mask
+
+
+def _pil_shadow(group, shadow, size):
+    """RGBA ``group`` over the ``DropShadow`` it casts, blurred with ``ImageFilter.GaussianBlur``."""
+    scale = shadow.opacity * shadow.colour[3] / 255
+    alpha = Image.new('L', group.size, 0)
+    alpha.paste(group.getchannel('A').point(lambda a: round(a * scale)),
+                (round(shadow.dx * size), round(shadow.dy * size)))
+    out = Image.new('RGBA', group.size, shadow.colour[:3] + (0,))
+    out.putalpha(alpha.filter(ImageFilter.GaussianBlur(shadow.sigma * size)))
+    out.alpha_composite(group)
+    return out
+
+
+def _render_pil(scene, size):
+    mode = getattr(scene, 'mode', 'RGBA')
+    img = Image.new(mode, (size, size), (0, 0, 0, 0) if mode == 'RGBA' else (0, 0, 0))
+    for layer in scene.layers:
+        if layer.blend not in ('over', 'copy'):
+            raise TypeError(f"The PIL backend does not support {layer.blend!r} blending ({layer.name!r})")
+        if isinstance(layer, Group):
+            group = _render_pil(layer, size).convert('RGBA')
+            if layer.filter is not None:
+                group = _pil_shadow(group, layer.filter, size)
+            if layer.blend == 'copy':
+                img.paste(group.convert(mode), (0, 0), _pil_coverage(layer, size, group))
+            else:
+                _pil_blend(img, group, 'over')
+            continue
+        for shape in layer.shapes:
+            mask = Image.new('L', (size, size), 0)
+            _pil_shape(ImageDraw.Draw(mask), shape, size, 255)
+            if isinstance(shape.paint, Solid):
+                painted = Image.new('RGBA', (size, size), shape.paint.colour)
+            else:
+                # Linear ramps come back one pixel wide
+                painted = Image.fromarray(to_pixels(paint_pixels(shape.paint, (0, 0, size, size), size)))
+                painted = painted.resize((size, size), Image.Resampling.NEAREST)
+            if layer.blend == 'copy':
+                img.paste(painted.convert(mode), (0, 0), mask)
+                continue
+            shape_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            shape_img.paste(painted, (0, 0), mask)
+            _pil_blend(img, shape_img, 'over')
+    return img
@@ -0,0 +1,405 @@
+"""
+Signed distance fields of scenes, for antialiasing and effects at any size.
+
+Every primitive the designs use has a closed-form signed distance,
+negative inside and positive outside, in pixels at the output size.
+``render`` composites a scene like ``brand_render.render`` does but takes
+each shape's coverage from its distance as ``clip(0.5 - d, 0, 1)``: an
+analytically antialiased edge at any size with no supersampling. The same
+distances give, with no re-rasterization:
+
+* ``grow``, every shape dilated (or eroded, if negative) by a distance, so
+  a ring or stroke ``w`` wide becomes ``w + 2 * grow`` wide,
+* ``Outline``, a band around the union of some layers,
+* ``Glow``, a halo fading out around them.
+
+``texture`` samples the field of each distinct shape on a small grid and
+quantizes it to 8 bits within ``spread`` texels of the edge;
+``save_texture`` writes that as a greyscale PNG atlas. Rendering with a
+``Texture`` interpolates its texels instead of evaluating the closed
+forms. That is a little cheaper than the closed forms, but not than
+``brand_render.render``'s rasterizer; the texture is for carrying the
+shapes as one small image, not for speed. Texels round off corners and
+lose features under about two texels wide (a 2px line on a 1024 canvas
+needs a 1024 texture), and effects reach at most ``spread`` texels.
+
+A drop shadow is a blur of a group's alpha, which has no distance, so it
+is cast from the group as drawn from distances, as in
+``brand_render.render``.
+
+Usage (from the repository root)::
+
+    python -m brand_render.sdf premium_logo --texture premium_logo_sdf.png --ladder out --sizes 48 96 512
+"""
+
+import argparse
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+from brand_render import raster
+from brand_render.blur import drop_shadow, shadow_reach
+from brand_render.render import (
+    _region, composite, copy_within, group_coverage, paint_mask, paint_pixels, to_image, to_pixels, unpremultiply,
+)
+from brand_render.scene import Arc, BezierStroke, Ellipse, Group, Polygon, Rect, Ring, Solid, Stroke
+from brand_render.stroke import flatten_cubics, flatten_level
+
+TEXTURE_RESOLUTION = 256
+TEXTURE_SPREAD = 8.0
+SPREAD_KEY = 'sdf-spread'
+
+
+def ellipse_distance(box, cx, cy, rx, ry):
+    """Signed distance to an ellipse over ``box``: exact for circles, first order otherwise."""
+    xs, ys = raster.grid(box)
+    dx, dy = xs - cx, ys - cy
+    if rx == ry:
+        return np.hypot(dx, dy) - rx
+    if rx <= 0 or ry <= 0:
+        return np.full((box[3] - box[1], box[2] - box[0]), np.inf, dtype=np.float32)
+    # The implicit function divided by its gradient length
+    k0 = np.hypot(dx / rx, dy / ry)
+    k1 = np.hypot(dx / (rx * rx), dy / (ry * ry))
+    return np.where(k1 > 0, k0 * (k0 - 1) / np.maximum(k1, 1e-12), -min(rx, ry)).astype(np.float32)
+
+
+def _rect(shape, box, size):
+    xs, ys = raster.grid(box)
+    qx = np.abs(xs - (shape.x0 + shape.x1) * size / 2) - (shape.x1 - shape.x0) * size / 2
+    qy = np.abs(ys - (shape.y0 + shape.y1) * size / 2) - (shape.y1 - shape.y0) * size / 2
+    return np.hypot(np.maximum(qx, 0), np.maximum(qy, 0)) + np.minimum(np.maximum(qx, qy), 0)
+
+
+def _ellipse(shape, box, size):
+    return ellipse_distance(box, shape.cx * size, shape.cy * size, shape.rx * size, shape.ry * size)
+
+
+def _ring(shape, box, size):
+    cx, cy, rx, ry, width = (v * size for v in (shape.cx, shape.cy, shape.rx, shape.ry, shape.width))
+    outer = ellipse_distance(box, cx, cy, rx, ry)
+    if width >= min(rx, ry):
+        return outer
+    return np.maximum(outer, -ellipse_distance(box, cx, cy, rx - width, ry - width))
+
+
+def _arc(shape, box, size):
+    ring = _ring(shape, box, size)
+    sweep = shape.end - shape.start
+    if abs(sweep) >= 360:
+        return ring
+    cx, cy, rx, ry, width = (v * size for v in (shape.cx, shape.cy, shape.rx, shape.ry, shape.width))
+    xs, ys = raster.grid(box)
+    angle = np.degrees(np.arctan2((ys - cy) / ry, (xs - cx) / rx))
+    inside = np.mod(angle - shape.start, 360.0) <= np.mod(sweep, 360.0)
+    # Outside the sweep the nearest point is on one of the flat end caps
+    caps = []
+    for degrees in (shape.start, shape.end):
+        cos, sin = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+        inner_x, inner_y = max(rx - width, 0.0), max(ry - width, 0.0)
+        caps.append(raster.segment_distance(box, [(cx + inner_x * cos, cy + inner_y * sin),
+                                                  (cx + rx * cos, cy + ry * sin)]))
+    return np.where(inside, ring, np.maximum(ring, np.minimum(*caps)))
+
+
+def _polygon(shape, box, size):
+    points = [(x * size, y * size) for x, y in shape.points]
+    edge = raster.segment_distance(box, points, closed=True)
+    return np.where(raster.polygon_mask(box, points) > 0, -edge, edge)
+
+
+def _stroke(shape, box, size):
+    return raster.segment_distance(box, [(x * size, y * size) for x, y in shape.points]) - shape.width * size / 2
+
+
+def _bezier(shape, box, size):
+    outline = flatten_cubics(shape.points, flatten_level(size)) * size
+    return raster.segment_distance(box, outline) - shape.width * size / 2
+
+
+DISTANCE = {
+    Rect: _rect,
+    Ellipse: _ellipse,
+    Ring: _ring,
+    Arc: _arc,
+    Polygon: _polygon,
+    Stroke: _stroke,
+    BezierStroke: _bezier,
+}
+
+
+def distance(shape, box, size):
+    """Signed distance in pixels from every pixel centre of ``box`` to ``shape`` at ``size``."""
+    return DISTANCE[type(shape)](shape, box, size)
+
+
+@dataclass(frozen=True)
+class Outline:
+    """A ``width`` band in ``colour`` around the union of ``layers`` (every layer if empty),
+    drawn beneath the first of them."""
+
+    width: float
+    colour: tuple
+    layers: tuple = ()
+
+
+@dataclass(frozen=True)
+class Glow:
+    """A halo in ``colour`` fading out over ``radius`` around the union of ``layers``
+    (every layer if empty), drawn beneath the first of them."""
+
+    radius: float
+    colour: tuple
+    layers: tuple = ()
+
+
+def shapes(layers):
+    """Every shape of ``layers`` and their groups, in drawing order."""
+    for layer in layers:
+        if isinstance(layer, Group):
+            yield from shapes(layer.layers)
+        else:
+            yield from layer.shapes
+
+
+@dataclass(frozen=True)
+class Texture:
+    """8-bit distance fields of ``shapes`` on a ``resolution`` grid over the canvas.
+
+    ``levels[i]`` holds shape ``i``; 127.5 is the edge and 0 and 255 stand
+    for ``spread`` texels outside and inside.
+    """
+
+    shapes: tuple
+    levels: object
+    spread: float = TEXTURE_SPREAD
+
+    def __post_init__(self):
+        object.__setattr__(self, 'index', {shape: i for i, shape in enumerate(self.shapes)})
+        object.__setattr__(self, '_texels', {})
+        object.__setattr__(self, '_taps', {})
+
+    @property
+    def resolution(self):
+        return self.levels.shape[-1]
+
+    def texels(self, shape):
+        """Float32 signed distances in texels of ``shape``, decoded once."""
+        i = self.index[shape]
+        if i not in self._texels:
+            self._texels[i] = (np.float32(127.5) - self.levels[i]) * np.float32(self.spread / 127.5)
+        return self._texels[i]
+
+    def taps(self, size):
+        """``(lower, upper, weight)`` texels of every pixel row (or column) at ``size``, computed once per size."""
+        if size not in self._taps:
+            self._taps[size] = _taps((np.arange(size) + 0.5) * (self.resolution / size) - 0.5, self.resolution)
+        return self._taps[size]
+
+    def distance(self, shape, box, size):
+        """Signed distance in pixels at ``size``, bilinearly interpolated between texels."""
+        tile = self.texels(shape)
+        lower, upper, weight = self.taps(size)
+        rows, cols = slice(box[1], box[3]), slice(box[0], box[2])
+        # Rows first: the texture is usually smaller than the window, so this lerp is the cheaper one
+        top = np.take(tile, lower[rows], axis=0)
+        top += (np.take(tile, upper[rows], axis=0) - top) * weight[rows, None]
+        left = np.take(top, lower[cols], axis=1)
+        left += (np.take(top, upper[cols], axis=1) - left) * weight[cols]
+        left *= np.float32(size / self.resolution)
+        return left
+
+
+def _taps(coords, count):
+    """Neighbouring texel indices ``lower`` and ``upper`` and weights of the upper one."""
+    lower = np.floor(coords)
+    weight = (coords - lower).astype(np.float32)
+    lower = lower.astype(np.intp)
+    return np.clip(lower, 0, count - 1), np.clip(lower + 1, 0, count - 1), weight
+
+
+def texture(scene, resolution=TEXTURE_RESOLUTION, spread=TEXTURE_SPREAD):
+    """Sample the field of every distinct shape of ``scene`` into a ``Texture``."""
+    distinct = tuple(dict.fromkeys(shapes(scene.layers)))
+    levels = np.empty((len(distinct), resolution, resolution), dtype=np.uint8)
+    box = (0, 0, resolution, resolution)
+    for i, shape in enumerate(distinct):
+        levels[i] = np.clip(np.rint(127.5 - distance(shape, box, resolution) / spread * 127.5), 0, 255)
+    return Texture(distinct, levels, spread)
+
+
+def save_texture(field, path):
+    """Write a ``Texture`` as a greyscale PNG atlas, one tile per shape, top to bottom."""
+    from brand_render.cache import atomic_write, encode_png
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text(SPREAD_KEY, repr(field.spread))
+    img = Image.fromarray(field.levels.reshape(-1, field.resolution), 'L')
+    atomic_write(path, encode_png(img, pnginfo=info))
+
+
+def load_texture(path, scene):
+    """Read a ``save_texture`` atlas back as the ``Texture`` of ``scene``."""
+    with Image.open(path) as img:
+        levels = np.asarray(img.convert('L'))
+        spread = float(img.text.get(SPREAD_KEY, TEXTURE_SPREAD))
+    distinct = tuple(dict.fromkeys(shapes(scene.layers)))
+    resolution = levels.shape[1]
+    if levels.shape[0] != len(distinct) * resolution:
+        raise ValueError(f"{path} holds {levels.shape[0] // resolution} shapes, {scene.name!r} has {len(distinct)}")
+    return Texture(distinct, levels.reshape(-1, resolution, resolution), spread)
+
+
+def _window(item, size, box, reach):
+    """Pixel window of ``item``'s bounds grown by ``reach`` pixels, clipped to ``box``."""
+    x0, y0, x1, y1 = item.bounds()
+    window = raster.bounds((x0 * size - reach, y0 * size - reach, x1 * size + reach, y1 * size + reach),
+                           (size, size))
+    left, top = max(window[0], box[0]), max(window[1], box[1])
+    return left, top, max(left, min(window[2], box[2])), max(top, min(window[3], box[3]))
+
+
+def _empty(window):
+    return window[2] <= window[0] or window[3] <= window[1]
+
+
+def _coverage(d):
+    return np.clip(0.5 - d, 0.0, 1.0).astype(np.float32)
+
+
+class _Canvas:
+    """Where and how a scene is being drawn: size, window, growth and distance source."""
+
+    def __init__(self, size, box, grow, field):
+        self.size, self.box, self.grow, self.field = size, box, grow, field
+        self.reach = max(grow, 0.0) + 1
+
+    def draw_layer(self, buf, box, layer):
+        # As brand_render.render.draw_layer: plain layers go straight onto the canvas
+        if not isinstance(layer, Group) and layer.blend in ('over', 'copy'):
+            for shape in layer.shapes:
+                self.draw_shape(buf, box, shape, layer.blend)
+            return
+        window = _window(layer, self.size, box, self.reach)
+        if _empty(window):
+            return
+        source = window
+        if isinstance(layer, Group) and layer.filter is not None:
+            # As render_filtered: shapes outside the window still cast into it
+            margin = shadow_reach(layer.filter, self.size)
+            source = raster.bounds((window[0] - margin, window[1] - margin, window[2] + margin,
+                                    window[3] + margin), (self.size, self.size))
+        sub = np.zeros((source[3] - source[1], source[2] - source[0], 4), dtype=np.float32)
+        if isinstance(layer, Group):
+            for child in layer.layers:
+                self.draw_layer(sub, source, child)
+        else:
+            for shape in layer.shapes:
+                self.draw_shape(sub, source, shape)
+        if source is not window:
+            shadow = drop_shadow(sub, layer.filter, self.size, source[:2])
+            composite(shadow, sub, 'over')
+            sub = _region(shadow, source, window)
+        if isinstance(layer, Group) and layer.blend == 'copy':
+            copy_within(_region(buf, box, window), sub, group_coverage(layer, self.size, window, self.coverage))
+        else:
+            composite(_region(buf, box, window), sub, layer.blend)
+
+    def coverage(self, shape, window, size):
+        return _coverage(self.field(shape, window, size) - self.grow)
+
+    def draw_shape(self, buf, box, shape, blend='over'):
+        window = _window(shape, self.size, box, self.reach)
+        if _empty(window):
+            return
+        mask = self.coverage(shape, window, self.size)
+        paint_mask(_region(buf, box, window), paint_pixels(shape.paint, window, self.size), mask, blend)
+
+    def union(self, layers, reach):
+        """``(window, distance)`` to the union of ``layers``' shapes within ``reach`` pixels of them."""
+        boxes = [_window(layer, self.size, self.box, reach + self.reach) for layer in layers]
+        window = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                  max(b[2] for b in boxes), max(b[3] for b in boxes))
+        nearest = np.full((window[3] - window[1], window[2] - window[0]), np.inf, dtype=np.float32)
+        for shape in shapes(layers):
+            part = _window(shape, self.size, window, reach + self.reach)
+            if not _empty(part):
+                region = _region(nearest, window, part)
+                np.minimum(region, self.field(shape, part, self.size) - self.grow, out=region)
+        return window, nearest
+
+    def draw_effect(self, buf, effect, layers):
+        reach = (effect.width if isinstance(effect, Outline) else effect.radius) * self.size
+        window, d = self.union(layers, reach)
+        if _empty(window):
+            return
+        if isinstance(effect, Outline):
+            mask = _coverage(d - reach) * _coverage(-d)
+        else:
+            mask = (1 - np.clip(d / reach, 0.0, 1.0)) ** 2 * _coverage(-d)
+        paint_mask(_region(buf, self.box, window), np.asarray(Solid(effect.colour).colour, dtype=np.float32),
+                   mask.astype(np.float32))
+
+
+def render_array(scene, size, box=None, grow=0.0, effects=(), field=None):
+    """Render ``scene`` at ``size`` from signed distances into premultiplied float32 RGBA for ``box``.
+
+    ``grow`` dilates every shape by that fraction of the canvas; ``effects``
+    are ``Outline``s and ``Glow``s; ``field`` is a ``Texture`` to sample
+    instead of the closed-form distances.
+    """
+    box = box or (0, 0, size, size)
+    buf = np.zeros((box[3] - box[1], box[2] - box[0], 4), dtype=np.float32)
+    canvas = _Canvas(size, box, grow * size, field.distance if field is not None else distance)
+    for layer in scene.layers:
+        for effect in effects:
+            chosen = [other for other in scene.layers if not effect.layers or other.name in effect.layers]
+            if chosen and chosen[0] is layer:
+                canvas.draw_effect(buf, effect, chosen)
+        canvas.draw_layer(buf, box, layer)
+    return buf
+
+
+def render(scene, size, grow=0.0, effects=(), field=None):
+    """Render ``scene`` as a ``size`` x ``size`` PIL image from signed distances."""
+    return to_image(to_pixels(unpremultiply(render_array(scene, size, None, grow, effects, field))), scene.mode)
+
+
+def ladder(scene, sizes, grow=0.0, effects=(), field=None):
+    """``{size: image}`` for every size, from one ``Texture`` if given."""
+    return {size: render(scene, size, grow, effects, field) for size in sizes}
+
+
+def main(argv=None):
+    from brand_render.designs import SCENES
+
+    parser = argparse.ArgumentParser(description='Compile a scene to a signed distance field and render from it.')
+    parser.add_argument('design', choices=sorted(SCENES), help='scene to compile')
+    parser.add_argument('--resolution', type=int, default=TEXTURE_RESOLUTION,
+                        help=f'texture size in texels (default: {TEXTURE_RESOLUTION})')
+    parser.add_argument('--spread', type=float, default=TEXTURE_SPREAD,
+                        help=f'texels of distance the 8 bits span either side of an edge (default: {TEXTURE_SPREAD})')
+    parser.add_argument('--texture', default=None, help='write the SDF atlas PNG here')
+    parser.add_argument('--ladder', default=None, metavar='DIR', help='render --sizes from the texture into DIR')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[48, 72, 96, 144, 192, 512, 1024])
+    parser.add_argument('--grow', type=float, default=0.0, help='dilate every shape by this fraction of the canvas')
+    args = parser.parse_args(argv)
+
+    scene = SCENES[args.design]
+    field = texture(scene, args.resolution, args.spread)
+    if args.texture:
+        save_texture(field, args.texture)
+        print(f"✓ {len(field.shapes)} shapes at {field.resolution}px: {args.texture} "
+              f"({os.path.getsize(args.texture) / 1024:.1f} KiB)")
+    if args.ladder:
+        os.makedirs(args.ladder, exist_ok=True)
+        for size, img in ladder(scene, args.sizes, args.grow, field=field).items():
+            img.save(os.path.join(args.ladder, f'{scene.name}_{size}.png'))
+        print(f"✓ {len(args.sizes)} sizes in {args.ladder}")
+
+
+if __name__ == '__main__':
+    main()
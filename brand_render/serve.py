@@ -0,0 +1,386 @@
+"""
+Long-running local render service.
+
+Build jobs, design previews and test runs can ask one warm process for
+renders over HTTP, instead of each paying for interpreter start-up and a
+full render. The server is plain ``asyncio`` on the standard library,
+bound to a loopback address. Renders run on a process pool. Requests for
+a render that is already in flight wait for it instead of starting
+another. Finished images are kept in an LRU cache bounded by bytes and
+served with ETags, so ``If-None-Match`` revalidation costs no transfer.
+
+Endpoints (``GET`` or ``HEAD``)::
+
+    /render?design=premium_app_icon&size=512[&variant=night][&format=png][&supersample=2]
+    /stats      request, render and cache counters, throughput and latency percentiles
+    /designs    the designs, variants (``brand_render.designs.PALETTES``) and formats
+
+Every ``/render`` response says where it came from in ``X-Render-Source``:
+``rendered``, ``coalesced`` (joined an in-flight render), ``cache`` or
+``not_modified`` (the ``If-None-Match`` ETag matched, so nothing was
+looked up or rendered).
+
+Usage (from the repository root)::
+
+    python -m brand_render.serve --port 8765 --jobs 4
+    python -m brand_render.loadtest --url http://127.0.0.1:8765
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+HOST = '127.0.0.1'
+PORT = 8765
+CACHE_BYTES = int(os.environ.get('FAITHCONNECT_SERVE_CACHE_MB', '128')) * 1024 * 1024
+MAX_SIZE = 4096
+FORMATS = {'png': 'image/png', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+# Latencies kept for the percentiles in /stats
+LATENCY_WINDOW = 4096
+# ETags remembered by the service, so a repeat request costs no scene hashing
+ETAG_ENTRIES = 1024
+
+
+class BadRequest(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class RenderRequest:
+    design: str
+    size: int
+    variant: str = ''
+    format: str = 'png'
+    supersample: int = 1
+
+    def scene(self):
+        from brand_render.designs import PALETTES, SCENES
+        from brand_render.themes import recolour
+
+        scene = SCENES[self.design]
+        return recolour(scene, PALETTES[self.variant]) if self.variant else scene
+
+    def etag(self):
+        """Quoted strong ETag: the cache key of the scene, size and encoding.
+
+        Recolouring and hashing a big design takes a while; the service
+        computes it off the event loop (``RenderService.etag``).
+        """
+        from brand_render.cache import asset_key
+
+        return '"%s"' % asset_key(self.scene(), self.size, format=self.format, supersample=self.supersample)
+
+
+def parse_request(query):
+    """``RenderRequest`` from a ``/render`` query string; raises ``BadRequest``."""
+    from brand_render.designs import PALETTES, SCENES
+
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    design, variant = params.get('design', ''), params.get('variant', '')
+    fmt = params.get('format', 'png').lower()
+    if design not in SCENES:
+        raise BadRequest(f"Unknown design {design!r}, expected one of {sorted(SCENES)}")
+    if variant and variant not in PALETTES:
+        raise BadRequest(f"Unknown variant {variant!r}, expected one of {sorted(PALETTES)}")
+    if fmt not in FORMATS:
+        raise BadRequest(f"Unknown format {fmt!r}, expected one of {sorted(FORMATS)}")
+    try:
+        size, supersample = int(params.get('size', '')), int(params.get('supersample', '1'))
+    except ValueError:
+        raise BadRequest("size and supersample must be integers") from None
+    if not 1 <= size <= MAX_SIZE:
+        raise BadRequest(f"size must be between 1 and {MAX_SIZE}")
+    if supersample not in (1, 2, 4, 8):
+        raise BadRequest("supersample must be 1, 2, 4 or 8")
+    return RenderRequest(design, size, variant, fmt, supersample)
+
+
+def render_request(request):
+    """Encoded image bytes for ``request``; runs in a pool worker."""
+    import io
+
+    from brand_render.cache import encode_png
+    from brand_render.layer_cache import caching
+    from brand_render.render import render
+
+    # Workers share layers through the on-disk tier when FAITHCONNECT_LAYER_CACHE is set
+    with caching():
+        img = render(request.scene(), request.size, supersample=request.supersample)
+    if request.format == 'png':
+        return encode_png(img)
+    if request.format == 'jpeg' and img.mode == 'RGBA':
+        from PIL import Image
+
+        img = Image.alpha_composite(Image.new('RGBA', img.size, (255, 255, 255, 255)), img).convert('RGB')
+    buf = io.BytesIO()
+    img.save(buf, request.format.upper())
+    return buf.getvalue()
+
+
+def _warm():
+    # Load NumPy, Pillow and the designs once per worker, not on its first request
+    import brand_render.designs  # noqa: F401
+    import brand_render.render  # noqa: F401
+
+
+@dataclass(frozen=True)
+class Result:
+    etag: str
+    content_type: str
+    body: bytes
+
+
+class ResultCache:
+    """LRU of encoded renders by ETag, bounded by total bytes."""
+
+    def __init__(self, budget=CACHE_BYTES):
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+
+    def get(self, etag):
+        result = self.entries.get(etag)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(etag)
+        self.hits += 1
+        return result
+
+    def put(self, result):
+        if len(result.body) > self.budget or result.etag in self.entries:
+            return
+        self.entries[result.etag] = result
+        self.bytes += len(result.body)
+        while self.bytes > self.budget:
+            _etag, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted.body)
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Stats:
+    """Request, render and latency counters for ``/stats``."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.statuses = Counter()
+        self.sources = Counter()
+        self.bytes_sent = 0
+        self.renders = 0
+        self.render_seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status, seconds, sent):
+        self.requests += 1
+        self.statuses[status] += 1
+        self.bytes_sent += sent
+        self.latencies.append(seconds)
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        ordered = sorted(self.latencies)
+        return {
+            'uptime_s': round(uptime, 3),
+            'requests': self.requests,
+            'requests_per_second': round(self.requests / uptime, 2) if uptime else 0.0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'sources': dict(self.sources),
+            'bytes_sent': self.bytes_sent,
+            'renders': self.renders,
+            'render_ms_mean': round(self.render_seconds / self.renders * 1000, 2) if self.renders else 0.0,
+            'latency_ms': {name: round(percentile(ordered, fraction) * 1000, 2)
+                           for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        }
+
+
+class RenderService:
+    """Coalescing, caching front end to a render process pool, speaking HTTP/1.1."""
+
+    def __init__(self, jobs=None, cache_bytes=CACHE_BYTES):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm)
+        self.cache = ResultCache(cache_bytes)
+        self.stats = Stats()
+        self.in_flight = {}
+        self.etags = OrderedDict()
+
+    async def etag(self, request):
+        """``request.etag()``, computed on a thread the first time and remembered after."""
+        etag = self.etags.get(request)
+        if etag is None:
+            etag = await asyncio.get_running_loop().run_in_executor(None, request.etag)
+            self.etags[request] = etag
+            if len(self.etags) > ETAG_ENTRIES:
+                self.etags.popitem(last=False)
+        else:
+            self.etags.move_to_end(request)
+        return etag
+
+    async def render(self, request, etag=None):
+        """``(Result, source)`` for ``request``, rendering it at most once however many ask."""
+        etag = etag or await self.etag(request)
+        result = self.cache.get(etag)
+        if result is not None:
+            return result, 'cache'
+        task = self.in_flight.get(etag)
+        source = 'coalesced'
+        if task is None:
+            source = 'rendered'
+            task = asyncio.ensure_future(self._render(request, etag))
+            self.in_flight[etag] = task
+            task.add_done_callback(lambda _task: self.in_flight.pop(etag, None))
+        # Shielded, so a client hanging up doesn't cancel the render others are waiting for
+        return await asyncio.shield(task), source
+
+    async def _render(self, request, etag):
+        start = time.perf_counter()
+        body = await asyncio.get_running_loop().run_in_executor(self.pool, render_request, request)
+        self.stats.renders += 1
+        self.stats.render_seconds += time.perf_counter() - start
+        result = Result(etag, FORMATS[request.format], body)
+        self.cache.put(result)
+        return result
+
+    def snapshot(self):
+        return dict(self.stats.snapshot(), in_flight=len(self.in_flight), workers=self.jobs,
+                    cache={'entries': len(self.cache.entries), 'bytes': self.cache.bytes,
+                           'budget': self.cache.budget, 'hits': self.cache.hits, 'misses': self.cache.misses})
+
+    async def respond(self, method, target, headers):
+        """``(status, headers, body)`` for one request."""
+        if method not in ('GET', 'HEAD'):
+            return _json(HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{method} not allowed"}, Allow='GET, HEAD')
+        url = urlsplit(target)
+        if url.path == '/render':
+            try:
+                request = parse_request(url.query)
+            except BadRequest as error:
+                return _json(HTTPStatus.BAD_REQUEST, {'error': str(error)})
+            etag = await self.etag(request)
+            head = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            # A client that already has this render (GET or HEAD) gets a 304 without a cache lookup or a render
+            if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+                self.stats.sources['not_modified'] += 1
+                return HTTPStatus.NOT_MODIFIED, dict(head, **{'X-Render-Source': 'not_modified'}), b''
+            result, source = await self.render(request, etag)
+            self.stats.sources[source] += 1
+            return HTTPStatus.OK, dict(head, **{'Content-Type': result.content_type, 'X-Render-Source': source}), \
+                result.body
+        if url.path == '/stats':
+            return _json(HTTPStatus.OK, self.snapshot())
+        if url.path in ('/', '/designs'):
+            from brand_render.designs import PALETTES, SCENES
+
+            example = asdict(RenderRequest('premium_app_icon', 512))
+            return _json(HTTPStatus.OK, {'designs': sorted(SCENES), 'variants': sorted(PALETTES),
+                                         'formats': sorted(FORMATS), 'example': example})
+        return _json(HTTPStatus.NOT_FOUND, {'error': f"No such endpoint {url.path}"})
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                except ValueError:
+                    method, target, version = '', '', 'HTTP/1.0'
+                    status, head, body = _json(HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line'})
+                else:
+                    try:
+                        status, head, body = await self.respond(method, target, headers)
+                    except Exception as error:  # a failed render must not take the connection down with it
+                        status, head, body = _json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': repr(error)})
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = dict(head, **{'Content-Length': str(len(body)),
+                                     'Connection': 'keep-alive' if keep_alive else 'close'})
+                lines = [f"HTTP/1.1 {status.value} {status.phrase}"] + [f"{k}: {v}" for k, v in head.items()]
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                self.stats.record(status.value, time.perf_counter() - start, len(body) if method != 'HEAD' else 0)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def _json(status, document, **head):
+    return status, dict(head, **{'Content-Type': 'application/json'}), (json.dumps(document, indent=2) + '\n').encode()
+
+
+def check_loopback(host):
+    """Refuse to bind anything but a loopback address; the service has no authentication."""
+    try:
+        loopback = host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Refusing to serve on {host!r}: only loopback addresses are allowed")
+    return host
+
+
+async def serve(host=HOST, port=PORT, jobs=None, cache_bytes=CACHE_BYTES):
+    """Run the service until cancelled."""
+    service = RenderService(jobs, cache_bytes)
+    server = await asyncio.start_server(service.handle, check_loopback(host), port)
+    print(f"🎨 Serving FaithConnect renders on http://{host}:{port}/ "
+          f"({service.jobs} workers, {cache_bytes / 2 ** 20:.0f} MiB cache)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve brand asset renders over HTTP on localhost.')
+    parser.add_argument('--host', default=HOST, help=f'loopback address to bind (default: {HOST})')
+    parser.add_argument('--port', type=int, default=PORT, help=f'port (default: {PORT})')
+    parser.add_argument('--jobs', type=int, default=None, help='render worker processes (default: all cores)')
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // 2 ** 20,
+                        help='result cache budget (default: FAITHCONNECT_SERVE_CACHE_MB or 128)')
+    args = parser.parse_args(argv)
+    try:
+        check_loopback(args.host)
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs, args.cache_mb * 2 ** 20))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
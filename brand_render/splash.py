@@ -0,0 +1,245 @@
+"""
+Android and iOS splash images from a few master renders.
+
+``flutter_native_splash`` scales a single image to every density, which
+leaves no control over the filtering and has the app decode an oversized
+bitmap on cold start. Here the splash design is rendered once per palette
+at each master size: every target size that isn't a power-of-two multiple
+of another (the 4x and 3x densities of each bitmap, from which 2x, 1x and
+1.5x follow). A mip chain is built from each master by repeated 2x box
+reductions of the premultiplied buffer, and every target is exactly one of
+its levels, so each edge is box filtered with no resampling.
+
+One pass writes, under the Flutter project root:
+
+* ``drawable[-<density>]/splash.png``, the pre-Android 12 splash bitmap
+  (the density-less one at mdpi size, for devices no bucket matches),
+* ``drawable/background.png`` and ``drawable-v21/background.png``, the
+  one-pixel ``BACKGROUND`` fill ``launch_background.xml`` stretches behind
+  it,
+* ``drawable[-night]-<density>/android12splash.png``, the Android 12
+  splash icon, with the design inside the 192dp circle of its 288dp
+  canvas and the night palette for dark mode,
+* ``LaunchImage.png`` at @1x/@2x/@3x and ``LaunchBackground.imageset``'s
+  ``background.png`` for iOS, each with its ``Contents.json``.
+
+Outputs go through the ``brand_render.cache`` manifest like the icons, so
+an unchanged splash is skipped without rendering. Running
+``dart run flutter_native_splash:create`` afterwards would overwrite these
+files from the single image in ``pubspec.yaml``.
+
+Usage (from the repository root)::
+
+    python -m brand_render splash --platforms --root faith_connect
+"""
+
+import os
+from dataclasses import dataclass
+from functools import partial
+
+from brand_render import SUPERSAMPLE, profiling
+from brand_render.cache import Manifest, asset_key, encode_step, write_json, write_step
+from brand_render.export import ANDROID_DENSITIES, ANDROID_RES
+
+IOS_LAUNCH = os.path.join('ios', 'Runner', 'Assets.xcassets', 'LaunchImage.imageset')
+IOS_BACKGROUND = os.path.join('ios', 'Runner', 'Assets.xcassets', 'LaunchBackground.imageset')
+ANDROID_BACKGROUNDS = (os.path.join(ANDROID_RES, 'drawable', 'background.png'),
+                       os.path.join(ANDROID_RES, 'drawable-v21', 'background.png'))
+# flutter_native_splash ``color`` in pubspec.yaml (#6366F1)
+BACKGROUND = (99, 102, 241)
+IOS_SCALES = (1, 2, 3)
+# The pre-12 splash bitmap and the iOS launch image, in dp / points
+SPLASH_DP = 200
+# Android 12 splash icon canvas; the system masks it to the inner 2/3 circle
+ANDROID12_DP = 288
+ANDROID12_SAFE = 2 / 3
+NIGHT_PALETTE = 'night'
+# Palette name for the design as drawn
+DAY = 'day'
+
+
+@dataclass(frozen=True)
+class SplashTarget:
+    """One splash file: the design at ``content`` pixels, centred on a ``size`` canvas."""
+
+    path: str
+    size: int
+    content: int
+    palette: str = DAY
+
+
+def splash_targets():
+    """Every Android and iOS splash file, largest first."""
+    targets = [SplashTarget(os.path.join(ANDROID_RES, 'drawable', 'splash.png'), SPLASH_DP, SPLASH_DP)]
+    for density, scale in ANDROID_DENSITIES.items():
+        targets.append(SplashTarget(os.path.join(ANDROID_RES, f'drawable-{density}', 'splash.png'),
+                                    round(SPLASH_DP * scale), round(SPLASH_DP * scale)))
+        size = round(ANDROID12_DP * scale)
+        for palette, folder in ((DAY, f'drawable-{density}'), (NIGHT_PALETTE, f'drawable-night-{density}')):
+            targets.append(SplashTarget(os.path.join(ANDROID_RES, folder, 'android12splash.png'),
+                                        size, round(size * ANDROID12_SAFE), palette))
+    for scale in IOS_SCALES:
+        suffix = f'@{scale}x' if scale > 1 else ''
+        targets.append(SplashTarget(os.path.join(IOS_LAUNCH, f'LaunchImage{suffix}.png'),
+                                    SPLASH_DP * scale, SPLASH_DP * scale))
+    return sorted(targets, key=lambda t: t.size, reverse=True)
+
+
+def ios_contents(name, scales=IOS_SCALES):
+    """The ``Contents.json`` of an iOS image set holding ``<name>[@<scale>x].png`` for each of ``scales``."""
+    return {
+        'images': [
+            dict({'filename': f'{name}{f"@{scale}x" if scale > 1 else ""}.png'} if scale in scales else {},
+                 idiom='universal', scale=f'{scale}x')
+            for scale in IOS_SCALES
+        ],
+        'info': {'author': 'xcode', 'version': 1},
+    }
+
+
+def master_sizes(targets):
+    """Content sizes to render, largest first: those that aren't another's halved some number of times."""
+    sizes = {target.content for target in targets}
+    return sorted((size for size in sizes if master_of(size, sizes - {size}) is None), reverse=True)
+
+
+def master_of(size, masters):
+    """The size among ``masters`` that halves down to ``size``, or None."""
+    for master in masters:
+        ratio, remainder = divmod(master, size)
+        if not remainder and ratio & (ratio - 1) == 0:
+            return master
+    return None
+
+
+def mip_chain(master, smallest=1):
+    """``master`` followed by successive 2x box reductions down to ``smallest`` pixels."""
+    from brand_render.render import downsample
+
+    levels = [master]
+    while levels[-1].shape[0] % 2 == 0 and levels[-1].shape[0] // 2 >= smallest:
+        levels.append(downsample(levels[-1], 2))
+    return levels
+
+
+def level(levels, size):
+    """The mip level ``size`` pixels across."""
+    return next(level for level in levels if level.shape[0] == size)
+
+
+def place(buf, size):
+    """Centre ``buf`` on a transparent ``size`` x ``size`` canvas."""
+    import numpy as np
+
+    if buf.shape[0] == size:
+        return buf
+    out = np.zeros((size, size, buf.shape[-1]), dtype=buf.dtype)
+    offset = (size - buf.shape[0]) // 2
+    out[offset:offset + buf.shape[0], offset:offset + buf.shape[1]] = buf
+    return out
+
+
+def target_key(scene, target, master, supersample, optimize):
+    """Cache key of a target cut from a ``master`` pixel render of ``scene`` (already recoloured)."""
+    return asset_key(scene, target.size, content=target.content, master=master, supersample=supersample,
+                     optimize=optimize)
+
+
+def render_masters(scene, size, palettes, supersample):
+    """``{palette name: premultiplied buffer}`` of one master, a render step of ``splash_nodes``."""
+    from brand_render.themes import variant_buffers
+
+    with profiling.span('asset', scene.name, size=size, variants=len(palettes)):
+        return variant_buffers(scene, size, palettes, supersample)
+
+
+def background_scene(colour=BACKGROUND):
+    """The splash background fill, rendered to the one-pixel ``background.png``."""
+    from brand_render.scene import Layer, Rect, Scene
+
+    return Scene('splash_background', (Layer('background', (Rect(0, 0, 1, 1, colour),)),), mode='RGB')
+
+
+def splash_nodes(graph, manifest, design='faithconnect_logo', supersample=None, optimize=False):
+    """Add every stale splash target, the backgrounds and the iOS ``Contents.json`` files to a
+    ``brand_render.graph.Graph``.
+
+    One render step per master size draws it in every palette a stale
+    target cut from it uses; a derive step per master and palette builds
+    its mip chain and one per target picks the target's level. Returns
+    ``{path: write step or None if current}``.
+    """
+    from brand_render.cache import asset_nodes
+    from brand_render.designs import PALETTES, SCENES
+    from brand_render.render import to_image, to_pixels, unpremultiply
+    from brand_render.themes import Palette, recolour
+
+    scene = SCENES[design]
+    supersample = supersample or SUPERSAMPLE
+    palettes = {DAY: Palette(DAY), NIGHT_PALETTE: PALETTES[NIGHT_PALETTE]}
+    targets = splash_targets()
+    # Fixed by the whole target set, so a file's pixels never depend on which others were stale
+    masters = master_sizes(targets)
+    steps, stale = {}, []
+    for target in targets:
+        master = master_of(target.content, masters)
+        key = target_key(recolour(scene, palettes[target.palette]), target, master, supersample, optimize)
+        if manifest.is_current(target.path, key):
+            steps[target.path] = None
+        else:
+            stale.append((target, master, key))
+
+    def chain(name, smallest):
+        def build(buffers):
+            with profiling.span('derive', 'mip_chain', size=buffers[name].shape[0], palette=name):
+                return mip_chain(buffers[name], smallest)
+        return build
+
+    def cut(target):
+        def build(levels):
+            with profiling.span('derive', target.path, size=target.size):
+                buf = place(level(levels, target.content), target.size)
+            return to_image(to_pixels(unpremultiply(buf)), scene.mode)
+        return build
+
+    chains = {}
+    for master in masters:
+        cuts = [target for target, source, _key in stale if source == master]
+        if not cuts:
+            continue
+        used = sorted({target.palette for target in cuts})
+        rendered = graph.add(f"render {design} {master}px x{supersample} in {'/'.join(used)}", 'render',
+                             partial(render_masters, scene, master, tuple(palettes[name] for name in used),
+                                     supersample))
+        smallest = min(target.content for target in cuts)
+        for name in used:
+            chains[master, name] = graph.add(f'derive {design}_{name} {master}px mip chain', 'derive',
+                                             chain(name, smallest), rendered)
+    for target, master, key in stale:
+        derived = graph.add(f'derive {target.path}', 'derive', cut(target), chains[master, target.palette])
+        encoded = graph.add(f'optimize {target.path}', 'optimize', encode_step(target.path, optimize), derived)
+        steps[target.path] = graph.add(f'write {target.path}', 'write',
+                                       write_step(manifest, target.path, key, design=design, size=target.size),
+                                       encoded)
+
+    background = background_scene()
+    for path in ANDROID_BACKGROUNDS + (os.path.join(IOS_BACKGROUND, 'background.png'),):
+        steps[path] = asset_nodes(graph, manifest, path, background, 1, supersample=1, optimize=optimize)
+    for directory, name, scales in ((IOS_LAUNCH, 'LaunchImage', IOS_SCALES), (IOS_BACKGROUND, 'background', (1,))):
+        contents = os.path.join(directory, 'Contents.json')
+        steps[contents] = graph.add(f'write {contents}', 'write',
+                                    partial(write_json, manifest.root, contents, ios_contents(name, scales)))
+    return steps
+
+
+def export_splash(root='.', design='faithconnect_logo', supersample=None, optimize=False, jobs=None):
+    """Write every splash target, the backgrounds and the iOS ``Contents.json`` files under ``root``.
+
+    Returns ``{path: 'skipped' | 'unchanged' | 'written'}``.
+    """
+    from brand_render.graph import Graph
+
+    with Manifest(root) as manifest:
+        graph = Graph()
+        steps = splash_nodes(graph, manifest, design, supersample, optimize)
+        return graph.run(jobs).status(steps)
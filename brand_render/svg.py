@@ -0,0 +1,213 @@
+"""
+Load the SVG subset used by the brand vector logo as a ``Scene``.
+
+Supported: a square ``viewBox``; ``<g>`` and ``<path>`` elements; stroked,
+unfilled paths built from ``M``/``L``/``H``/``V``/``C``/``Z`` commands
+(absolute or relative) with round caps and joins; solid or
+``linearGradient`` strokes in ``userSpaceOnUse``; and ``feDropShadow``
+filters on groups. Anything else raises ``ValueError`` rather than
+rendering something that silently differs from the file.
+
+Paths become ``BezierStroke`` shapes, so they are flattened at render
+time for each output size like every other scene.
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from brand_render.scene import BezierStroke, DropShadow, Group, Layer, LinearGradient, Scene
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+INHERITED = ('fill', 'stroke', 'stroke-width', 'stroke-opacity', 'stroke-linecap', 'stroke-linejoin')
+IGNORED = ('defs', 'title', 'desc', 'metadata')
+
+_TOKEN = re.compile(r'[MmLlHhVvCcZz]|[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?')
+_URL = re.compile(r'url\(#([^)]+)\)')
+
+
+def _tag(element):
+    return element.tag.replace(SVG_NS, '')
+
+
+def parse_colour(value, opacity=1.0):
+    """RGBA tuple for ``#rgb`` / ``#rrggbb`` with an opacity in [0, 1]."""
+    value = value.strip()
+    if not re.fullmatch(r'#(?:[0-9a-fA-F]{3}){1,2}', value):
+        raise ValueError(f"Unsupported SVG colour {value!r}")
+    digits = value[1:]
+    if len(digits) == 3:
+        digits = ''.join(c * 2 for c in digits)
+    rgb = tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    return rgb + (round(255 * float(opacity)),)
+
+
+def _number(value):
+    value = value.strip()
+    if value.endswith('%'):
+        return float(value[:-1]) / 100
+    return float(value[:-2] if value.endswith('px') else value)
+
+
+def _line(p, q):
+    # A straight cubic, with its handles on the chord at thirds
+    return [(p[0] + (q[0] - p[0]) / 3, p[1] + (q[1] - p[1]) / 3),
+            (p[0] + (q[0] - p[0]) * 2 / 3, p[1] + (q[1] - p[1]) * 2 / 3), q]
+
+
+def parse_path(d):
+    """Subpaths of path data ``d`` as cubic control points ``p0, c1, c2, p1, ...``."""
+    tokens = _TOKEN.findall(d)
+    subpaths, current = [], None
+    x = y = 0.0
+    command, i = None, 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            raise ValueError(f"Path data must start with a command: {d!r}")
+        relative = command.islower()
+        kind = command.upper()
+        if kind == 'Z':
+            if current and current[-1] != current[0]:
+                current.extend(_line(current[-1], current[0]))
+            if current:
+                x, y = current[0]
+            current = None
+            command = None
+            continue
+        arity = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6}[kind]
+        args = [float(t) for t in tokens[i:i + arity]]
+        if len(args) < arity:
+            raise ValueError(f"Truncated {command} command in {d!r}")
+        i += arity
+        if kind == 'H':
+            args = [args[0], 0.0 if relative else y]
+        elif kind == 'V':
+            args = [0.0 if relative else x, args[0]]
+        points = [(args[j] + x, args[j + 1] + y) if relative else (args[j], args[j + 1])
+                  for j in range(0, len(args), 2)]
+        if kind == 'M':
+            current = [points[0]]
+            subpaths.append(current)
+            # Further coordinate pairs after a moveto are linetos
+            command = 'l' if relative else 'L'
+        elif current is None:
+            raise ValueError(f"Path segment without a current point in {d!r}")
+        elif kind == 'C':
+            current.extend(points)
+        else:
+            current.extend(_line(current[-1], points[0]))
+        x, y = points[-1]
+    return [points for points in subpaths if len(points) > 1]
+
+
+class _Document:
+    def __init__(self, root):
+        view_box = [float(v) for v in root.get('viewBox', '').replace(',', ' ').split()]
+        if len(view_box) != 4:
+            view_box = [0.0, 0.0, _number(root.get('width')), _number(root.get('height'))]
+        vx, vy, width, height = view_box
+        if width != height:
+            raise ValueError(f"Only square viewBoxes are supported, got {width}x{height}")
+        self.scale = 1.0 / width
+        self.origin = (vx, vy)
+        self.gradients = {}
+        self.filters = {}
+        for element in root.iter():
+            if _tag(element) == 'linearGradient':
+                self.gradients[element.get('id')] = self._gradient(element)
+            elif _tag(element) == 'filter':
+                self.filters[element.get('id')] = self._filter(element)
+
+    def point(self, p):
+        return ((p[0] - self.origin[0]) * self.scale, (p[1] - self.origin[1]) * self.scale)
+
+    def _gradient(self, element):
+        if element.get('gradientUnits') != 'userSpaceOnUse':
+            raise ValueError("Only userSpaceOnUse linear gradients are supported")
+        stops = [(_number(stop.get('offset', '0')),
+                  parse_colour(stop.get('stop-color', '#000'), stop.get('stop-opacity', '1')))
+                 for stop in element if _tag(stop) == 'stop']
+        if len(stops) != 2:
+            raise ValueError(f"Only two-stop gradients are supported, got {len(stops)} stops")
+        (first, start), (last, end) = stops
+        x1, y1 = self.point((_number(element.get('x1', '0')), _number(element.get('y1', '0'))))
+        x2, y2 = self.point((_number(element.get('x2', '0')), _number(element.get('y2', '0'))))
+        # Move the ramp ends onto the stop offsets
+        return LinearGradient(start, end,
+                              x0=x1 + (x2 - x1) * first, y0=y1 + (y2 - y1) * first,
+                              x1=x1 + (x2 - x1) * last, y1=y1 + (y2 - y1) * last)
+
+    def _filter(self, element):
+        primitives = list(element)
+        if len(primitives) != 1 or _tag(primitives[0]) != 'feDropShadow':
+            raise ValueError(f"Only single-feDropShadow filters are supported ({element.get('id')!r})")
+        shadow = primitives[0]
+        return DropShadow(_number(shadow.get('dx', '2')) * self.scale, _number(shadow.get('dy', '2')) * self.scale,
+                          _number(shadow.get('stdDeviation', '2')) * self.scale,
+                          parse_colour(shadow.get('flood-color', '#000')),
+                          opacity=_number(shadow.get('flood-opacity', '1')))
+
+    def paint(self, value, opacity):
+        match = _URL.fullmatch(value.strip())
+        if match:
+            return self.gradients[match.group(1)]
+        return parse_colour(value, opacity)
+
+    def layers(self, element, style):
+        """Scene layers for the children of ``element``."""
+        layers = []
+        for child in element:
+            tag = _tag(child)
+            if tag in IGNORED:
+                continue
+            if child.get('transform'):
+                raise ValueError(f"SVG transforms are not supported (<{tag}>)")
+            child_style = dict(style, **{k: child.get(k) for k in INHERITED if child.get(k) is not None})
+            name = child.get('id') or f'{tag}{len(layers)}'
+            if tag == 'g':
+                inner = self.layers(child, child_style)
+                match = _URL.fullmatch(child.get('filter', ''))
+                if match:
+                    layers.append(Group(name, inner, filter=self.filters[match.group(1)]))
+                else:
+                    layers.extend(inner)
+            elif tag == 'path':
+                shapes = self.path(child, child_style)
+                if shapes:
+                    layers.append(Layer(name, shapes))
+            else:
+                raise ValueError(f"Unsupported SVG element <{tag}>")
+        return layers
+
+    def path(self, element, style):
+        if style.get('fill', 'black') != 'none':
+            raise ValueError("Only unfilled (stroked) paths are supported")
+        stroke = style.get('stroke', 'none')
+        if stroke == 'none':
+            return ()
+        for attribute in ('stroke-linecap', 'stroke-linejoin'):
+            if style.get(attribute) != 'round':
+                raise ValueError(f"Only round {attribute} is supported, got {style.get(attribute)!r}")
+        paint = self.paint(stroke, style.get('stroke-opacity', '1'))
+        width = _number(style.get('stroke-width', '1')) * self.scale
+        return tuple(BezierStroke([self.point(p) for p in points], paint, width=width)
+                     for points in parse_path(element.get('d', '')))
+
+
+def parse(text, name='svg'):
+    """``Scene`` for an SVG document string."""
+    root = ET.fromstring(text)
+    if _tag(root) != 'svg':
+        raise ValueError(f"Not an SVG document (root <{_tag(root)}>)")
+    document = _Document(root)
+    style = {k: root.get(k) for k in INHERITED if root.get(k) is not None}
+    return Scene(name, document.layers(root, style))
+
+
+def load(path):
+    """``Scene`` for the SVG file at ``path``, named after the file."""
+    with open(path, encoding='utf-8') as fh:
+        return parse(fh.read(), os.path.splitext(os.path.basename(path))[0])
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from brand_render import bench
+
+
+def test_the_committed_baseline_covers_every_case_and_the_pre_series():
+    with open(bench.DEFAULT_BASELINE) as fh:
+        saved = json.load(fh)
+    cases = {f'{name}@{size}' for name in bench.GENERATORS for size in bench.SIZES}
+    assert set(saved['cases']) == cases and set(saved['pre_series']) == cases
+
+
+def test_require_baseline_fails_without_one(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, 'DEFAULT_BASELINE', str(tmp_path / 'missing.json'))
+    with pytest.raises(SystemExit) as exit:
+        bench.main(['--require-baseline', '--sizes', '48', '--repeat', '1'])
+    assert exit.value.code == 2
+
+
+def test_pre_series_report_totals_the_time_ratio():
+    results = {'a@48': {'seconds': 0.002}, 'b@48': {'seconds': 0.004}, 'c@48': {'seconds': 1.0}}
+    pre_series = {'a@48': {'seconds': 0.001}, 'b@48': {'seconds': 0.005}}
+    lines = bench.pre_series_report(results, pre_series)
+    assert len(lines) == 3 and '2.00x' in lines[0] and '0.80x' in lines[1]
+    assert lines[-1].split()[:2] == ['total', '1.00x']
+    assert bench.pre_series_report(results, {}) == []
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from brand_render.blur import box_sizes, gaussian_blur, support
+from brand_render.render import render_pixels
+from brand_render.scene import DropShadow, Ellipse, Group, Layer, Rect, Scene
+
+
+@pytest.mark.parametrize('sigma', [0.8, 3.0, 6.0, 20.0])
+def test_blur_keeps_mass_and_stays_within_its_support(sigma):
+    reach = support(sigma)
+    size = 2 * reach + 41
+    impulse = np.zeros((size, size), np.float32)
+    impulse[size // 2, size // 2] = 1.0
+    blurred = gaussian_blur(impulse, sigma)
+    assert blurred.sum() == pytest.approx(1.0, rel=0.02)
+    rows, cols = np.nonzero(blurred > 1e-6)
+    assert max(abs(rows - size // 2).max(), abs(cols - size // 2).max()) <= reach
+    # Spread close to the Gaussian asked for
+    offsets = np.arange(size) - size // 2
+    assert np.sqrt((blurred.sum(axis=0) * offsets ** 2).sum()) == pytest.approx(sigma, rel=0.15)
+
+
+@pytest.mark.parametrize('sigma', [1.5, 2.5, 7.0])
+def test_box_sizes_match_the_gaussian_variance(sigma):
+    widths = box_sizes(sigma)
+    variance = sum((width * width - 1) / 12 for width in widths)
+    assert variance == pytest.approx(sigma * sigma, rel=0.25)
+    assert all(width % 2 for width in widths)
+
+
+def test_shadowed_strips_match_the_full_render():
+    shadow = DropShadow(0.02, 0.03, 0.05, (20, 0, 60, 160))
+    scene = Scene('shadowed', [Layer('back', [Rect(0, 0, 1, 1, (250, 250, 255))]),
+                               Group('logo', [Layer('disc', [Ellipse(0.5, 0.45, 0.25, 0.2, (90, 80, 230))])],
+                                     filter=shadow)])
+    full = render_pixels(scene, 96)
+    strips = np.concatenate([render_pixels(scene, 96, (0, top, 96, min(96, top + 13))) for top in range(0, 96, 13)])
+    assert np.array_equal(full, strips)
+    # The shadow darkens pixels below the disc that the disc itself does not cover
+    assert full[66, 48, 0] < 200 and full[86, 48, 0] == 250
@@ -0,0 +1,72 @@
+import json
+import os
+
+from brand_render import raster
+from brand_render.cache import Manifest, asset_key, build_asset, write_json
+from brand_render.scene import Ellipse, Layer, Scene
+
+SCENE = Scene('dot', [Layer('dot', [Ellipse(0.5, 0.5, 0.3, 0.3, (200, 30, 90))])])
+
+
+def test_key_covers_size_options_and_backend():
+    key = asset_key(SCENE, 32, optimize=False)
+    assert key == asset_key(SCENE, 32, optimize=False)
+    assert key != asset_key(SCENE, 33, optimize=False)
+    assert key != asset_key(SCENE, 32, optimize=True)
+    backend = raster.get_backend()
+    raster.set_backend('pil' if backend == 'numpy' else 'numpy')
+    try:
+        assert key != asset_key(SCENE, 32, optimize=False)
+    finally:
+        raster.set_backend(backend)
+
+
+def test_current_assets_are_skipped_until_they_change(tmp_path):
+    root = str(tmp_path)
+    with Manifest(root) as manifest:
+        assert build_asset(manifest, 'dot.png', SCENE, 32) == 'written'
+    with Manifest(root) as manifest:
+        assert build_asset(manifest, 'dot.png', SCENE, 32) == 'skipped'
+        assert build_asset(manifest, 'dot.png', SCENE, 32, supersample=2) == 'written'
+
+    # Same size, different bytes: the digest no longer matches
+    path = tmp_path / 'dot.png'
+    data = bytearray(path.read_bytes())
+    data[-20] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with Manifest(root) as manifest:
+        assert build_asset(manifest, 'dot.png', SCENE, 32, supersample=2) == 'written'
+        assert build_asset(manifest, 'dot.png', SCENE, 32, supersample=2) == 'skipped'
+
+
+def test_rendered_but_identical_assets_are_not_rewritten(tmp_path):
+    root = str(tmp_path)
+    with Manifest(root) as manifest:
+        build_asset(manifest, 'dot.png', SCENE, 32)
+    mtime = os.stat(tmp_path / 'dot.png').st_mtime_ns
+    os.remove(tmp_path / '.brand_manifest.json')
+    with Manifest(root) as manifest:
+        assert build_asset(manifest, 'dot.png', SCENE, 32) == 'unchanged'
+    assert os.stat(tmp_path / 'dot.png').st_mtime_ns == mtime
+
+
+def test_write_json_keeps_an_equal_document_in_its_own_layout(tmp_path):
+    document = {'images': [{'idiom': 'universal', 'scale': '1x'}], 'info': {'author': 'xcode', 'version': 1}}
+    path = tmp_path / 'Contents.json'
+    assert write_json(str(tmp_path), 'Contents.json', document) == 'written'
+    assert '"author" : "xcode"' in path.read_text()
+
+    compact = json.dumps(document)
+    path.write_text(compact)
+    assert write_json(str(tmp_path), 'Contents.json', document) == 'unchanged'
+    assert path.read_text() == compact
+    assert write_json(str(tmp_path), 'Contents.json', dict(document, info={'version': 2})) == 'written'
+
+
+def test_optimized_assets_record_their_plain_size(tmp_path):
+    with Manifest(str(tmp_path)) as manifest:
+        build_asset(manifest, 'plain.png', SCENE, 32)
+        build_asset(manifest, 'small.png', SCENE, 32, optimize=True)
+    assert 'plain_bytes' not in manifest.entries['plain.png']
+    entry = manifest.entries['small.png']
+    assert entry['bytes'] < entry['plain_bytes'] == manifest.entries['plain.png']['bytes']
@@ -0,0 +1,18 @@
+import numpy as np
+
+from brand_render import golden
+
+
+def test_every_scene_matches_its_reference(tmp_path):
+    failures, _seconds = golden.run(diff_dir=str(tmp_path))
+    assert failures == []
+    assert not list(tmp_path.iterdir())
+
+
+def test_compare_stops_at_the_first_changed_tile():
+    expected = np.zeros((64, 64, 4), dtype=np.uint8)
+    actual = expected.copy()
+    actual[40:44, 20:24] = 255
+    assert golden.compare(expected, expected) is None
+    tile_x, tile_y, ssim = golden.compare(actual, expected)
+    assert (tile_x, tile_y) == (1, 2) and ssim < golden.SSIM_THRESHOLD
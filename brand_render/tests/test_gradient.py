@@ -0,0 +1,49 @@
+import numpy as np
+
+from brand_render import raster
+from brand_render.gradient import linear_gradient, radial_colours
+from brand_render.render import render, render_pixels
+from brand_render.scene import Layer, LinearGradient, Rect, Scene
+
+
+def _rows(size, start, end):
+    # generate_icon_fixed.create_icon's per-row colours
+    return np.array([[int(a + (b - a) * y / size) for a, b in zip(start, end)] for y in range(size)])
+
+
+def test_linear_ramp_is_within_one_level_of_the_row_loop():
+    ramp = linear_gradient(300, 300, (99, 102, 241), (139, 92, 246))
+    assert ramp.shape == (300, 1, 3)
+    assert np.abs(ramp[:, 0].astype(int) - _rows(300, (99, 102, 241), (139, 92, 246))).max() <= 1
+    strip = linear_gradient(300, 100, (99, 102, 241), (139, 92, 246), offset=200, span=300)
+    assert np.array_equal(strip, ramp[200:])
+    across = linear_gradient(300, 40, (99, 102, 241), (139, 92, 246), vertical=False)
+    assert across.shape == (1, 300, 3) and np.array_equal(across[0], ramp[:, 0])
+
+
+def test_radial_rings_are_within_one_level_of_the_ellipse_loop():
+    # generate_new_logo's main circle: one outline every 2 px, from the rim inwards
+    radius, inner, outer = 90, (123, 111, 232, 200), (157, 139, 245, 200)
+    offsets = np.arange(-radius - 5, radius + 6, dtype=np.float32)
+    distance = np.sqrt(offsets[None, :] ** 2 + offsets[:, None] ** 2)
+    colours = radial_colours(distance, radius, inner, outer, step=2)
+    rings = radius - np.floor((radius - np.minimum(distance, radius)) / 2) * 2
+    expected = np.zeros(colours.shape, dtype=int)
+    for ring in np.unique(rings):
+        ratio = max(ring, 0) / radius
+        expected[rings == ring] = [int(o - (o - i) * (1 - ratio)) for i, o in zip(inner, outer)]
+    assert np.abs(colours.astype(int) - expected).max() <= 1
+    smooth = radial_colours(distance, radius, inner, outer)
+    ratio = np.clip(distance / radius, 0, 1)[..., None]
+    assert np.abs(smooth - (np.array(outer) - (1 - ratio) * (np.array(outer) - inner))).max() <= 1
+
+
+def test_the_pil_backend_expands_linear_ramps():
+    scene = Scene('ramp', [Layer('back', [Rect(0, 0, 1, 1, LinearGradient((99, 102, 241), (139, 92, 246)))])])
+    expected = render_pixels(scene, 64).astype(int)
+    backend = raster.get_backend()
+    raster.set_backend('pil')
+    try:
+        assert np.abs(np.asarray(render(scene, 64, supersample=1)).astype(int) - expected).max() <= 1
+    finally:
+        raster.set_backend(backend)
@@ -0,0 +1,69 @@
+import time
+from functools import partial
+
+import pytest
+
+from brand_render.graph import Graph
+
+
+def _ordered_graph(log):
+    graph = Graph()
+
+    def step(name, value):
+        def run(*inputs):
+            log.append(name)
+            return value + sum(inputs)
+        return run
+
+    graph.add('load a', 'derive', step('load a', 1))
+    graph.add('load b', 'derive', step('load b', 2))
+    graph.add('derive ab', 'derive', step('derive ab', 10), 'load a', 'load b')
+    graph.add('write ab', 'write', step('write ab', 100), 'derive ab')
+    graph.add('write a', 'write', step('write a', 1000), 'load a')
+    return graph
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_steps_run_after_their_dependencies(jobs):
+    log = []
+    run = _ordered_graph(log).run(jobs)
+    assert sorted(log) == sorted(['load a', 'load b', 'derive ab', 'write ab', 'write a'])
+    for before, after in (('load a', 'derive ab'), ('load b', 'derive ab'), ('derive ab', 'write ab'),
+                          ('load a', 'write a')):
+        assert log.index(before) < log.index(after)
+    # Only results nothing depends on are kept
+    assert run.results == {'write ab': 113, 'write a': 1001}
+
+
+def test_same_name_is_one_step():
+    graph = Graph()
+    calls = []
+    for _ in range(3):
+        graph.add('render shared', 'derive', lambda: calls.append(1))
+    graph.run(1)
+    assert calls == [1]
+
+
+def test_rejects_unknown_kinds_and_dependencies():
+    graph = Graph()
+    with pytest.raises(ValueError):
+        graph.add('x', 'paint', int)
+    with pytest.raises(KeyError):
+        graph.add('y', 'write', int, 'missing')
+
+
+def test_render_steps_run_in_worker_processes():
+    graph = Graph()
+    graph.add('render pow', 'render', partial(pow, 2, 10))
+    graph.add('write half', 'write', lambda value: value // 2, 'render pow')
+    assert graph.run(2).status({'out': 'write half'}) == {'out': 512}
+
+
+def test_critical_path_follows_the_slowest_chain():
+    graph = Graph()
+    graph.add('render fast', 'render', lambda: None)
+    graph.add('render slow', 'render', lambda: time.sleep(0.05))
+    graph.add('write slow', 'write', lambda _: None, 'render slow')
+    seconds, chain = graph.run(1).critical_path()
+    assert chain == ['render slow', 'write slow']
+    assert seconds >= 0.05
@@ -0,0 +1,61 @@
+import numpy as np
+
+from brand_render import layer_cache
+from brand_render.layer_cache import LayerCache, caching
+from brand_render.render import render_pixels
+from brand_render.scene import Ellipse, Layer, Rect, Scene
+
+DOT = Layer('dot', [Ellipse(0.5, 0.5, 0.2, 0.2, (10, 20, 30))])
+
+
+def _renderer(calls, side=8):
+    def render():
+        calls.append(side)
+        return np.ones((side, side, 4), np.float32)
+    return render
+
+
+def test_layers_are_kept_in_memory_from_their_second_request():
+    cache, calls = LayerCache(), []
+    cache.get(DOT, 32, _renderer(calls))
+    assert cache.entries == {} and cache.bytes == 0
+    cache.get(DOT, 32, _renderer(calls))
+    cache.get(DOT, 32, _renderer(calls))
+    assert len(calls) == 2
+    assert cache.counts == (1, 0, 2)
+    assert cache.peak == cache.bytes == 8 * 8 * 16
+
+
+def test_the_disk_tier_keeps_every_layer(tmp_path):
+    first, calls = LayerCache(str(tmp_path)), []
+    first.get(DOT, 32, _renderer(calls))
+    second = LayerCache(str(tmp_path))
+    assert np.array_equal(second.get(DOT, 32, _renderer(calls)), np.ones((8, 8, 4)))
+    assert len(calls) == 1 and second.counts == (0, 1, 0)
+
+
+def test_memory_stays_within_the_budget():
+    cache, calls = LayerCache(budget=3 * 8 * 8 * 16), []
+    layers = [Layer(f'dot{i}', DOT.shapes) for i in range(5)]
+    for layer in layers + layers:
+        cache.get(layer, 32, _renderer(calls))
+    assert len(cache.entries) == 3 and cache.peak <= cache.budget
+    assert not cache.accepts((0, 0, 64, 64))
+
+
+def test_caching_is_off_unless_asked_for(tmp_path, monkeypatch):
+    monkeypatch.delenv('FAITHCONNECT_LAYER_CACHE', raising=False)
+    with caching() as cache:
+        assert cache is None and layer_cache.active() is None
+    with caching(str(tmp_path)) as cache:
+        assert layer_cache.active() is cache and cache.directory == str(tmp_path)
+    assert layer_cache.active() is None
+
+
+def test_cached_renders_match_uncached_ones(tmp_path):
+    scene = Scene('two', [Layer('back', [Rect(0, 0, 1, 1, (200, 200, 255))]), DOT, DOT])
+    plain = render_pixels(scene, 48)
+    with caching(str(tmp_path)) as cache:
+        assert np.array_equal(render_pixels(scene, 48), plain)
+        assert np.array_equal(render_pixels(scene, 48), plain)
+    assert cache.hits
@@ -0,0 +1,45 @@
+import numpy as np
+from PIL import Image, ImageCms
+
+from brand_render.optimize import colour_chunks, optimize_file
+
+
+def _photo(path):
+    pixels = (np.arange(48 * 48 * 3) % 251).astype(np.uint8).reshape(48, 48, 3)
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+    Image.fromarray(pixels).save(path, icc_profile=profile)
+    return pixels, profile
+
+
+def test_colour_chunks_are_kept(tmp_path):
+    path = str(tmp_path / 'photo.png')
+    pixels, profile = _photo(path)
+    before, after, description = optimize_file(path)
+    assert after < before and 'kept iCCP' in description
+    with Image.open(path) as img:
+        assert img.info['icc_profile'] == profile
+        assert np.array_equal(np.asarray(img.convert('RGB')), pixels)
+
+
+def test_strip_colour_drops_them(tmp_path):
+    path = str(tmp_path / 'photo.png')
+    pixels, _profile = _photo(path)
+    optimize_file(path, strip_colour=True)
+    with open(path, 'rb') as fh:
+        assert colour_chunks(fh.read()) == []
+    with Image.open(path) as img:
+        assert np.array_equal(np.asarray(img.convert('RGB')), pixels)
+
+
+def test_16_bit_images_are_left_alone(tmp_path):
+    path = str(tmp_path / 'deep.png')
+    pixels = (np.arange(32 * 32, dtype=np.uint16) * 48).reshape(32, 32)
+    Image.fromarray(pixels).save(path)
+    with open(path, 'rb') as fh:
+        original = fh.read()
+    before, after, description = optimize_file(path)
+    assert before == after and '16-bit' in description
+    with open(path, 'rb') as fh:
+        assert fh.read() == original
+    with Image.open(path) as img:
+        assert np.array_equal(np.asarray(img), pixels)
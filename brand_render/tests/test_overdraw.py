@@ -0,0 +1,41 @@
+import numpy as np
+
+from brand_render.overdraw import analyze, cull
+from brand_render.render import render_pixels
+from brand_render.scene import Ellipse, Layer, Rect, Scene
+
+
+def _hidden(analysis):
+    return [(p.layer, p.kind) for p in analysis.primitives if p.hidden]
+
+
+def test_counts_every_write():
+    scene = Scene('two', [Layer('a', [Rect(0, 0, 0.5, 1, (255, 0, 0))]), Layer('b', [Rect(0, 0, 1, 1, (0, 0, 255))])])
+    analysis = analyze(scene, 16)
+    assert analysis.writes == 16 * 8 + 16 * 16
+    assert analysis.counts.max() == 2
+    assert [p.layer for p in analysis.writers(2, 2)] == ['a', 'b']
+
+
+def test_opaque_cover_culls_what_it_hides_and_keeps_the_image():
+    scene = Scene('covered', [Layer('under', [Ellipse(0.5, 0.5, 0.2, 0.2, (255, 0, 0)),
+                                              Ellipse(0.1, 0.1, 0.08, 0.08, (0, 255, 0))]),
+                              Layer('cover', [Rect(0.2, 0.2, 0.8, 0.8, (0, 0, 255))])])
+    culled, analysis = cull(scene, 64)
+    assert _hidden(analysis) == [('under', 'Ellipse')]
+    assert len(culled.layers[0].shapes) == 1
+    assert np.array_equal(render_pixels(culled, 64), render_pixels(scene, 64))
+
+
+def test_translucent_cover_hides_nothing():
+    scene = Scene('tinted', [Layer('under', [Ellipse(0.5, 0.5, 0.2, 0.2, (255, 0, 0))]),
+                             Layer('cover', [Rect(0, 0, 1, 1, (0, 0, 255, 200))])])
+    assert _hidden(analyze(scene, 32)) == []
+
+
+def test_copy_clears_what_is_beneath():
+    scene = Scene('cleared', [Layer('under', [Ellipse(0.5, 0.5, 0.2, 0.2, (255, 0, 0))]),
+                              Layer('hole', [Rect(0, 0, 1, 1, (0, 0, 0, 0))], blend='copy')])
+    culled, analysis = cull(scene, 32)
+    assert _hidden(analysis) == [('under', 'Ellipse')]
+    assert np.array_equal(render_pixels(culled, 32), render_pixels(scene, 32))
@@ -0,0 +1,76 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from brand_render.png import FILTERS, PNGWriter, StripPNG, render_png
+from brand_render.render import render_pixels
+from brand_render.scene import Ellipse, Layer, LinearGradient, Rect, Scene
+
+
+def _pixels(height, width, channels, seed=0):
+    rng = np.random.default_rng(seed)
+    # Smooth ramps plus noise, so every filter has something to predict
+    ramp = np.add.outer(np.arange(height), np.arange(width))[..., None] * (1 + np.arange(channels))
+    return ((ramp + rng.integers(0, 8, (height, width, channels))) % 256).astype(np.uint8)
+
+
+def _decode(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img)
+
+
+@pytest.mark.parametrize('channels', [1, 2, 3, 4])
+@pytest.mark.parametrize('kind', list(FILTERS) + ['adaptive'])
+def test_writer_round_trips_in_batches(channels, kind):
+    pixels = _pixels(37, 23, channels)
+    out = io.BytesIO()
+    with PNGWriter(out, 23, 37, channels, filter=kind) as writer:
+        for top in range(0, 37, 5):
+            writer.write(pixels[top:top + 5])
+    assert np.array_equal(_decode(out.getvalue()).reshape(pixels.shape), pixels)
+
+
+def test_writer_palette_round_trips():
+    palette = [(0, 0, 0, 0), (255, 0, 0, 255), (0, 0, 255, 128)]
+    indices = (np.arange(20 * 30).reshape(20, 30) % 3).astype(np.uint8)
+    out = io.BytesIO()
+    with PNGWriter(out, 30, 20, 1, palette=palette) as writer:
+        writer.write(indices)
+    with Image.open(io.BytesIO(out.getvalue())) as img:
+        assert img.mode == 'P'
+        assert np.array_equal(np.asarray(img.convert('RGBA')), np.asarray(palette, dtype=np.uint8)[indices])
+
+
+def test_writer_rejects_wrong_row_counts():
+    with pytest.raises(ValueError):
+        with PNGWriter(io.BytesIO(), 4, 4, 4) as writer:
+            writer.write(np.zeros((5, 4, 4), np.uint8))
+    writer = PNGWriter(io.BytesIO(), 4, 4, 4)
+    writer.write(np.zeros((3, 4, 4), np.uint8))
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+def test_strip_png_round_trips_and_matches_a_fresh_encode_after_update():
+    pixels = _pixels(70, 40, 4)
+    strips = StripPNG(40, 70, rows=16)
+    strips.update(pixels)
+    assert np.array_equal(_decode(strips.tobytes()), pixels)
+
+    edited = pixels.copy()
+    edited[20:24, 5:9] = 255
+    strips.update(edited, [(20, 24)])
+    fresh = StripPNG(40, 70, rows=16)
+    fresh.update(edited)
+    assert strips.tobytes() == fresh.tobytes()
+    assert np.array_equal(_decode(strips.tobytes()), edited)
+
+
+def test_render_png_matches_render_pixels():
+    scene = Scene('test', [Layer('back', [Rect(0, 0, 1, 1, LinearGradient((10, 20, 30), (200, 100, 50)))]),
+                           Layer('dot', [Ellipse(0.5, 0.5, 0.3, 0.2, (255, 255, 255, 200))])])
+    out = io.BytesIO()
+    render_png(scene, 64, out, supersample=2, rows=7)
+    assert np.array_equal(_decode(out.getvalue()), render_pixels(scene, 64, supersample=2))
@@ -0,0 +1,60 @@
+import numpy as np
+from brand_render import raster, sdf
+from brand_render.render import render, render_pixels
+from brand_render.scene import Ellipse, Group, Layer, Rect, Scene
+from brand_render.themes import Palette, render_variants
+
+BACK = Layer('back', [Rect(0, 0, 1, 1, (250, 200, 40))])
+# The group's bounding box spans the canvas, but its shapes cover only two corners and a disc
+GROUP = Group('patch', [Layer('corners', [Rect(0, 0, 0.25, 0.25, (20, 40, 200)),
+                                          Rect(0.75, 0.75, 1, 1, (0, 0, 0, 0))]),
+                        Layer('disc', [Ellipse(0.5, 0.5, 0.15, 0.15, (200, 30, 30, 128))])], blend='copy')
+SCENE = Scene('copy_group', [BACK, GROUP])
+
+
+def _check(pixels, size=64):
+    assert tuple(pixels[4, 4]) == (20, 40, 200, 255)
+    assert tuple(pixels[size - 4, size - 4]) == (0, 0, 0, 0)
+    assert tuple(pixels[size // 2, size // 2]) == (200, 30, 30, 128)
+    # Outside the shapes but inside the group's bounds the background stays
+    assert tuple(pixels[4, size - 4]) == (250, 200, 40, 255)
+    assert tuple(pixels[size // 2, 4]) == (250, 200, 40, 255)
+
+
+def test_copy_group_replaces_only_what_it_covers():
+    _check(render_pixels(SCENE, 64))
+    _check(np.asarray(sdf.render(SCENE, 64)))
+
+
+def test_copy_group_strips_match_the_full_render():
+    full = render_pixels(SCENE, 64)
+    assert np.array_equal(full, np.concatenate([render_pixels(SCENE, 64, (0, top, 64, top + 16))
+                                                for top in range(0, 64, 16)]))
+
+
+def test_copy_group_variants_match_a_full_render():
+    palette = Palette('blue', {(250, 200, 40): (40, 90, 250)})
+    variant = np.asarray(render_variants(SCENE, 64, [palette])['blue'])
+    _check(np.where(variant == (40, 90, 250, 255), (250, 200, 40, 255), variant).astype(np.uint8))
+
+
+def test_copy_group_on_the_pil_backend():
+    backend = raster.get_backend()
+    raster.set_backend('pil')
+    try:
+        _check(np.asarray(render(SCENE, 64, supersample=1)))
+    finally:
+        raster.set_backend(backend)
+
+
+def test_filtered_groups_render_on_every_path():
+    from brand_render.designs import PREMIUM_LOGO
+
+    reference = render_pixels(PREMIUM_LOGO, 128).astype(np.int16)
+    assert np.abs(np.asarray(sdf.render(PREMIUM_LOGO, 128)) - reference).mean() < 1.5
+    backend = raster.get_backend()
+    raster.set_backend('pil')
+    try:
+        assert np.abs(np.asarray(render(PREMIUM_LOGO, 128, supersample=1)) - reference).mean() < 3
+    finally:
+        raster.set_backend(backend)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from brand_render import sdf
+from brand_render.render import render_pixels
+from brand_render.scene import Ellipse, Layer, Rect, Ring, Scene, Stroke
+
+BOX = (0, 0, 64, 64)
+
+
+def _centres():
+    axis = np.arange(64) + 0.5
+    return axis[None, :], axis[:, None]
+
+
+def test_circle_distance_is_exact():
+    xs, ys = _centres()
+    d = sdf.distance(Ellipse(0.5, 0.5, 0.25, 0.25, (0, 0, 0)), BOX, 64)
+    assert np.allclose(d, np.hypot(xs - 32, ys - 32) - 16, atol=1e-4)
+
+
+def test_rect_distance_is_signed_euclidean():
+    xs, ys = _centres()
+    d = sdf.distance(Rect(0.25, 0.25, 0.75, 0.5, (0, 0, 0)), BOX, 64)
+    outside = np.hypot(np.maximum(np.maximum(16 - xs, xs - 48), 0), np.maximum(np.maximum(16 - ys, ys - 32), 0))
+    inside = np.minimum(np.minimum(xs - 16, 48 - xs), np.minimum(ys - 16, 32 - ys))
+    assert np.allclose(d, np.where(outside > 0, outside, -inside), atol=1e-4)
+
+
+def test_ring_and_stroke_are_zero_on_their_edges():
+    ring = sdf.distance(Ring(0.5, 0.5, 0.25, 0.25, (0, 0, 0), width=0.0625), BOX, 64)
+    assert ring[32, 32] > 0 and ring[32, 47] < 0 and ring[32, 49] > 0
+    stroke = sdf.distance(Stroke(((0.25, 0.5), (0.75, 0.5)), (0, 0, 0), width=0.125), BOX, 64)
+    assert stroke[31, 32] == pytest.approx(-3.5, abs=1e-4)
+    assert stroke[20, 32] == pytest.approx(7.5, abs=1e-4)
+
+
+def test_render_is_closer_to_an_8x_reference_than_plain_rasterization():
+    scene = Scene('disc', [Layer('disc', [Ellipse(0.5, 0.5, 0.31, 0.27, (40, 90, 200))])])
+    reference = render_pixels(scene, 48, supersample=8).astype(np.float32)
+    plain = render_pixels(scene, 48).astype(np.float32)
+    smooth = np.asarray(sdf.render(scene, 48)).astype(np.float32)
+    assert np.abs(smooth - reference).mean() < np.abs(plain - reference).mean() / 3
+
+
+def test_texture_round_trips_through_its_png_atlas(tmp_path):
+    scene = Scene('pair', [Layer('shapes', [Ellipse(0.3, 0.3, 0.2, 0.2, (0, 0, 0)),
+                                            Rect(0.5, 0.5, 0.9, 0.8, (0, 0, 0))])])
+    field = sdf.texture(scene, resolution=32, spread=4.0)
+    path = str(tmp_path / 'atlas.png')
+    sdf.save_texture(field, path)
+    loaded = sdf.load_texture(path, scene)
+    assert loaded.spread == 4.0
+    assert np.array_equal(loaded.levels, field.levels)
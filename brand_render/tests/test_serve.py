@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from brand_render import serve
+from brand_render.serve import BadRequest, RenderRequest, RenderService, parse_request
+
+
+@pytest.fixture
+def service(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_render(request):
+        with lock:
+            calls.append(request)
+        time.sleep(0.05)
+        return b'%d' % request.size
+
+    monkeypatch.setattr(serve, 'render_request', fake_render)
+    service = RenderService(jobs=2)
+    service.pool.shutdown()
+    service.pool = ThreadPoolExecutor(max_workers=2)
+    service.calls = calls
+    yield service
+    service.close()
+
+
+def test_concurrent_requests_share_one_render(service):
+    async def burst():
+        requests = [RenderRequest('fixed_icon', 32)] * 5 + [RenderRequest('fixed_icon', 48)]
+        return await asyncio.gather(*(service.render(request) for request in requests))
+
+    results = asyncio.run(burst())
+    assert len(service.calls) == 2
+    assert [source for _result, source in results] == ['rendered'] + ['coalesced'] * 4 + ['rendered']
+    assert {result.body for result, _source in results} == {b'32', b'48'}
+    assert service.in_flight == {}
+
+    result, source = asyncio.run(service.render(RenderRequest('fixed_icon', 32)))
+    assert (result.body, source) == (b'32', 'cache')
+    assert len(service.calls) == 2
+
+
+def test_parse_request_validates_its_query():
+    assert parse_request('design=fixed_icon&size=64&variant=night') == RenderRequest('fixed_icon', 64, 'night')
+    for query in ('design=nope&size=64', 'design=fixed_icon&size=0', 'design=fixed_icon&size=64&format=gif',
+                  'design=fixed_icon&size=64&supersample=3'):
+        with pytest.raises(BadRequest):
+            parse_request(query)
+
+
+def test_matching_etag_is_not_modified_without_a_render(service):
+    async def revalidate(method):
+        etag = RenderRequest('fixed_icon', 32).etag()
+        return await service.respond(method, '/render?design=fixed_icon&size=32', {'if-none-match': etag})
+
+    for method in ('GET', 'HEAD'):
+        status, head, body = asyncio.run(revalidate(method))
+        assert (status, head['X-Render-Source'], body) == (304, 'not_modified', b'')
+    assert service.calls == []
+    assert (service.cache.hits, service.cache.misses) == (0, 0)
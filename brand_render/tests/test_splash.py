@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+from PIL import Image
+
+from brand_render.render import downsample
+from brand_render.splash import (
+    ANDROID_BACKGROUNDS, BACKGROUND, IOS_BACKGROUND, export_splash, level, master_of, master_sizes, mip_chain,
+    splash_targets,
+)
+
+
+def test_every_target_is_a_mip_level_of_a_master():
+    targets = splash_targets()
+    masters = master_sizes(targets)
+    assert masters == [800, 768, 600, 576]
+    for target in targets:
+        master = master_of(target.content, masters)
+        assert master is not None and master // target.content in (1, 2, 4)
+
+
+def test_levels_are_exact_box_reductions():
+    master = np.random.default_rng(1).uniform(0, 255, (96, 96, 4)).astype(np.float32)
+    levels = mip_chain(master, 12)
+    assert [buf.shape[0] for buf in levels] == [96, 48, 24, 12]
+    assert np.array_equal(level(levels, 24), downsample(downsample(master, 2), 2))
+
+
+def test_export_writes_every_file_once(tmp_path):
+    status = export_splash(str(tmp_path))
+    assert set(status.values()) == {'written'}
+    res = tmp_path / 'android' / 'app' / 'src' / 'main' / 'res'
+    with Image.open(res / 'drawable' / 'splash.png') as img:
+        assert img.size == (200, 200)
+    for path in ANDROID_BACKGROUNDS + (f'{IOS_BACKGROUND}/background.png',):
+        with Image.open(tmp_path / path) as img:
+            assert img.size == (1, 1) and img.getpixel((0, 0)) == BACKGROUND
+    contents = json.loads((tmp_path / IOS_BACKGROUND / 'Contents.json').read_text())
+    assert [image.get('filename') for image in contents['images']] == ['background.png', None, None]
+    assert set(export_splash(str(tmp_path)).values()) <= {'skipped', 'unchanged'}
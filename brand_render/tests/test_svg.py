@@ -0,0 +1,89 @@
+import pytest
+
+from brand_render import svg
+from brand_render.designs import BRAND_LOGO, BRAND_SVG
+from brand_render.scene import BezierStroke, DropShadow, Group, Layer, LinearGradient
+
+DOCUMENT = '''<svg viewBox="0 0 200 200" fill="none" xmlns="http://www.w3.org/2000/svg">
+  <defs>
+    <linearGradient id="ramp" x1="0" y1="0" x2="200" y2="0" gradientUnits="userSpaceOnUse">
+      <stop offset="0.25" stop-color="#6C63FF"/>
+      <stop offset="1" stop-color="#5A52E0" stop-opacity="0.5"/>
+    </linearGradient>
+    <filter id="shadow">
+      <feDropShadow dx="0" dy="10" stdDeviation="20" flood-color="#000" flood-opacity="0.25"/>
+    </filter>
+  </defs>
+  <g filter="url(#shadow)" stroke-linecap="round" stroke-linejoin="round">
+    <path id="curve" d="M 20 20 C 40 20 60 40 60 60" stroke="url(#ramp)" stroke-width="20"/>
+  </g>
+  <g stroke="#f80" stroke-opacity="0.5" stroke-width="10" stroke-linecap="round" stroke-linejoin="round">
+    <path d="m 100 100 h 40 v 40 z"/>
+    <path d="M 0 0 L 10 10" stroke="none"/>
+  </g>
+</svg>'''
+
+
+def _ends(points):
+    return [points[i] for i in range(0, len(points), 3)]
+
+
+def test_path_commands_absolute_and_relative():
+    square, = svg.parse_path('M 10 10 H 30 V 30 L 10 30 Z')
+    assert _ends(square) == [(10, 10), (30, 10), (30, 30), (10, 30), (10, 10)]
+    assert svg.parse_path('m 10 10 h 20 v 20 l -20 0 z') == [square]
+    # Straight segments are cubics with their handles at thirds of the chord
+    assert square[1:3] == [pytest.approx((10 + 20 / 3, 10)), pytest.approx((10 + 40 / 3, 10))]
+    curve, = svg.parse_path('M1 2c1 0 2 1 3 3')
+    assert curve == [(1, 2), (2, 2), (3, 3), (4, 5)]
+    # Extra pairs after a moveto are linetos; a second moveto starts a new subpath
+    first, second = svg.parse_path('m 0 0 5 0 M 1 1 L 2 2')
+    assert _ends(first) == [(0, 0), (5, 0)] and _ends(second) == [(1, 1), (2, 2)]
+
+
+def test_document_maps_onto_the_unit_canvas():
+    scene = svg.parse(DOCUMENT, 'doc')
+    group, square = scene.layers
+    assert isinstance(group, Group) and group.filter == DropShadow(0, 0.05, 0.1, (0, 0, 0), opacity=0.25)
+    curve, = group.layers[0].shapes
+    assert group.layers[0].name == 'curve' and isinstance(curve, BezierStroke)
+    assert curve.points[0] == pytest.approx((0.1, 0.1)) and curve.width == pytest.approx(0.1)
+    assert curve.paint == LinearGradient((0x6C, 0x63, 0xFF), (0x5A, 0x52, 0xE0, 128), x0=0.25, y0=0, x1=1, y1=0)
+    # Stroke style is inherited from the group; a path with no stroke adds nothing
+    assert isinstance(square, Layer) and len(square.shapes) == 1
+    assert square.shapes[0].paint.colour == (255, 136, 0, 128)
+    assert square.shapes[0].width == pytest.approx(0.05)
+
+
+@pytest.mark.parametrize('text, message', [
+    ('<svg viewBox="0 0 10 10"><rect width="5" height="5"/></svg>', 'element <rect>'),
+    ('<svg viewBox="0 0 10 10"><g transform="scale(2)"/></svg>', 'transforms'),
+    ('<svg viewBox="0 0 10 10"><path d="M0 0L5 5" fill="#000" stroke="#000"/></svg>', 'unfilled'),
+    ('<svg viewBox="0 0 10 10" fill="none"><path d="M0 0L5 5" stroke="#000"/></svg>', 'round stroke-linecap'),
+    ('<svg viewBox="0 0 10 10" fill="none" stroke-linecap="round" stroke-linejoin="round">'
+     '<path d="M0 0L5 5" stroke="red"/></svg>', 'colour'),
+    ('<svg viewBox="0 0 10 20"/>', 'square'),
+    ('<svg viewBox="0 0 10 10"><linearGradient id="g"><stop/><stop/></linearGradient></svg>', 'userSpaceOnUse'),
+    ('<svg viewBox="0 0 10 10"><linearGradient id="g" gradientUnits="userSpaceOnUse"><stop/></linearGradient></svg>',
+     'two-stop'),
+    ('<svg viewBox="0 0 10 10"><filter id="f"><feGaussianBlur/></filter></svg>', 'feDropShadow'),
+    ('<html/>', 'Not an SVG'),
+])
+def test_unsupported_svg_fails_loudly(text, message):
+    with pytest.raises(ValueError, match=message):
+        svg.parse(text)
+
+
+@pytest.mark.parametrize('d', ['0 0 L 5 5', 'M 0 0 C 1 1 2', 'L 5 5'])
+def test_malformed_path_data_fails_loudly(d):
+    with pytest.raises(ValueError):
+        svg.parse_path(d)
+
+
+def test_brand_logo_parses_at_import():
+    assert BRAND_LOGO.name == 'faithconnect_logo'
+    group, = BRAND_LOGO.layers
+    assert isinstance(group, Group) and group.filter is not None
+    strokes = [shape for layer in group.layers for shape in layer.shapes]
+    assert len(strokes) == 3 and all(isinstance(shape, BezierStroke) for shape in strokes)
+    assert svg.load(BRAND_SVG) == BRAND_LOGO
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from brand_render.designs import SCENES
+from brand_render.render import render
+from brand_render.scene import Ellipse, Group, Layer, Rect, Scene
+from brand_render.tiles import cull, render_tiled, tile_boxes
+
+# A 'copy' group whose disc and bar straddle the edges between tiles
+COPY_GROUP = Scene('copy_across_tiles', [
+    Layer('back', [Rect(0, 0, 1, 1, (250, 200, 40))]),
+    Group('patch', [Layer('bar', [Rect(0.1, 0.45, 0.9, 0.55, (20, 40, 200))]),
+                    Layer('disc', [Ellipse(0.5, 0.5, 0.2, 0.2, (200, 30, 30, 128))]),
+                    Layer('hole', [Rect(0.3, 0.3, 0.45, 0.45, (0, 0, 0, 0))])], blend='copy'),
+])
+
+
+@pytest.mark.parametrize('scene', [SCENES['premium_logo'], SCENES['fixed_icon'], SCENES['faith_foreground'],
+                                   COPY_GROUP], ids=lambda scene: scene.name)
+@pytest.mark.parametrize('tile', [32, 40, 48])
+def test_tiled_renders_are_pixel_identical(scene, tile):
+    expected = np.asarray(render(scene, 96, supersample=2))
+    assert np.array_equal(np.asarray(render_tiled(scene, 96, jobs=2, tile=tile, supersample=2)), expected)
+
+
+def test_tiles_cover_the_canvas_and_cull_to_what_touches_them():
+    boxes = tile_boxes(96, 40)
+    assert len(boxes) == 9 and boxes[-1] == (80, 80, 96, 96)
+    corner = cull(COPY_GROUP, 96, (0, 0, 16, 16))
+    assert [layer.name for layer in corner.layers] == ['back']
+    middle = cull(COPY_GROUP, 96, (48, 48, 64, 64))
+    assert [layer.name for layer in middle.layers[1].layers] == ['bar', 'disc']
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from brand_render import designs
+from brand_render.cache import Manifest
+from brand_render.cli import plan
+from brand_render.graph import Graph
+from brand_render.watch import Preview, damage, refresh
+
+OUTPUTS = [('icon.png', 'fixed_icon', 64), ('icon_night.png', 'fixed_icon', 64, 'night'),
+           ('icon_brand.png', 'fixed_icon', 64, 'brand')]
+
+
+def _edited(scene):
+    """``scene`` with its dots moved a little to the right."""
+    dots = scene.layers[-1]
+    moved = replace(dots, shapes=tuple(replace(shape, cx=shape.cx + 0.02) for shape in dots.shapes))
+    return replace(scene, layers=scene.layers[:-1] + (moved,))
+
+
+def _build(root, optimize):
+    with Manifest(str(root)) as manifest:
+        graph = Graph()
+        steps = plan(graph, manifest, OUTPUTS, optimize=optimize)
+        graph.run(jobs=1)
+    return steps
+
+
+def _pixels(path):
+    with Image.open(path) as img:
+        return np.asarray(img.convert('RGBA'))
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+def test_previews_match_a_clean_build_and_its_manifest(tmp_path, monkeypatch, optimize):
+    watched, clean = tmp_path / 'watched', tmp_path / 'clean'
+    _build(watched, optimize)
+    previews = [Preview(str(watched), rel_path, design, size, 1, palette[0] if palette else None, optimize)
+                for rel_path, design, size, *palette in OUTPUTS]
+    for preview in previews:
+        preview.adopt(preview.current())
+
+    edited = _edited(designs.SCENES['fixed_icon'])
+    assert damage(designs.SCENES['fixed_icon'], edited, 64)
+    monkeypatch.setitem(designs.SCENES, 'fixed_icon', edited)
+    refresh(previews, str(watched), reload=False)
+    _build(clean, optimize)
+
+    for rel_path, *_output in OUTPUTS:
+        assert np.array_equal(_pixels(watched / rel_path), _pixels(clean / rel_path)), rel_path
+        if optimize:
+            assert (watched / rel_path).read_bytes() == (clean / rel_path).read_bytes(), rel_path
+    # The next build finds every preview current
+    assert set(_build(watched, optimize).values()) == {None}
@@ -0,0 +1,337 @@
+"""
+Colour treatments of a design that share its rasterized geometry.
+
+A ``Palette`` maps the colours a design is drawn with to new ones (and can
+put a solid background under it). ``recolour`` applies it to a scene,
+giving an ordinary scene that renders like any other.
+
+``render_variants`` renders many palettes of one design for about the
+cost of one render. Over and copy compositing is linear in the paint
+colours, so the design is rasterized once into per-pixel weights, one
+channel per distinct colour it uses (a gradient weighs its two end
+colours by its ramp) plus alpha. Each palette is then a single
+weights-times-colours matrix product. Palettes that change alpha, and
+designs using the non-linear blend modes, fall back to a full render of
+the recoloured scene. Variants match a full render to within one level
+per channel, which comes from the renderer truncating gradient colours.
+
+The palettes themselves are design data and live in
+``brand_render.designs.PALETTES``.
+"""
+
+from dataclasses import dataclass, replace
+from functools import partial
+from operator import itemgetter
+
+from brand_render.scene import Group, Layer, LinearGradient, RadialGradient, Rect, Solid
+
+# Blend modes under which a layer's result is linear in its colours
+LINEAR_BLENDS = ('over', 'copy')
+
+
+def _rgb(colour):
+    return tuple(int(c) for c in colour[:3])
+
+
+@dataclass(frozen=True)
+class Palette:
+    """A colour treatment: ``colours`` maps RGB to RGB (or RGBA).
+
+    Matching ignores alpha, and a mapped colour keeps the original alpha,
+    multiplied by the new one when given. Colours not listed map to
+    ``default``, or are kept when that is None. ``background`` (RGB or
+    RGBA) is filled beneath the recoloured design.
+    """
+
+    name: str
+    colours: tuple = ()
+    default: tuple = None
+    background: tuple = None
+
+    def __post_init__(self):
+        colours = self.colours.items() if isinstance(self.colours, dict) else self.colours
+        object.__setattr__(self, 'colours', tuple((_rgb(old), tuple(new)) for old, new in colours))
+
+    def colour(self, rgba):
+        """The RGBA colour ``rgba`` becomes."""
+        new = dict(self.colours).get(rgba[:3], self.default)
+        if new is None:
+            return rgba
+        alpha = rgba[3] if len(new) == 3 else round(rgba[3] * new[3] / 255)
+        return _rgb(new) + (alpha,)
+
+    @property
+    def keeps_alpha(self):
+        """Whether recolouring leaves every alpha as it was."""
+        targets = [new for _old, new in self.colours] + [self.default or ()]
+        return all(len(new) != 4 for new in targets)
+
+
+def _paint(paint, palette):
+    if isinstance(paint, Solid):
+        return Solid(palette.colour(paint.colour))
+    if isinstance(paint, LinearGradient):
+        return replace(paint, start=palette.colour(paint.start), end=palette.colour(paint.end))
+    if isinstance(paint, RadialGradient):
+        return replace(paint, inner=palette.colour(paint.inner), outer=palette.colour(paint.outer))
+    raise TypeError(f"Unsupported paint {paint!r}")
+
+
+def _layer(layer, palette):
+    if isinstance(layer, Group):
+        shadow = replace(layer.filter, colour=palette.colour(layer.filter.colour)) if layer.filter else None
+        return replace(layer, layers=tuple(_layer(child, palette) for child in layer.layers), filter=shadow)
+    return replace(layer, shapes=tuple(replace(shape, paint=_paint(shape.paint, palette))
+                                       for shape in layer.shapes))
+
+
+def recolour(scene, palette):
+    """``scene`` in ``palette``'s colours, named ``<scene>_<palette>``.
+
+    A background goes under the design as a whole, so that ``'copy'``
+    layers clearing the design show the background through.
+    """
+    layers = tuple(_layer(layer, palette) for layer in scene.layers)
+    if palette.background is not None:
+        layers = (Layer('theme_background', (Rect(0, 0, 1, 1, palette.background),)), Group(scene.name, layers))
+    return replace(scene, name=f'{scene.name}_{palette.name}', layers=layers)
+
+
+def _ends(paint):
+    if isinstance(paint, Solid):
+        return (paint.colour,)
+    if isinstance(paint, LinearGradient):
+        return paint.start, paint.end
+    return paint.inner, paint.outer
+
+
+def basis(scene):
+    """The distinct RGB colours ``scene`` is painted with, or None if it isn't linear in them."""
+    colours = {}
+
+    def visit(layers):
+        for layer in layers:
+            if layer.blend not in LINEAR_BLENDS:
+                return False
+            if isinstance(layer, Group):
+                if layer.filter is not None:
+                    colours.setdefault(_rgb(layer.filter.colour), len(colours))
+                if not visit(layer.layers):
+                    return False
+                continue
+            for shape in layer.shapes:
+                for end in _ends(shape.paint):
+                    colours.setdefault(_rgb(end), len(colours))
+        return True
+
+    return list(colours) if visit(scene.layers) else None
+
+
+def _ramp(paint, box, size):
+    """Where each pixel of ``box`` sits between a gradient's two ends (0 to 1)."""
+    import numpy as np
+
+    xs = np.arange(box[0], box[2], dtype=np.float64)[None, :]
+    ys = np.arange(box[1], box[3], dtype=np.float64)[:, None]
+    if isinstance(paint, RadialGradient):
+        radius = paint.radius * size
+        distance = np.hypot(xs - paint.cx * size, ys - paint.cy * size)
+        if paint.step:
+            step = paint.step * size
+            distance = radius - np.floor((radius - distance) / step) * step
+        return np.clip(distance / radius, 0.0, 1.0) if radius else np.ones_like(distance)
+    if paint.x0 == paint.x1:
+        return np.clip((ys - paint.y0 * size) / ((paint.y1 - paint.y0) * size), 0.0, 1.0)
+    # Axial ramps are sampled at pixel centres
+    vx, vy = (paint.x1 - paint.x0) * size, (paint.y1 - paint.y0) * size
+    t = (xs + 0.5 - paint.x0 * size) * vx + (ys + 0.5 - paint.y0 * size) * vy
+    return np.clip(t / (vx * vx + vy * vy), 0.0, 1.0)
+
+
+def _paint_weights(paint, colours, box, size):
+    """Premultiplied weights of ``paint`` over ``box`` (broadcastable), alpha last."""
+    import numpy as np
+
+    if isinstance(paint, Solid):
+        weights = np.zeros(len(colours) + 1, dtype=np.float32)
+        weights[colours.index(_rgb(paint.colour))] = weights[-1] = paint.colour[3]
+        return weights
+    start, end = _ends(paint)
+    t = _ramp(paint, box, size)
+    alpha = start[3] + (end[3] - start[3]) * t
+    weights = np.zeros(t.shape + (len(colours) + 1,), dtype=np.float32)
+    weights[..., colours.index(_rgb(start))] += alpha * (1 - t)
+    weights[..., colours.index(_rgb(end))] += alpha * t
+    weights[..., -1] = alpha
+    return weights
+
+
+def _draw(buf, shape, size, box, blend, colours):
+    from brand_render.render import _region, composite, shape_mask, shape_window
+
+    window = shape_window(shape, size, box)
+    if window[2] <= window[0] or window[3] <= window[1]:
+        return
+    window, mask = shape_mask(shape, size, window)
+    if window is None:
+        return
+    weights = _paint_weights(shape.paint, colours, window, size)
+    region = _region(buf, box, window)
+    if blend == 'copy' or weights[..., -1].min() >= 255:
+        region += (weights - region) * mask[..., None]
+    elif weights[..., -1].any():
+        composite(region, weights * mask[..., None], 'over')
+
+
+def _weights(layers, size, box, colours):
+    import numpy as np
+
+    from brand_render.blur import shadow_alpha, shadow_reach
+    from brand_render.raster import bounds
+    from brand_render.render import _region, composite, copy_within, group_coverage, shape_window
+
+    buf = np.zeros((box[3] - box[1], box[2] - box[0], len(colours) + 1), dtype=np.float32)
+    for layer in layers:
+        if not isinstance(layer, Group):
+            for shape in layer.shapes:
+                _draw(buf, shape, size, box, layer.blend, colours)
+            continue
+        window = shape_window(layer, size, box)
+        if window[2] <= window[0] or window[3] <= window[1]:
+            continue
+        if layer.filter is None:
+            pixels = _weights(layer.layers, size, window, colours)
+        else:
+            # As render_filtered: shapes outside the window still cast into it
+            margin = shadow_reach(layer.filter, size)
+            source = bounds((window[0] - margin, window[1] - margin, window[2] + margin, window[3] + margin),
+                            (size, size))
+            sub = _weights(layer.layers, size, source, colours)
+            shadow = np.zeros_like(sub)
+            shadow[..., -1] = shadow_alpha(sub[..., -1], layer.filter, size, source[:2])
+            shadow[..., colours.index(_rgb(layer.filter.colour))] = shadow[..., -1]
+            composite(shadow, sub, 'over')
+            pixels = _region(shadow, source, window)
+        if layer.blend == 'copy':
+            copy_within(_region(buf, box, window), pixels, group_coverage(layer, size, window))
+        else:
+            composite(_region(buf, box, window), pixels, layer.blend)
+    return buf
+
+
+def colour_weights(scene, size, colours, supersample=1):
+    """Per-pixel premultiplied weight of each of ``colours`` in ``scene`` at ``size``, alpha last.
+
+    Supersampled weights are reduced strip by strip, like ``render_pixels``.
+    """
+    import numpy as np
+
+    from brand_render.render import STRIP_BYTES, downsample
+
+    if supersample == 1:
+        return _weights(scene.layers, size, (0, 0, size, size), colours)
+    factor, channels = supersample, len(colours) + 1
+    out = np.empty((size, size, channels), dtype=np.float32)
+    rows = max(1, STRIP_BYTES // (size * factor * factor * 4 * channels))
+    for top in range(0, size, rows):
+        bottom = min(size, top + rows)
+        hi = _weights(scene.layers, size * factor, (0, top * factor, size * factor, bottom * factor), colours)
+        out[top:bottom] = downsample(hi, factor)
+    return out
+
+
+def recolour_weights(weights, colours, palette):
+    """Premultiplied float RGBA of the weighted design in ``palette`` (which must keep alpha)."""
+    import numpy as np
+
+    from brand_render.render import premultiply
+
+    # One matrix product: each colour's weight into its new RGB, alpha passed through
+    matrix = np.zeros((len(colours) + 1, 4), dtype=np.float32)
+    matrix[:-1, :3] = [palette.colour(rgb + (255,))[:3] for rgb in colours]
+    matrix[:-1, :3] /= 255.0
+    matrix[-1, 3] = 1.0
+    out = weights @ matrix
+    if palette.background is not None:
+        out += premultiply(Solid(palette.background).colour) * (1 - out[..., 3:] / 255.0)
+    return out
+
+
+def variant_buffers(scene, size, palettes, supersample=None):
+    """``scene`` in every palette as ``{palette name: premultiplied float32 RGBA}``."""
+    from brand_render import SUPERSAMPLE
+    from brand_render.render import check_supersample, render_premultiplied
+
+    factor = check_supersample(supersample or SUPERSAMPLE)
+    colours = basis(scene)
+    weights = None
+    buffers = {}
+    for palette in palettes:
+        if colours is None or not palette.keeps_alpha:
+            buffers[palette.name] = render_premultiplied(recolour(scene, palette), size, supersample=factor)
+            continue
+        if weights is None:
+            weights = colour_weights(scene, size, colours, factor)
+        buffers[palette.name] = recolour_weights(weights, colours, palette)
+    return buffers
+
+
+def render_variants(scene, size, palettes, supersample=None):
+    """Render ``scene`` in every palette; returns ``{palette name: PIL image}``."""
+    from brand_render.render import to_image, to_pixels, unpremultiply
+
+    buffers = variant_buffers(scene, size, palettes, supersample)
+    return {name: to_image(to_pixels(unpremultiply(buf)), scene.mode) for name, buf in buffers.items()}
+
+
+def variant_step(scene, size, palettes, supersample):
+    """``render_variants`` as the render step of ``variant_nodes``."""
+    from brand_render import profiling
+
+    with profiling.span('asset', scene.name, size=size, variants=len(palettes)):
+        return render_variants(scene, size, palettes, supersample)
+
+
+def variant_nodes(graph, manifest, scene, size, variants, supersample=None, optimize=False):
+    """Add the stale ``{rel_path: palette}`` variants of ``scene`` to a ``brand_render.graph.Graph``.
+
+    One render step computes every stale palette; a derive step per palette
+    picks its image. Keys match ``brand_render.cache.build_asset``
+    on the recoloured scene. Returns ``{rel_path: write step or None if current}``.
+    """
+    from brand_render import SUPERSAMPLE
+    from brand_render.cache import asset_key, encode_step, write_step
+
+    supersample = supersample or SUPERSAMPLE
+    steps, stale = {}, {}
+    for rel_path, palette in variants.items():
+        key = asset_key(recolour(scene, palette), size, opaque=False, supersample=supersample, optimize=optimize)
+        if manifest.is_current(rel_path, key):
+            steps[rel_path] = None
+        else:
+            stale[rel_path] = palette, key
+    if not stale:
+        return steps
+    palettes = tuple({palette.name: palette for palette, _key in stale.values()}.values())
+    names = '/'.join(sorted(palette.name for palette in palettes))
+    rendered = graph.add(f"render {scene.name} {size}px x{supersample} in {names}", 'render',
+                         partial(variant_step, scene, size, palettes, supersample))
+    for rel_path, (palette, key) in stale.items():
+        design = f'{scene.name}_{palette.name}'
+        derived = graph.add(f'derive {design} {size}px', 'derive', itemgetter(palette.name), rendered)
+        encoded = graph.add(f'optimize {rel_path}', 'optimize', encode_step(rel_path, optimize), derived)
+        steps[rel_path] = graph.add(f'write {rel_path}', 'write',
+                                    write_step(manifest, rel_path, key, design=design, size=size), encoded)
+    return steps
+
+
+def build_variants(manifest, scene, size, variants, supersample=None, optimize=False, jobs=None):
+    """Render the stale ``{rel_path: palette}`` variants of ``scene`` together.
+
+    Returns ``{rel_path: 'skipped' | 'unchanged' | 'written'}``.
+    """
+    from brand_render.graph import Graph
+
+    graph = Graph()
+    steps = variant_nodes(graph, manifest, scene, size, variants, supersample, optimize)
+    return graph.run(jobs).status(steps)
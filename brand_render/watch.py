@@ -0,0 +1,250 @@
+"""
+Watch mode: re-render brand assets while their designs are being edited.
+
+The watcher polls ``brand_render/designs.py`` and the brand SVG, and on a
+change reloads the designs and diffs every output's new scene against the
+one it last rendered, layer by layer and shape by shape. Only the outputs
+whose scene changed are re-rendered and rewritten. Each output keeps its
+rendered pixels in memory, and with the NumPy backend only the pixel
+windows of the shapes that changed (before and after the edit) are
+re-rendered into it. Windowed renders are bit-identical to full ones.
+Colour treatments are re-rendered in full from their colour weights
+(``brand_render.themes.variant_buffers``), as the build makes them, so
+every file matches a clean build pixel for pixel.
+
+The PNG is kept as independently compressed row strips
+(``brand_render.png.StripPNG``), so only the strips under a change are
+compressed again; with ``--optimize`` each rewrite is optimized as the
+build does it instead. Rewrites are recorded in the build manifest under
+the build's key, so the next regular build skips them.
+
+Usage (from the repository root)::
+
+    python -m brand_render logo --watch
+"""
+
+import importlib
+import os
+import time
+
+POLL_SECONDS = 0.05
+
+
+def _nonempty(window):
+    return window[2] > window[0] and window[3] > window[1]
+
+
+def _changed(old, new, size):
+    """Pixel windows that differ between two versions of a layer or group."""
+    from brand_render.render import shape_window
+    from brand_render.scene import Group, Layer
+
+    same = type(old) is type(new) and old.blend == new.blend
+    if same and isinstance(old, Group) and old.blend == 'over' and old.filter is None and new.filter is None \
+            and len(old.layers) == len(new.layers):
+        # Without a filter or a whole-canvas blend, a group's pixels only change under its changed shapes
+        return [w for a, b in zip(old.layers, new.layers) if a != b for w in _changed(a, b, size)]
+    if same and isinstance(old, Layer) and len(old.shapes) == len(new.shapes):
+        pairs = [(a, b) for a, b in zip(old.shapes, new.shapes) if a != b]
+    else:
+        pairs = [(old, new)]
+    windows = [shape_window(item, size) for pair in pairs for item in pair]
+    return [w for w in windows if _nonempty(w)]
+
+
+def _area(window):
+    return (window[2] - window[0]) * (window[3] - window[1])
+
+
+def merge(windows):
+    """Merge overlapping pixel windows where their bounding box is no larger than the two apart."""
+    merged = []
+    for window in windows:
+        while True:
+            for other in merged:
+                union = (min(window[0], other[0]), min(window[1], other[1]),
+                         max(window[2], other[2]), max(window[3], other[3]))
+                if _area(union) <= _area(window) + _area(other):
+                    break
+            else:
+                break
+            merged.remove(other)
+            window = union
+        merged.append(window)
+    return merged
+
+
+def damage(old, new, size):
+    """Pixel windows of ``new`` at ``size`` that may differ from ``old``.
+
+    Returns None when the scenes can't be compared layer by layer (a
+    layer added or removed, or a new canvas mode) and everything must be
+    re-rendered.
+    """
+    if old.mode != new.mode or len(old.layers) != len(new.layers):
+        return None
+    return merge([w for a, b in zip(old.layers, new.layers) if a != b for w in _changed(a, b, size)])
+
+
+class Preview:
+    """One watched output file and the pixels it was last rendered with."""
+
+    def __init__(self, root, rel_path, design, size, supersample=1, palette=None, optimize=False):
+        self.rel_path, self.path = rel_path, os.path.join(root, rel_path)
+        self.design, self.size, self.supersample, self.palette = design, size, supersample, palette
+        self.optimize = optimize
+        self.scene = self.pixels = self.png = None
+
+    def current(self):
+        """The scene as ``brand_render.designs`` now defines it, in the preview's palette."""
+        from brand_render import designs
+
+        scene = designs.SCENES[self.design]
+        if self.palette is None:
+            return scene
+        from brand_render.themes import recolour
+
+        return recolour(scene, designs.PALETTES[self.palette])
+
+    def adopt(self, scene):
+        """Take the file on disk, just built from ``scene``, as its rendered pixels."""
+        import numpy as np
+        from PIL import Image
+
+        try:
+            with Image.open(self.path) as img:
+                pixels = np.array(img.convert('RGBA'))
+        except (OSError, ValueError):
+            return
+        if pixels.shape[:2] == (self.size, self.size):
+            self.scene, self.pixels = scene, pixels
+            if not self.optimize:
+                # Compress every strip now, so the first edit only redoes its own
+                self.encode([(0, 0, self.size, self.size)])
+
+    def windowed(self):
+        """Whether changed windows can be patched in place, matching a full build render."""
+        from brand_render import raster
+
+        return self.palette is None and raster.get_backend() == 'numpy'
+
+    def render(self, scene):
+        """``scene`` rendered in full the way the build renders this output, as RGBA pixels."""
+        import numpy as np
+
+        from brand_render import designs
+        from brand_render.render import render, to_pixels, unpremultiply
+        from brand_render.themes import variant_buffers
+
+        if self.palette is None:
+            return np.array(render(scene, self.size, supersample=self.supersample).convert('RGBA'))
+        palette = designs.PALETTES[self.palette]
+        buf = variant_buffers(designs.SCENES[self.design], self.size, (palette,), self.supersample)[palette.name]
+        return to_pixels(unpremultiply(buf))
+
+    def update(self, scene, manifest):
+        """Bring the file up to date with ``scene``; returns re-rendered pixels (0 if unchanged)."""
+        from brand_render.render import render_pixels
+
+        if scene == self.scene:
+            return 0
+        windows = None if self.scene is None or not self.windowed() else damage(self.scene, scene, self.size)
+        if windows is None:
+            self.pixels = self.render(scene)
+            windows = [(0, 0, self.size, self.size)]
+        else:
+            for x0, y0, x1, y1 in windows:
+                self.pixels[y0:y1, x0:x1] = render_pixels(scene, self.size, (x0, y0, x1, y1),
+                                                          supersample=self.supersample)
+        self.scene = scene
+        self.write(windows, manifest)
+        return max(1, sum(_area(window) for window in windows))
+
+    def encode(self, windows):
+        """Re-encode the PNG rows under ``windows``."""
+        from brand_render.png import StripPNG
+
+        channels = 3 if self.scene.mode == 'RGB' else 4
+        if self.png is None or self.png.channels != channels:
+            self.png = StripPNG(self.size, self.size, channels)
+            windows = [(0, 0, self.size, self.size)]
+        self.png.update(self.pixels[..., :channels], [(y0, y1) for _x0, y0, _x1, y1 in windows])
+
+    def write(self, windows, manifest):
+        """Re-encode the rows under ``windows``, rewrite the file and record it in ``manifest``."""
+        from brand_render.cache import asset_key, encode_step, write_step
+        from brand_render.render import to_image
+
+        if self.optimize:
+            encoded = encode_step(self.rel_path, optimize=True)(to_image(self.pixels, self.scene.mode))
+        else:
+            self.encode(windows)
+            encoded = self.png.tobytes(), None
+        # The key asset_nodes and variant_nodes give this output
+        key = asset_key(self.scene, self.size, opaque=False, supersample=self.supersample, optimize=self.optimize)
+        write_step(manifest, self.rel_path, key, design=self.scene.name, size=self.size)(encoded)
+
+
+def sources():
+    """Files whose edits change the designs."""
+    from brand_render import designs
+
+    return [designs.__file__, designs.BRAND_SVG]
+
+
+def _mtimes(paths):
+    return {path: os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in paths}
+
+
+def refresh(previews, root='.', reload=True):
+    """Reload the designs and update every preview; prints what was rewritten."""
+    from brand_render import designs
+    from brand_render.cache import Manifest
+
+    start = time.perf_counter()
+    if reload:
+        importlib.reload(designs)
+    with Manifest(root) as manifest:
+        for preview in previews:
+            began = time.perf_counter()
+            area = preview.update(preview.current(), manifest)
+            if area:
+                share = area / (preview.size * preview.size)
+                print(f"  ✓ {preview.path} ({preview.design}, {preview.size}px): "
+                      f"{share:.0%} re-rendered in {(time.perf_counter() - began) * 1000:.0f} ms")
+    return time.perf_counter() - start
+
+
+def watch(outputs, root='.', supersample=None, optimize=False, poll=POLL_SECONDS):
+    """Keep ``(path, scene name, size[, palette])`` outputs in sync with the designs until interrupted.
+
+    The outputs are expected to have just been built (with the same
+    ``supersample`` and ``optimize``); any that can't be read back are
+    rendered first.
+    """
+    from brand_render import SUPERSAMPLE
+
+    paths = sources()
+    seen = _mtimes(paths)
+    previews = [Preview(root, rel_path, design, size, supersample or SUPERSAMPLE,
+                        palette[0] if palette else None, optimize)
+                for rel_path, design, size, *palette in outputs]
+    for preview in previews:
+        preview.adopt(preview.current())
+    refresh(previews, root, reload=False)
+    print(f"👀 Watching {', '.join(os.path.relpath(p) for p in paths)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(poll)
+            current = _mtimes(paths)
+            if current == seen:
+                continue
+            seen = current
+            try:
+                elapsed = refresh(previews, root)
+            except Exception as exc:  # a half-saved or broken edit; wait for the next one
+                print(f"  ✗ {type(exc).__name__}: {exc}")
+                continue
+            print(f"  Updated in {elapsed * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")